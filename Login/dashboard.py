@@ -11,6 +11,18 @@ ROOT_DIR = Path(__file__).resolve().parent.parent  # src/ → root/
 JD_FOLDER = ROOT_DIR / "JD"
 
 # HELPERS
+def _list_jds():
+    """JD names from the API's catalogue (always current); the folder itself if the API is unreachable."""
+    try:
+        resp = requests.get(f"{API_BASE}/jds", timeout=3)
+        if resp.status_code == 200:
+            return resp.json().get("jds", [])
+    except requests.RequestException:
+        pass
+    if not os.path.exists(JD_FOLDER):
+        return None
+    return [f for f in os.listdir(JD_FOLDER) if f.lower().endswith(".txt")]
+
 def _pretty_label(filename: str) -> str:
     """Convert raw filename into a clean label for dropdowns."""
     name = filename.rsplit(".", 1)[0]
@@ -24,12 +36,11 @@ def user_dashboard():
     st.title("🙋 Resume Parser & ATS Scoring")
 
     # 1. Load job descriptions
-    if not os.path.exists(JD_FOLDER):
+    all_jds = _list_jds()
+    if all_jds is None:
         st.error("⚠️ JD folder not found!")
         return
 
-    all_jds = [f for f in os.listdir(JD_FOLDER) if f.lower().endswith(".txt")]
-
     if not all_jds:
         st.error("⚠️ No Job Descriptions found in the 'JDs' folder.")
         return
@@ -126,15 +137,33 @@ def admin_dashboard():
     # Job Descriptions Tab
     with tabs[1]:
         st.subheader("Manage Job Descriptions")
-        jds = [f for f in os.listdir(JD_FOLDER) if f.endswith(".txt")]
-        st.write(jds)
+        st.write(_list_jds() or [])
 
         uploaded_jd = st.file_uploader("Upload new JD", type=["txt"])
         if uploaded_jd:
-            save_path = os.path.join(JD_FOLDER, uploaded_jd.name)
-            with open(save_path, "wb") as f:
-                f.write(uploaded_jd.read())
-            st.success("New JD uploaded!")
+            # the API compiles the JD into its catalogue, so it is scoreable right away
+            try:
+                resp = requests.post(f"{API_BASE}/jds", files={"file": (uploaded_jd.name, uploaded_jd.getvalue())}, timeout=60)
+            except requests.RequestException:
+                resp = None
+            if resp is None:
+                # API unreachable: drop it in the folder; the catalogue watcher picks it up
+                try:
+                    os.makedirs(JD_FOLDER, exist_ok=True)
+                    with open(os.path.join(JD_FOLDER, uploaded_jd.name), "wb") as f:
+                        f.write(uploaded_jd.getvalue())
+                    st.success("New JD saved to the JD folder (API unreachable; it is picked up on the next scan).")
+                except OSError as e:
+                    st.error(f"❌ Could not save the JD: API unreachable and the JD folder is not writable ({e})")
+            elif resp.status_code == 200:
+                st.success("New JD uploaded!")
+            else:
+                # the API rejected it (bad name, unreadable text, ...): show why instead of bypassing it
+                try:
+                    detail = resp.json().get("detail", resp.text)
+                except ValueError:
+                    detail = resp.text
+                st.error(f"❌ JD upload failed ({resp.status_code}): {detail}")
 
     # Logs Tab
     with tabs[2]:
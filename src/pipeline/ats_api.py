@@ -1,50 +1,57 @@
 # src/pipeline/ats_api.py
+import os, asyncio
+from functools import lru_cache
 from fastapi import APIRouter, UploadFile, File, Form, HTTPException
 from pathlib import Path
-import tempfile
-from PyPDF2 import PdfReader
-import docx2txt
+from typing import Dict
 
 from src.pipeline.ats_scoring import compute_ats
+from src.pipeline.executors import StageBusy, StageTimeout, run_stage
+from src.pipeline.extraction import SUPPORTED_TYPES, ExtractionError, extract_text_from_bytes, read_limited
+from src.pipeline.jd_profile import compile_jd_profile
 
 router = APIRouter()
 
 JD_FOLDER = Path("JDs")
 JD_CSV = "job_keywords.csv"  # your CSV lexicon used by preprocess_resume_text()
 
-def _extract_resume_text(file: UploadFile) -> str:
+@lru_cache(maxsize=64)
+def _terms_profile(path: str, mtime_ns: int, size: int) -> Dict:
+    # ATS scoring only needs the JD's terms: no embedding, so the model is never loaded here
+    text = Path(path).read_text(encoding="utf-8", errors="ignore")
+    return compile_jd_profile(text, name=os.path.basename(path), with_embedding=False)
+
+def load_terms_profile(jd_path: Path) -> Dict:
+    """Terms-only JD profile, recompiled when the file changes."""
+    st = os.stat(jd_path)
+    return _terms_profile(str(jd_path), st.st_mtime_ns, st.st_size)
+
+async def _extract_resume_text(file: UploadFile, pdf_backend: str = None) -> str:
     ext = (file.filename or "").split(".")[-1].lower()
-    if ext not in {"pdf", "docx", "txt"}:
+    if ext not in SUPPORTED_TYPES:
         raise HTTPException(status_code=400, detail="Only PDF, DOCX, or TXT files are supported.")
-    with tempfile.NamedTemporaryFile(delete=False, suffix=f".{ext}") as tmp:
-        tmp.write(file.file.read())
-        tmp_path = Path(tmp.name)
-
-    if ext == "pdf":
-        text = ""
-        reader = PdfReader(str(tmp_path))
-        for page in reader.pages:
-            text += (page.extract_text() or "") + "\n"
-    elif ext == "docx":
-        text = docx2txt.process(str(tmp_path)) or ""
-    else:
-        text = tmp_path.read_text(encoding="utf-8", errors="ignore")
-
-    return text
+    # straight from the upload's spooled buffer: no temp file, size-capped while reading
+    data = await asyncio.to_thread(read_limited, file.file, file.filename, declared_size=file.size)
+    return await run_stage("extract", extract_text_from_bytes, data, file.filename, None, pdf_backend)
 
 @router.post("/analyze_resume")
-async def analyze_resume(file: UploadFile = File(...), jd_file: str = Form(...)):
-    # Validate & load JD text
+async def analyze_resume(file: UploadFile = File(...), jd_file: str = Form(...), pdf_backend: str = Form(None)):
+    # Validate & load compiled JD profile
     jd_path = JD_FOLDER / jd_file
     if not jd_path.exists():
         raise HTTPException(status_code=404, detail=f"JD file not found: {jd_file}")
-    jd_text = jd_path.read_text(encoding="utf-8", errors="ignore")
-
-    # Extract resume text
-    resume_text = _extract_resume_text(file)
-
-    # Compute ATS
-    result = compute_ats(resume_text, jd_text, JD_CSV)
+    try:
+        jd_profile = await asyncio.to_thread(load_terms_profile, jd_path)
+
+        # Extract resume text, then compute ATS, both in the CPU pool (off the event loop)
+        resume_text = await _extract_resume_text(file, pdf_backend)
+        result = await run_stage("score", compute_ats, resume_text, None, JD_CSV, None, jd_profile)
+    except ExtractionError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+    except StageBusy as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+    except StageTimeout as e:
+        raise HTTPException(status_code=504, detail=str(e))
 
     return {
         "status": "ok",
@@ -1,13 +1,17 @@
 # src/pipeline/ats_scoring.py
 import re
+import numpy as np
 from typing import Dict, List, Set, Tuple
 from pathlib import Path
 from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
 
-from src.pipeline.preprocess_resume_text import preprocess_resume_text
+from src.pipeline.preprocess_resume_text import (
+    preprocess_resume_text, preprocess_resume_base, doc_section_lines, doc_section_tokens, TOKEN_RE,
+)
+from src.pipeline.skill_matcher import get_skill_matcher, canonical_skills
+from src.pipeline.ats_weights import WEIGHT_PROFILE, component_matrix, weighted_totals, round_scores
 
 # ----------------- Config / Lexicons -----------------
-TOKEN_RE = re.compile(r"[A-Za-z][A-Za-z0-9\-\+\.#]*")
 
 TECH_HINTS = {
     "python","pandas","numpy","matplotlib","seaborn","sklearn","scikit-learn",
@@ -54,18 +58,16 @@ def _clean(text: str) -> str:
     text = re.sub(r"\s+", " ", text).strip()
     return text
 
-def _tokenize(text: str) -> List[str]:
-    return [t.lower() for t in TOKEN_RE.findall(text.lower())]
-
 def _jd_terms_set(jd_text: str) -> Set[str]:
     """Extract a deduped set of important JD terms (tokens + key phrases)."""
     clean = _clean(jd_text)
     toks = [t for t in clean.split() if t not in ENGLISH_STOP_WORDS and t not in GENERIC_NOISE and len(t) > 2]
     terms = set(toks)
-    # add multi-words phrases if present
-    for ph in PHRASES:
-        if ph in jd_text.lower():
-            terms.add(ph)
+    stream = TOKEN_RE.findall(jd_text)
+    # add multi-word skills (PHRASES and taxonomy phrases) in one matcher pass
+    terms |= get_skill_matcher().phrases(stream)
+    # canonical names of aliased / misspelled skills ("k8s" -> "kubernetes"), as on the resume side
+    terms |= canonical_skills(stream, toks)
     return terms
 
 def _is_fresher(prep: Dict) -> bool:
@@ -122,17 +124,18 @@ def _section_presence_score(sections: Dict, key: str) -> float:
     txt = sections.get(key, "")
     return 100.0 if txt and len(txt.strip()) > 30 else 0.0
 
-def _project_score(sections: Dict, resume_tokens: Set[str]) -> float:
+def _project_score(sections: Dict, doc: Dict) -> float:
     """Score projects based on presence, count-ish, numbers, skills used."""
     txt = sections.get("projects", "")
     if not txt:
         return 0.0
-    lines = [ln for ln in txt.split("\n") if ln.strip()]
+    lines = [ln for ln in doc_section_lines(doc, "projects") if ln.strip()]
     approx_projects = sum(1 for ln in lines if "project" in ln.lower() or ln.strip().startswith(("-", "•")))
     approx_projects = max(approx_projects, 1 if txt else 0)
 
     numbers = 1 if NUMBER_RE.search(txt) else 0
-    skills_used = len({t for t in resume_tokens if t in TECH_HINTS and t in txt.lower()})
+    # the projects section's own tokens (whole words, from the document model), not a substring scan
+    skills_used = len({t.rstrip(".") for t in doc_section_tokens(doc, "projects")} & TECH_HINTS)
     skills_used_score = min(1.0, skills_used / 3.0)
 
     base = min(1.0, approx_projects / 2.0) * 60.0    # up to 60
@@ -140,11 +143,11 @@ def _project_score(sections: Dict, resume_tokens: Set[str]) -> float:
     base += skills_used_score * 20.0                  # + up to 20 for skills in context
     return round(min(100.0, base), 1)
 
-def _experience_score(sections: Dict) -> float:
+def _experience_score(sections: Dict, doc: Dict) -> float:
     txt = sections.get("experience", "")
     if not txt:
         return 0.0
-    bullets_like = sum(1 for ln in txt.split("\n") if ln.strip().startswith(("-", "•")))
+    bullets_like = sum(1 for ln in doc_section_lines(doc, "experience") if ln.strip().startswith(("-", "•")))
     dates_present = 1 if DATE_RE.search(txt) else 0
     numbers = 1 if NUMBER_RE.search(txt) else 0
     base = 50.0 if bullets_like >= 3 else bullets_like / 3.0 * 50.0
@@ -161,12 +164,14 @@ def _contact_score(contact: Dict) -> float:
     return round(min(100.0, score), 1)
 
 def _split_skills_for_jd(jd_terms: Set[str]) -> Tuple[Set[str], Set[str]]:
-    jd_tech = {t for t in jd_terms if t in TECH_HINTS or t in PHRASES}
-    jd_soft = {t for t in jd_terms if t in SOFT_HINTS}
+    category = get_skill_matcher().category
+    jd_tech = {t for t in jd_terms if t in TECH_HINTS or t in PHRASES or category.get(t) == "tech"}
+    jd_soft = {t for t in jd_terms if t in SOFT_HINTS or category.get(t) == "soft"}
     return jd_tech, jd_soft
 
-def _skills_scores(resume_skills: Dict[str, List[str]], jd_terms: Set[str]) -> Tuple[float, float, List[str], List[str]]:
-    jd_tech, jd_soft = _split_skills_for_jd(jd_terms)
+def _skills_scores(resume_skills: Dict[str, List[str]], jd_terms: Set[str],
+                   jd_split: Tuple[Set[str], Set[str]] = None) -> Tuple[float, float, List[str], List[str]]:
+    jd_tech, jd_soft = jd_split if jd_split is not None else _split_skills_for_jd(jd_terms)
     r_tech = set(resume_skills.get("technical", []))
     r_soft = set(resume_skills.get("non_technical", []))
 
@@ -182,26 +187,42 @@ def _skills_scores(resume_skills: Dict[str, List[str]], jd_terms: Set[str]) -> T
     return round(tech_cov, 1), round(soft_cov, 1), tech_match + soft_match, tech_miss + soft_miss
 
 # ----------------- Public API -----------------
-def compute_ats(raw_resume_text: str, jd_text: str, jd_csv_path: str, fresher: bool = None) -> Dict:
+def compute_ats(raw_resume_text: str, jd_text: str, jd_csv_path: str, fresher: bool = None,
+                jd_profile: Dict = None, prep: Dict = None, weight_profile: str = WEIGHT_PROFILE) -> Dict:
     """
     Returns a dict with:
       label (fresher/non_fresher), total_score, components{...}, matched_skills, missing_skills
     fresher: optional override. If None -> auto-detect.
+    jd_profile: optional compiled JD profile (see jd_profile.py); when given,
+      jd_text is not re-parsed and may be None.
+    prep: optional preprocess_resume_text() output, to score one resume
+      against several JDs without preprocessing it again.
+    weight_profile: named weight profile from ats_weights.json.
     """
     # Preprocess resume once (reuses your existing pipeline)
-    prep = preprocess_resume_text(raw_resume_text, jd_csv_path)
+    if prep is None:
+        prep = preprocess_resume_text(raw_resume_text, jd_csv_path)
     sections = prep.get("sections", {})
-    tokens = set(_tokenize(raw_resume_text))
-    jd_terms = _jd_terms_set(jd_text)
+    # the document model built during preprocessing: no re-tokenizing or re-splitting here
+    doc = prep.get("doc")
+    if doc is None:
+        # prep from before the document model (or hand-built): rebuild it from the raw text
+        doc = preprocess_resume_base(raw_resume_text or "")["doc"]
+    if jd_profile is not None:
+        jd_terms = jd_profile["terms"]
+        jd_split = (jd_profile["tech"], jd_profile["soft"])
+    else:
+        jd_terms = _jd_terms_set(jd_text)
+        jd_split = None
 
     # Skills coverage
-    tech_cov, soft_cov, matched_skills, missing_skills = _skills_scores(prep.get("skills", {}), jd_terms)
+    tech_cov, soft_cov, matched_skills, missing_skills = _skills_scores(prep.get("skills", {}), jd_terms, jd_split)
 
     # Components (0..100 each)
     readability = _readability_score(prep.get("readability", {}))
     education = _section_presence_score(sections, "education")
-    projects = _project_score(sections, tokens)
-    experience = _experience_score(sections)
+    projects = _project_score(sections, doc)
+    experience = _experience_score(sections, doc)
     contact = _contact_score(prep.get("contact", {}))
     summary = _section_presence_score(sections, "summary")
     certifications = _section_presence_score(sections, "certifications")
@@ -214,39 +235,6 @@ def compute_ats(raw_resume_text: str, jd_text: str, jd_csv_path: str, fresher: b
     if fresher is None:
         fresher = _is_fresher(prep)
 
-    if fresher:
-        # Fresher Weights
-        total = (
-            0.06 * readability +
-            0.45 * tech_cov +
-            0.05 * soft_cov +
-            0.10 * education +
-            0.00 * experience +
-            0.15 * projects +
-            0.04 * contact +
-            0.03 * summary +
-            0.03 * certifications +
-            0.04 * achievements +
-            0.05 * internship
-        )
-        label = "fresher"
-    else:
-        # Non-Fresher Weights
-        total = (
-            0.07 * readability +
-            0.45 * tech_cov +
-            0.05 * soft_cov +
-            0.10 * education +
-            0.10 * experience +
-            0.15 * projects +
-            0.05 * contact +
-            0.03 * summary
-        )
-        label = "non_fresher"
-
-    # Clamp and round
-    total_score = round(min(100.0, max(0.0, total)), 1)
-
     components = {
         "readability": readability,
         "skills_technical": tech_cov,
@@ -261,6 +249,12 @@ def compute_ats(raw_resume_text: str, jd_text: str, jd_csv_path: str, fresher: b
         "internship": internship,
     }
 
+    # Weights come from the configured profile (ats_weights.json); a batch of
+    # one row goes through the same step used to re-weight stored batches
+    totals, labels = weighted_totals(component_matrix([components]), np.array([bool(fresher)]), weight_profile)
+    label = str(labels[0])
+    total_score = round_scores(totals)[0]
+
     return {
         "label": label,
         "total_score": total_score,
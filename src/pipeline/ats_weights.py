@@ -0,0 +1,168 @@
+# src/pipeline/ats_weights.py
+"""
+ATS weight profiles and vectorized totals.
+
+Profiles live in a JSON file (ATS_WEIGHTS_FILE, default ats_weights.json next
+to this module) as named pairs of weight vectors, one for freshers and one for
+everyone else:
+
+    {"profiles": {"default": {"fresher": {"readability": 0.06, ...}, "non_fresher": {...}}}}
+
+Component scores for a batch form a (resumes x components) matrix; weighting,
+fresher/non-fresher selection and clamping are then one pass over that matrix,
+so a profile can be re-weighted or A/B-tested over stored components without
+re-parsing a single resume:
+
+    python -m src.pipeline.ats_weights collect path/to/resumes path/to/jd.txt --out components.npz
+    python -m src.pipeline.ats_weights compare components.npz --profiles default,candidate
+"""
+import os, sys, json, argparse
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Sequence, Tuple
+import numpy as np
+
+# ---------- Config ----------
+WEIGHTS_FILE = os.getenv("ATS_WEIGHTS_FILE", str(Path(__file__).resolve().parent / "ats_weights.json"))
+WEIGHT_PROFILE = os.getenv("ATS_WEIGHT_PROFILE", "default")
+
+# column order of compute_ats component matrices
+COMPONENTS = (
+    "readability", "skills_technical", "skills_non_technical", "education", "experience", "projects",
+    "contact", "summary", "certifications", "achievements", "internship",
+)
+LABELS = ("non_fresher", "fresher")
+
+class UnknownWeightProfile(ValueError):
+    pass
+
+# ---------- 1) Profiles ----------
+@lru_cache(maxsize=8)
+def _read_profiles(path: str, mtime: float) -> Dict[str, Dict[str, Dict[str, float]]]:
+    data = json.loads(Path(path).read_text(encoding="utf-8"))
+    profiles = data.get("profiles", {})
+    for name, profile in profiles.items():
+        missing = [label for label in LABELS if label not in profile]
+        if missing:
+            raise ValueError(f"Weight profile {name!r} in {path} has no {', '.join(missing)} weights")
+    return profiles
+
+def load_weight_profiles(path: str = WEIGHTS_FILE) -> Dict[str, Dict[str, Dict[str, float]]]:
+    """name -> {"fresher": {component: weight}, "non_fresher": {...}}; re-read when the file changes."""
+    return _read_profiles(path, os.path.getmtime(path))
+
+def weight_vectors(profile: str = WEIGHT_PROFILE, components: Sequence[str] = COMPONENTS,
+                   path: str = WEIGHTS_FILE) -> np.ndarray:
+    """(2 x components) weights; row 0 non_fresher, row 1 fresher. Unlisted components weigh 0."""
+    profiles = load_weight_profiles(path)
+    if profile not in profiles:
+        raise UnknownWeightProfile(f"Unknown weight profile {profile!r}; choose one of {', '.join(profiles)}")
+    weights = profiles[profile]
+    unknown = {c for label in LABELS for c in weights[label]} - set(components)
+    if unknown:
+        raise ValueError(f"Weight profile {profile!r} weighs unknown component(s) {', '.join(sorted(unknown))}")
+    return np.array([[float(weights[label].get(c, 0.0)) for c in components] for label in LABELS])
+
+def profile_signature(profile: str = WEIGHT_PROFILE, path: str = WEIGHTS_FILE) -> str:
+    """Stable text of a profile's weights (changes whenever its totals can change)."""
+    return json.dumps(load_weight_profiles(path)[profile], sort_keys=True)
+
+# ---------- 2) Batch totals ----------
+def component_matrix(components: Sequence[Dict[str, float]], columns: Sequence[str] = COMPONENTS) -> np.ndarray:
+    """(resumes x columns) float matrix from compute_ats-style component dicts (missing -> 0)."""
+    out = np.zeros((len(components), len(columns)), dtype=np.float64)
+    for i, row in enumerate(components):
+        out[i] = [row.get(c, 0.0) for c in columns]
+    return out
+
+def weighted_totals(matrix: np.ndarray, fresher: np.ndarray, profile: str = WEIGHT_PROFILE,
+                    columns: Sequence[str] = COMPONENTS, path: str = WEIGHTS_FILE) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Weighted, clamped (0-100) total and label per row, freshers and others in
+    the same pass. Columns are accumulated left to right, so every total is
+    bit-identical to the per-resume sum compute_ats reports.
+    """
+    weights = weight_vectors(profile, columns, path)[np.asarray(fresher, dtype=bool).astype(np.intp)]
+    totals = np.zeros(matrix.shape[0], dtype=np.float64)
+    for j in range(matrix.shape[1]):
+        totals += weights[:, j] * matrix[:, j]
+    labels = np.where(fresher, LABELS[1], LABELS[0])
+    return np.clip(totals, 0.0, 100.0), labels
+
+def round_scores(totals: np.ndarray) -> List[float]:
+    # Python's round (exact decimal) rather than np.round (x*10 rounding), so
+    # re-scored totals match stored ATS scores to the last digit
+    return [round(t, 1) for t in totals.tolist()]
+
+# ---------- 3) Stored component batches ----------
+def save_components(path, names: Sequence[str], matrix: np.ndarray, fresher: np.ndarray) -> None:
+    np.savez_compressed(path, names=np.asarray(names), matrix=matrix, fresher=np.asarray(fresher, dtype=bool),
+                        columns=np.asarray(COMPONENTS))
+
+def load_components(path) -> Tuple[List[str], np.ndarray, np.ndarray]:
+    data = np.load(path, allow_pickle=False)
+    columns = tuple(data["columns"].tolist())
+    if columns != COMPONENTS:
+        raise ValueError(f"{path} holds components {columns}, expected {COMPONENTS}")
+    return data["names"].tolist(), data["matrix"], data["fresher"]
+
+def compare_profiles(matrix: np.ndarray, fresher: np.ndarray, profiles: Sequence[str], top_k: int = 10,
+                     path: str = WEIGHTS_FILE) -> List[Dict]:
+    """Score summary per profile plus how far each one moves the top-k against the first."""
+    results, reference = [], None
+    for profile in profiles:
+        totals, _ = weighted_totals(matrix, fresher, profile, path=path)
+        order = np.argsort(-totals, kind="stable")
+        top = set(order[:top_k].tolist())
+        reference = top if reference is None else reference
+        results.append({
+            "profile": profile,
+            "mean": round(float(totals.mean()), 2) if len(totals) else 0.0,
+            "p50": round(float(np.median(totals)), 2) if len(totals) else 0.0,
+            "max": round(float(totals.max()), 2) if len(totals) else 0.0,
+            f"top{top_k}_overlap": round(len(top & reference) / max(1, len(reference)), 3),
+        })
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Collect ATS component matrices and re-weight them offline.")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    col = sub.add_parser("collect", help="score a resume folder against one JD and store its component matrix")
+    col.add_argument("resumes")
+    col.add_argument("jd", help=".txt JD")
+    col.add_argument("--jd-csv", default=str(Path(__file__).resolve().parent.parent.parent / "job_keywords.csv"))
+    col.add_argument("--out", required=True, help=".npz path")
+    cmp_ = sub.add_parser("compare", help="re-weight a stored component matrix with several profiles")
+    cmp_.add_argument("components", help=".npz written by collect")
+    cmp_.add_argument("--profiles", default=WEIGHT_PROFILE, help="comma-separated; the first is the reference")
+    cmp_.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    if args.cmd == "collect":
+        from src.pipeline.ats_scoring import compute_ats
+        from src.pipeline.extraction import SUPPORTED_TYPES, ExtractionError, file_type_of
+        from src.pipeline.resume_cache import extract_and_preprocess
+        from src.pipeline.preprocess_resume_text import preprocess_resume_text
+        from src.pipeline.jd_profile import load_jd_profile
+
+        profile = load_jd_profile(args.jd)
+        names, rows, fresher = [], [], []
+        for path in sorted(Path(args.resumes).iterdir()):
+            if path.is_file() and file_type_of(path.name) in SUPPORTED_TYPES:
+                try:
+                    _, text, base = extract_and_preprocess(path.read_bytes(), path.name)
+                except ExtractionError as e:
+                    print(f"skipping {path.name}: {e}", file=sys.stderr)
+                    continue
+                ats = compute_ats(text, None, args.jd_csv, jd_profile=profile,
+                                  prep=preprocess_resume_text(text, args.jd_csv, base=base))
+                names.append(path.name)
+                rows.append(ats["components"])
+                fresher.append(ats["label"] == "fresher")
+        save_components(args.out, names, component_matrix(rows), np.asarray(fresher, dtype=bool))
+        print(f"✅ Stored components of {len(names)} resumes in {args.out}")
+    else:
+        names, matrix, fresher = load_components(args.components)
+        chosen = [p.strip() for p in args.profiles.split(",") if p.strip()]
+        for row in compare_profiles(matrix, fresher, chosen, args.top):
+            print("  ".join(f"{k}={v}" for k, v in row.items()))
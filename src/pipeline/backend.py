@@ -1,102 +1,118 @@
-from fastapi import FastAPI, File, UploadFile, Form, HTTPException, APIRouter
-import os, json, tempfile, re
+import time
+_IMPORT_T0 = time.perf_counter()
+
+from fastapi import FastAPI, File, UploadFile, Form, HTTPException, APIRouter, Request
+from fastapi.responses import StreamingResponse, JSONResponse
+from fastapi.encoders import jsonable_encoder
+import os, json, re, asyncio
 from pathlib import Path
-from PyPDF2 import PdfReader
-import docx2txt
+from typing import List
 
 from src.pipeline.preprocess_resume_text import preprocess_resume_text
-from src.pipeline.matcher import calculate_similarity
-from src.pipeline.ats_scoring import compute_ats
+from src.pipeline.matcher import EMBEDDING_MODE, get_model, section_similarities, similarities_to_embedding
+from src.pipeline.embedding_scheduler import embedding_scheduler
+from src.pipeline.jd_lexicon import get_jd_lexicon
+from src.pipeline.jd_index import search_jd_index
+from src.pipeline.jd_catalogue import JD_FOLDER, get_jd_catalogue
+from src.pipeline.jd_profile import clean_text
+from src.pipeline.extraction import (
+    SUPPORTED_TYPES, MAX_UPLOAD_BYTES, PDF_BACKEND, available_pdf_backends, file_type_of, iter_archive,
+    read_limited, resolve_pdf_backend,
+)
+from src.pipeline.ranking import (
+    leaderboard_entry, score_prepared, score_against_profiles, score_candidate, public_entry, build_leaderboard,
+)
+from src.pipeline.resume_cache import resume_key, get_resume_cache
+from src.pipeline.executors import (
+    StageBusy, StageTimeout, admit, run_stage, with_timeout, get_inference_executor, shutdown_executors, stage_metrics,
+)
+from src.pipeline.extraction import ExtractionError
+from src.pipeline.extract_sandbox import get_extraction_sandbox, shutdown_extraction_sandbox
+from src.pipeline.embedding_store import get_embedding_store
+from src.pipeline.skill_matcher import get_fuzzy_canonicalizer
+from src.pipeline.candidate_index import AUTO_INDEX, get_candidate_index
+from src.pipeline.warmup import warmup, mark
+from src.pipeline.result_cache import get_result_cache, result_key, scoring_version
+from src.pipeline.job_queue import JobQueueFull, get_job_queue, get_job_workers
 
 # ------------------ Paths / Config ------------------ #
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
-JD_FOLDER = BASE_DIR / "JD"
 JD_CSV = str(BASE_DIR / "job_keywords.csv")
+MAX_ARCHIVE_BYTES = int(float(os.getenv("MAX_ARCHIVE_MB", "200")) * 1024 * 1024)
 
 app = FastAPI()
 ats_router = APIRouter()   # ✅ define once here
 
 # ------------------ Helpers ------------------ #
-MULTI_WS = re.compile(r"\s+")
-TOKEN_RE = re.compile(r"[A-Za-z][A-Za-z0-9\-\+\.#]*")
-
-def compute_weighted_score(resume_data, jd_text, semantic_score, fresher=True):
-    """
-    Weighted ATS scoring system:
-    fresher=True  → Experience = 0, Internship & Projects weighted more
-    fresher=False → Normal distribution
-    """
-
-    weights_fresher = {
-        "readability": 6,
-        "skills": 50,
-        "education": 10,
-        "experience": 0,
-        "projects": 15,
-        "contact": 4,
-        "summary": 3,
-        "certifications": 3,
-        "achievements": 4,
-        "internship": 5,
-    }
-
-    weights_non_fresher = {
-        "readability": 7,
-        "skills": 50,
-        "education": 10,
-        "experience": 10,
-        "projects": 15,
-        "contact": 5,
-        "summary": 3,
-    }
-
-    weights = weights_fresher if fresher else weights_non_fresher
-    breakdown = {}
-
-    # --- Simple heuristics ---
-    breakdown["readability"] = min(100, len(resume_data["raw_text"]) / 2000 * 100)
-    breakdown["skills"] = min(100, len(resume_data["skills"]["all"]) / 15 * 100)
-    breakdown["education"] = 100 if resume_data.get("education") else 0
-    breakdown["experience"] = 100 if resume_data.get("experience") else 0
-    breakdown["projects"] = 100 if resume_data.get("projects") else 0
-    breakdown["contact"] = 100 if resume_data["contact"].get("email") != "N/A" else 0
-    breakdown["summary"] = 100 if resume_data.get("summary") else 0
-    breakdown["certifications"] = 100 if resume_data.get("certifications") else 0
-    breakdown["achievements"] = 100 if resume_data.get("achievements") else 0
-    breakdown["internship"] = 100 if resume_data.get("internship") else 0
+async def extract_resume_text(file: UploadFile, pdf_backend: str = None):
+    """
+    Returns (raw text, JD-independent prep) for an upload. Both come from the
+    content-addressed resume cache when the same bytes were seen before;
+    otherwise parsing runs in a sandboxed worker process, off the event loop.
+    pdf_backend overrides RESUME_PDF_BACKEND for this request.
+    """
+    entry = await load_resume_bytes(await read_resume_upload(file), file.filename, pdf_backend=pdf_backend)
+    return entry["text"], entry["base"]
 
-    # --- Weighted sum ---
-    final_score = 0
-    total_weight = sum(weights.values())
-    for k, w in weights.items():
-        final_score += breakdown.get(k, 0) * (w / total_weight)
+async def read_resume_upload(file: UploadFile) -> bytes:
+    file_type = file.filename.split(".")[-1].lower()
+    if file_type not in SUPPORTED_TYPES:
+        raise HTTPException(status_code=400, detail="Only PDF, DOCX and TXT files are supported.")
+    return await read_upload(file)
 
-    # Blend with semantic similarity (60:40 ratio)
-    final_score = round((0.6 * semantic_score) + (0.4 * final_score), 2)
+async def read_upload(file: UploadFile, max_bytes: int = MAX_UPLOAD_BYTES) -> bytes:
+    """Read an upload into memory with extraction.read_limited, off the event loop."""
+    return await asyncio.to_thread(read_limited, file.file, file.filename, max_bytes, file.size)
 
-    return final_score, breakdown
+async def load_resume_bytes(data: bytes, filename: str, wait: bool = False, pdf_backend: str = None,
+                            index: bool = False):
+    """
+    Resume cache first; on a miss, parse in the extraction sandbox (size/page/time/memory limits).
+    index: add the resume to the candidate search index (recruiter bulk uploads only, CANDIDATE_AUTO_INDEX=1).
+    """
+    key = resume_key(data, filename, pdf_backend)
+    cache = get_resume_cache()
+    # SQLite read + zlib/JSON decode: keep it off the event loop
+    entry = await asyncio.to_thread(cache.get, key)
+    if entry is None:
+        async with admit("extract", wait):
+            entry = await get_extraction_sandbox().extract(data, filename, pdf_backend)
+        await asyncio.to_thread(cache.put, key, entry)
+    if index and AUTO_INDEX:
+        # searchable via /search once the background writer thread has indexed it
+        get_candidate_index().enqueue(key, filename, entry["text"], entry["base"], JD_CSV)
+    return entry
 
+def get_jd_profile(jd_file: str):
+    """Compiled JD from the catalogue; a JD dropped into the folder since the last poll is picked up on demand."""
+    catalogue = get_jd_catalogue()
+    profile = catalogue.get_profile(jd_file)
+    if profile is None and (Path(catalogue.folder) / os.path.basename(jd_file)).exists():
+        catalogue.refresh()
+        profile = catalogue.get_profile(jd_file)
+    if profile is None:
+        raise HTTPException(status_code=404, detail=f"JD file not found: {jd_file}")
+    return profile
 
-def clean_text(text: str) -> str:
-    text = text.replace("\r\n", "\n").replace("\r", "\n")
-    return MULTI_WS.sub(" ", text).lower().strip()
+async def semantic_similarity(text: str, base, jd_profile, embedding: str = "embedding", mode: str = None):
+    """
+    (semantic score, per-section scores or None). In "sections" mode every
+    section of the resume is embedded in model-sized chunks against the JD's
+    chunk embeddings; in "document" mode the whole text is one (truncated) vector
+    compared with the profile's `embedding` ("clean_embedding" for clean_text input).
+    mode overrides EMBEDDING_MODE.
+    """
+    if (mode or EMBEDDING_MODE) == "sections":
+        return await with_timeout("inference", embedding_scheduler.section_similarity(
+            base["sections"], jd_profile["chunk_embeddings"]))
+    return await with_timeout("inference", embedding_scheduler.similarity(text, jd_profile[embedding])), None
 
-def extract_resume_text(file: UploadFile):
-    file_type = file.filename.split(".")[-1].lower()
-    if file_type not in ["pdf", "docx"]:
-        raise HTTPException(status_code=400, detail="Only PDF and DOCX files are supported.")
-    with tempfile.NamedTemporaryFile(delete=False, suffix=f".{file_type}") as tmp_file:
-        tmp_file.write(file.file.read())
-        temp_path = tmp_file.name
-    if file_type == "pdf":
-        text = "".join([(pg.extract_text() or "") + "\n" for pg in PdfReader(temp_path).pages])
-    else:
-        text = docx2txt.process(temp_path) or ""
-    return text, temp_path
-
-def jd_terms_set(jd_text: str):
-    toks = [t.lower() for t in TOKEN_RE.findall(jd_text)]
-    return {t for t in toks if len(t) > 2}
+def semantic_similarities(results, jd_profile):
+    """Batched semantic_similarity for /rank rows (runs on the inference thread)."""
+    if EMBEDDING_MODE == "sections":
+        return section_similarities([r["sections"] for r in results], jd_profile["chunk_embeddings"])
+    sims = similarities_to_embedding([r["text"] for r in results], jd_profile["embedding"])
+    return [(sim, None) for sim in sims]
 
 def extract_contact_info(text: str):
     email = re.search(r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}", text)
@@ -105,55 +121,379 @@ def extract_contact_info(text: str):
     name = lines[0] if lines else "N/A"
     return {"name": name, "email": email.group(0) if email else "N/A", "phone": phone.group(0) if phone else "N/A"}
 
+async def collect_uploads(files: List[UploadFile]):
+    """Flatten uploaded resumes (and resumes inside .zip uploads) into (name, bytes)."""
+    items = []
+    for f in files:
+        file_type = file_type_of(f.filename)
+        if file_type == "zip":
+            data = await read_upload(f, MAX_ARCHIVE_BYTES)
+            items.extend(await asyncio.to_thread(lambda: list(iter_archive(data))))
+        elif file_type in SUPPORTED_TYPES:
+            items.append((f.filename, await read_upload(f)))
+        else:
+            raise HTTPException(status_code=400, detail=f"Unsupported file: {f.filename}")
+    return items
+
+# ------------------ Startup ------------------ #
+# Heavy resources load lazily on first use; these steps pre-load them for /ready.
+def _warm_embedding_model():
+    # straight to the model (not the embedding cache): the first call initializes kernels / allocator
+    get_model().encode(["warm up"], convert_to_numpy=True, normalize_embeddings=True)
+
+def _warm_jd_lexicon():
+    # Parse job_keywords.csv once per worker instead of on the first request
+    if os.path.exists(JD_CSV):
+        get_jd_lexicon(JD_CSV)
+
+def _warm_spacy():
+    from src.pipeline.jd_keywords import get_nlp
+    get_nlp()
+
+warmup.register("embedding_model", _warm_embedding_model)
+warmup.register("skill_taxonomy", get_fuzzy_canonicalizer)
+warmup.register("jd_lexicon", _warm_jd_lexicon)
+warmup.register("jd_catalogue", lambda: get_jd_catalogue().ensure_loaded())
+warmup.register("spacy", _warm_spacy)
+
+@app.on_event("startup")
+def start_background_work():
+    start = time.perf_counter()
+    # compile the JD folder, then watch it for added / edited / removed JDs (watcher thread)
+    get_jd_catalogue().start()
+    # WARMUP_ON_STARTUP: background (default) / blocking / off
+    warmup.start()
+    # bulk-scoring worker processes for /jobs: off by default (run `python -m src.pipeline.job_queue worker`);
+    # with JOB_WORKERS > 0 one elected API process supervises them
+    get_job_workers().start()
+    mark("startup_hooks_s", time.perf_counter() - start)
+
+@app.on_event("shutdown")
+def stop_executors():
+    get_jd_catalogue().stop()
+    get_job_workers().stop()
+    shutdown_executors()
+    shutdown_extraction_sandbox()
+
+@app.exception_handler(StageBusy)
+async def stage_busy_handler(request: Request, exc: StageBusy):
+    return JSONResponse(status_code=503, content={"detail": str(exc)}, headers={"Retry-After": "1"})
+
+@app.exception_handler(ExtractionError)
+async def extraction_error_handler(request: Request, exc: ExtractionError):
+    return JSONResponse(status_code=exc.status_code, content={"detail": str(exc)})
+
+@app.exception_handler(StageTimeout)
+async def stage_timeout_handler(request: Request, exc: StageTimeout):
+    return JSONResponse(status_code=504, content={"detail": str(exc)})
+
 # ------------------ Endpoints ------------------ #
 @app.post("/ingest")
-async def ingest_resume(file: UploadFile = File(...)):
-    text, temp_path = extract_resume_text(file)
+async def ingest_resume(file: UploadFile = File(...), pdf_backend: str = Form(None)):
+    text, _ = await extract_resume_text(file, pdf_backend)
     return {"status": "success", "text_preview": clean_text(text)[:300]}
 
 @app.post("/preprocess")
-async def preprocess_endpoint(file: UploadFile = File(...)):
-    text, _ = extract_resume_text(file)
-    result = preprocess_resume_text(text, JD_CSV)
+async def preprocess_endpoint(file: UploadFile = File(...), pdf_backend: str = Form(None)):
+    text, base = await extract_resume_text(file, pdf_backend)
+    result = preprocess_resume_text(text, JD_CSV, base=base)
     return {"status": "ok", "preview": {"name": result["contact"]["name"], "email": result["contact"]["email"], "skills_top": result["skills"]["all"][:10]}}
 
+def cached_result(endpoint: str, data: bytes, filename: str, jd_profile, pdf_backend: str = None, **options):
+    """(cache key, scoring version, cached response or None) for a resume x JD request."""
+    version = scoring_version(JD_CSV)
+    key = result_key(endpoint, resume_key(data, filename, pdf_backend), jd_profile["sha256"], **options)
+    return key, version, get_result_cache().get(key, version)
+
+async def cache_response(key: str, version: str, out, hit: bool = False) -> JSONResponse:
+    """The response with X-Cache: HIT / MISS; a miss is stored for the next identical request."""
+    if not hit:
+        out = jsonable_encoder(out)
+        await asyncio.to_thread(get_result_cache().put, key, version, out)
+    return JSONResponse(content=out, headers={"X-Cache": "HIT" if hit else "MISS"})
+
 @app.post("/score")
-async def score_resume(file: UploadFile = File(...), jd_file: str = Form(...)):
-    jd_path = JD_FOLDER / jd_file
-    if not jd_path.exists():
-        raise HTTPException(status_code=404, detail=f"JD file not found: {jd_file}")
-    resume_text, _ = extract_resume_text(file)
-    jd_text = jd_path.read_text(encoding="utf-8", errors="ignore")
-    score = calculate_similarity(clean_text(resume_text), clean_text(jd_text))
-    return {"status": "scored", "score": score}
+async def score_resume(file: UploadFile = File(...), jd_file: str = Form(...), pdf_backend: str = Form(None)):
+    jd_profile = await asyncio.to_thread(get_jd_profile, jd_file)
+    data = await read_resume_upload(file)
+    key, version, cached = await asyncio.to_thread(cached_result, "score", data, file.filename, jd_profile, pdf_backend)
+    if cached is not None:
+        return await cache_response(key, version, cached, hit=True)
+    entry = await load_resume_bytes(data, file.filename, pdf_backend=pdf_backend)
+    # /score stays on the cleaned whole-document vector whatever EMBEDDING_MODE is
+    score, _ = await semantic_similarity(clean_text(entry["text"]), entry["base"], jd_profile,
+                                         embedding="clean_embedding", mode="document")
+    out = {"status": "scored", "score": score}
+    return await cache_response(key, version, out)
 
 @ats_router.post("/analyze_resume")
-async def analyze_resume(file: UploadFile = File(...), jd_file: str = Form(...), fresher: bool = Form(None)):
-    jd_path = JD_FOLDER / jd_file
-    if not jd_path.exists():
-        raise HTTPException(status_code=404, detail=f"JD file not found: {jd_file}")
-
-    resume_text, _ = extract_resume_text(file)
-    jd_text = jd_path.read_text(encoding="utf-8", errors="ignore")
+async def analyze_resume(file: UploadFile = File(...), jd_file: str = Form(...), fresher: bool = Form(None),
+                         pdf_backend: str = Form(None)):
+    """
+    Full ATS + semantic analysis. Re-posting the same file for the same JD is
+    answered from the result cache (X-Cache: HIT) until the TTL passes or the
+    scoring version (weights, lexicons, model) changes.
+    """
+    jd_profile = await asyncio.to_thread(get_jd_profile, jd_file)
+    data = await read_resume_upload(file)
+    key, version, cached = await asyncio.to_thread(cached_result, "analyze_resume", data, file.filename, jd_profile,
+                                                   pdf_backend, fresher=fresher)
+    if cached is not None:
+        return await cache_response(key, version, cached, hit=True)
+    entry = await load_resume_bytes(data, file.filename, pdf_backend=pdf_backend)
+    resume_text, base = entry["text"], entry["base"]
 
     contact = extract_contact_info(resume_text)
 
-    # ATS scoring with fresher override
-    ats_result = compute_ats(resume_text, jd_text, JD_CSV, fresher=fresher)
+    # ATS scoring (process pool) and semantic score (inference thread) run concurrently
+    ats_result, (semantic_score, section_scores) = await asyncio.gather(
+        run_stage("score", score_prepared, resume_text, base, jd_profile, JD_CSV, fresher),
+        semantic_similarity(resume_text, base, jd_profile),
+    )
 
-    return {
+    out = {
         "preview": {
             "name": contact["name"],
             "email": contact["email"],
             "skills_top": ats_result["skills_top"],
         },
-        "semantic_score": calculate_similarity(resume_text, jd_text),
+        "semantic_score": semantic_score,
         "final_score": ats_result["total_score"],
         "breakdown": ats_result["components"],
         "matched_keywords": ats_result["matched_skills"],
         "missing_keywords": ats_result["missing_skills"],
     }
+    if section_scores is not None:
+        out["semantic_sections"] = section_scores
+    return await cache_response(key, version, out)
+
+@app.get("/ready")
+async def ready():
+    """Readiness probe: 200 once every warm-up step has loaded; 503 with progress and any failures before."""
+    report = warmup.report()
+    return JSONResponse(status_code=200 if report["ready"] else 503, content=report)
+
+@app.get("/metrics")
+async def metrics():
+    return {
+        "startup": warmup.report(),
+        "resume_cache": get_resume_cache().stats(),
+        "result_cache": get_result_cache().stats(),
+        "embedding_cache": get_embedding_store().stats(),
+        "embedding_scheduler": embedding_scheduler.metrics(),
+        "stages": stage_metrics(),
+        "extraction_sandbox": get_extraction_sandbox().metrics(),
+        "jd_catalogue": get_jd_catalogue().metrics(),
+        "candidate_index": get_candidate_index().metrics(),
+        "jobs": {**get_job_queue().metrics(), "workers": get_job_workers().metrics()},
+        "pdf_backends": {"default": PDF_BACKEND, "available": available_pdf_backends()},
+        "embedding_mode": EMBEDDING_MODE,
+    }
+
+@app.post("/recommend_jds")
+async def recommend_jds(file: UploadFile = File(...), top_k: int = Form(5), fresher: bool = Form(None),
+                        pdf_backend: str = Form(None)):
+    """
+    Reverse matching: rank every JD in JD_FOLDER for one resume.
+    Semantic shortlist via the JD embedding matrix, full compute_ats on the shortlist only.
+    """
+    catalogue = get_jd_catalogue()
+    await asyncio.to_thread(catalogue.ensure_loaded)
+    index = catalogue.snapshot()
+    if not index["profiles"]:
+        raise HTTPException(status_code=404, detail="No JDs in the catalogue")
+    resume_text, base = await extract_resume_text(file, pdf_backend)
+    resume_vec = await with_timeout("inference", embedding_scheduler.encode(resume_text)) if resume_text.strip() else None
+    shortlist = search_jd_index(index, resume_vec, max(1, top_k))
+
+    ats_results = await run_stage(
+        "score", score_against_profiles, resume_text, base,
+        [index["profiles"][jd_name] for jd_name, _ in shortlist], JD_CSV, fresher,
+    )
+    matches = []
+    for (jd_name, semantic), ats in zip(shortlist, ats_results):
+        matches.append({
+            "jd_file": jd_name,
+            "semantic_score": semantic,
+            "final_score": ats["total_score"],
+            "label": ats["label"],
+            "breakdown": ats["components"],
+            "matched_keywords": ats["matched_skills"],
+            "missing_keywords": ats["missing_skills"],
+        })
+    return {"total_jds": len(index["names"]), "catalogue_version": index["version"], "matches": matches}
+
+@app.get("/jds")
+async def list_jds():
+    """Current JD catalogue (what the dashboard lists)."""
+    catalogue = get_jd_catalogue()
+    await asyncio.to_thread(catalogue.ensure_loaded)
+    return {"version": catalogue.snapshot()["version"], "jds": catalogue.names()}
+
+@app.post("/jds")
+async def upload_jd(file: UploadFile = File(...)):
+    """Admin upload: the JD is written, compiled and scoreable when this returns."""
+    if file_type_of(file.filename) != "txt":
+        raise HTTPException(status_code=400, detail="JDs must be .txt files")
+    data = await read_upload(file)
+    profile = await asyncio.to_thread(get_jd_catalogue().add_jd, file.filename, data)
+    return {"status": "ok", "jd_file": profile["name"] if profile else os.path.basename(file.filename),
+            "version": get_jd_catalogue().snapshot()["version"]}
+
+def _csv_list(value: str) -> List[str]:
+    return [v.strip() for v in (value or "").split(",") if v.strip()]
+
+@app.post("/search")
+async def search_candidates(jd_file: str = Form(...), top_k: int = Form(10), must_have: str = Form(""),
+                            sections: str = Form(""), shortlist: int = Form(0), fresher: bool = Form(None)):
+    """
+    Recruiter-side search over every indexed resume. BM25 of the JD terms,
+    restricted by hard filters (must_have="docker,kubernetes" requires both;
+    sections="projects" requires the section), picks a shortlist (default
+    3 x top_k); only the shortlist gets full compute_ats and semantic scoring.
+    """
+    jd_profile = await asyncio.to_thread(get_jd_profile, jd_file)
+    index = get_candidate_index()
+    top_k = max(1, top_k)
+    hits = await asyncio.to_thread(index.search, jd_profile["terms"], _csv_list(must_have), _csv_list(sections),
+                                   shortlist or top_k * 3)
+    texts = await asyncio.to_thread(index.texts, [h["doc_id"] for h in hits])
+    cache = get_resume_cache()
+
+    async def score_hit(hit):
+        text = texts.get(hit["doc_id"])
+        if text is None:
+            return {"file": hit["file"], "error": "removed from the index"}
+        entry = await asyncio.to_thread(cache.get, hit["key"])
+        try:
+            ats, resume_sections = await run_stage(
+                "score", score_candidate, text, entry["base"] if entry else None, jd_profile, JD_CSV, fresher, wait=True)
+        except StageTimeout as e:
+            return {"file": hit["file"], "error": str(e)}
+        return {**leaderboard_entry(hit["file"], text, ats, resume_sections), "bm25": hit["bm25"], "key": hit["key"]}
+
+    results = await asyncio.gather(*(score_hit(h) for h in hits))
+    ok = [r for r in results if "error" not in r]
+    sims = await asyncio.get_running_loop().run_in_executor(get_inference_executor(), semantic_similarities, ok, jd_profile)
+    for r, (sim, section_scores) in zip(ok, sims):
+        r["semantic_score"] = sim
+        if section_scores is not None:
+            r["semantic_sections"] = section_scores
+    return {
+        "jd_file": jd_file,
+        "indexed": index.metrics()["docs"],
+        "shortlisted": len(hits),
+        "failed": [r for r in results if "error" in r],
+        "leaderboard": build_leaderboard(ok)[:top_k],
+    }
+
+@app.delete("/candidates/{key}")
+async def delete_candidate(key: str):
+    """Remove a resume (its "key" from /search) from the candidate index, including its stored text."""
+    deleted = await asyncio.to_thread(get_candidate_index().delete, [key])
+    if not deleted:
+        raise HTTPException(status_code=404, detail=f"No indexed resume with key {key}")
+    return {"status": "deleted", "key": key}
+
+@app.post("/rank")
+async def rank_resumes(files: List[UploadFile] = File(...), jd_file: str = Form(...),
+                       fresher: bool = Form(None), stream: bool = Form(False), pdf_backend: str = Form(None)):
+    """
+    Score many resumes (or a .zip of them) against one JD.
+    Extraction (sandboxed workers) and compute_ats (CPU process pool) are queued,
+    not rejected, when busy; all resumes are then embedded in a single batched encode
+    call on the inference thread. With stream=true the response
+    is NDJSON: one "result" line per resume as it finishes, then a final
+    "leaderboard" line including semantic scores.
+    """
+    pdf_backend = resolve_pdf_backend(pdf_backend)
+    jd_profile = await asyncio.to_thread(get_jd_profile, jd_file)
+    items = await collect_uploads(files)
+    if not items:
+        raise HTTPException(status_code=400, detail="No PDF, DOCX or TXT resumes found in upload.")
+
+    loop = asyncio.get_running_loop()
+
+    async def score_one(name, data):
+        try:
+            entry = await load_resume_bytes(data, name, wait=True, pdf_backend=pdf_backend, index=True)
+            ats = await run_stage("score", score_prepared, entry["text"], entry["base"], jd_profile, JD_CSV, fresher, wait=True)
+        except (ExtractionError, StageTimeout) as e:
+            return {"file": name, "error": str(e)}
+        return leaderboard_entry(name, entry["text"], ats, entry["base"]["sections"])
+
+    futures = [asyncio.ensure_future(score_one(name, data)) for name, data in items]
+
+    async def finish(results):
+        ok = [r for r in results if "error" not in r]
+        sims = await loop.run_in_executor(get_inference_executor(), semantic_similarities, ok, jd_profile)
+        for r, (sim, section_scores) in zip(ok, sims):
+            r["semantic_score"] = sim
+            if section_scores is not None:
+                r["semantic_sections"] = section_scores
+        return {
+            "jd_file": jd_file,
+            "total": len(results),
+            "failed": [r for r in results if "error" in r],
+            "leaderboard": build_leaderboard(ok),
+        }
+
+    if not stream:
+        return await finish(await asyncio.gather(*futures))
+
+    async def ndjson():
+        results = []
+        for fut in asyncio.as_completed(futures):
+            r = await fut
+            results.append(r)
+            yield json.dumps({"event": "error" if "error" in r else "result", **public_entry(r)}) + "\n"
+        yield json.dumps({"event": "leaderboard", **(await finish(results))}) + "\n"
+
+    return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
+@app.post("/jobs", status_code=202)
+async def submit_job(files: List[UploadFile] = File(...), jd_file: str = Form(...), fresher: bool = Form(None),
+                     pdf_backend: str = Form(None)):
+    """
+    Queue a bulk scoring job (many resumes or .zip archives against one JD)
+    and return its id immediately; poll GET /jobs/{job_id} for progress and
+    GET /jobs/{job_id}/results for the leaderboard.
+    """
+    pdf_backend = resolve_pdf_backend(pdf_backend)
+    await asyncio.to_thread(get_jd_profile, jd_file)
+    items = await collect_uploads(files)
+    if not items:
+        raise HTTPException(status_code=400, detail="No PDF, DOCX or TXT resumes found in upload.")
+    jd_path = Path(get_jd_catalogue().folder) / os.path.basename(jd_file)
+    # the job keeps the JD as submitted: later edits to the file don't reach its queued resumes
+    jd_text = await asyncio.to_thread(jd_path.read_text, encoding="utf-8", errors="ignore")
+    try:
+        job = await asyncio.to_thread(get_job_queue().submit, os.path.basename(jd_file), jd_text, JD_CSV, items,
+                                      fresher, pdf_backend)
+    except JobQueueFull as e:
+        return JSONResponse(status_code=503, content={"detail": str(e)}, headers={"Retry-After": "30"})
+    return {**job, "status_url": f"/jobs/{job['job_id']}", "results_url": f"/jobs/{job['job_id']}/results"}
+
+@app.get("/jobs/{job_id}")
+async def job_status(job_id: str):
+    job = await asyncio.to_thread(get_job_queue().job, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job: {job_id}")
+    return job
+
+@app.get("/jobs/{job_id}/results")
+async def job_results(job_id: str, top_k: int = 0):
+    """Leaderboard of the resumes scored so far (all of them once status is "done")."""
+    queue = get_job_queue()
+    job = await asyncio.to_thread(queue.job, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job: {job_id}")
+    done, failed = await asyncio.to_thread(queue.results, job_id)
+    leaderboard = build_leaderboard(done)
+    return {"job": job, "failed": failed, "leaderboard": leaderboard[:top_k] if top_k > 0 else leaderboard}
 
 # ✅ register router
 app.include_router(ats_router)
 
+mark("import_s", time.perf_counter() - _IMPORT_T0)
+
@@ -0,0 +1,516 @@
+# src/pipeline/candidate_index.py
+"""
+Persistent inverted index over analyzed resumes, for recruiter-side search:
+run a JD against every stored candidate with BM25 plus hard filters
+("must have docker AND kubernetes", "has a projects section") and send only
+the top-k shortlist on to full compute_ats scoring.
+
+Terms are each resume's words, normalized exactly like JD terms (lower-cased,
+split on punctuation: "scikit-learn." -> scikit, learn) plus its canonical
+skills ("k8s" -> kubernetes, "machine learning"); queries and must_have
+filters go through the same normalization. Filters are stored as facet terms
+("skill:docker", "section:projects") in the same postings.
+SQLite (WAL, shared by all workers) holds compacted postings as numpy blobs
+plus a small append-only delta table, so adding a resume is a few row inserts
+and loading 100k resumes is one blob read per term. Queries run on the
+in-memory numpy postings.
+
+    python -m src.pipeline.candidate_index build path/to/resumes
+    python -m src.pipeline.candidate_index search path/to/jd.txt --must docker,kubernetes
+    python -m src.pipeline.candidate_index delete <key> [<key> ...]
+    python -m src.pipeline.candidate_index reindex     # after TERMS_VERSION changes
+
+Deleting a resume tombstones its row (text, file name and candidate name are
+erased; the doc id is never reused) and rewrites the postings without it.
+"""
+import os, re, math, time, zlib, queue, logging, sqlite3, threading
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+import numpy as np
+
+from src.pipeline.skill_matcher import canonical_skills, pattern_tokens
+
+log = logging.getLogger(__name__)
+
+# ---------- Config ----------
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+INDEX_DB = os.getenv("CANDIDATE_INDEX_DB", str(BASE_DIR / ".cache" / "candidates.sqlite"))
+BM25_K1 = float(os.getenv("CANDIDATE_BM25_K1", "1.2"))
+BM25_B = float(os.getenv("CANDIDATE_BM25_B", "0.75"))
+# fold the delta table into the numpy blobs once it holds this many rows
+COMPACT_ROWS = int(os.getenv("CANDIDATE_COMPACT_ROWS", "500000"))
+# 1 = index resumes from recruiter-side bulk uploads (/rank, /jobs); off by default, so
+# job-seeker endpoints (/analyze_resume, /score, ...) never store a resume's text
+AUTO_INDEX = os.getenv("CANDIDATE_AUTO_INDEX", "0") == "1"
+# indexed resumes older than this are deleted (text and postings); 0 = keep forever
+RETENTION_DAYS = float(os.getenv("CANDIDATE_RETENTION_DAYS", "90"))
+PURGE_EVERY_S = 3600.0
+
+SKILL_FACET = "skill:"
+SECTION_FACET = "section:"
+# bump when index_terms / query normalization changes (stored postings need `reindex`)
+TERMS_VERSION = 2
+WORD_RE = re.compile(r"[a-z0-9]+")
+
+# ---------- 1) Documents -> terms ----------
+def normalize_words(tokens: Iterable[str]) -> List[str]:
+    """Lower-cased alphanumeric words, split on any punctuation (the same words _jd_terms_set keeps)."""
+    return [w for t in tokens for w in WORD_RE.findall(t.lower())]
+
+def index_terms(prep: Dict) -> Counter:
+    """BM25 term frequencies: the resume's normalized words plus each of its canonical skills once."""
+    terms = Counter(normalize_words(prep.get("tokens", [])))
+    for skill in prep.get("skills", {}).get("all", []):
+        terms.setdefault(skill, 1)
+    return terms
+
+def index_facets(prep: Dict) -> Set[str]:
+    skills = {SKILL_FACET + s for s in prep.get("skills", {}).get("all", [])}
+    return skills | {SECTION_FACET + name for name in prep.get("sections", {})}
+
+def query_terms(terms: Iterable[str]) -> Set[str]:
+    """Query terms normalized like index_terms: words, plus canonical skills / phrases."""
+    out = set()
+    for term in terms:
+        toks = pattern_tokens(term)
+        out.update(normalize_words(toks))
+        out.update(canonical_skills(toks))
+        if " " in term.strip():
+            out.add(" ".join(term.lower().split()))
+    return out
+
+def canonical_facet(value: str) -> str:
+    """A must_have value as stored in skill facets: "K8s" -> "kubernetes"; unknown words just normalized."""
+    skills = canonical_skills(pattern_tokens(value))
+    if skills:
+        return max(skills, key=len)
+    return " ".join(normalize_words([value]))
+
+# ---------- 2) Index ----------
+class CandidateIndex:
+    """
+    BM25 + facet-filter index. Every worker keeps the postings in memory and
+    catches up from SQLite before each search / add: rows added by other
+    workers are read incrementally, and a compaction (generation bump) by
+    anyone triggers a full, blob-based reload.
+    """
+
+    def __init__(self, db_path: str = INDEX_DB, k1: float = BM25_K1, b: float = BM25_B,
+                 compact_rows: int = COMPACT_ROWS):
+        self.db_path = db_path
+        self.k1, self.b = k1, b
+        self.compact_rows = compact_rows
+        self._lock = threading.RLock()
+        self._conn = None
+        self._pid = None
+        self._generation = None
+        self._reset()
+        self._queue: "queue.Queue" = queue.Queue()
+        self._writer: Optional[threading.Thread] = None
+        self._last_purge = 0.0
+        self.counters = {"added": 0, "skipped": 0, "searches": 0, "reloads": 0, "compactions": 0, "index_errors": 0,
+                         "deleted": 0}
+
+    def _reset(self) -> None:
+        self._postings: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}   # term -> (doc ids int32, tf float32)
+        self._pending: Dict[str, Tuple[List[int], List[float]]] = {}     # appended since the arrays were built
+        self._lengths = np.zeros(1024, dtype=np.float32)                   # by doc id; 0 = no such doc
+        self._docs: Dict[int, Tuple[str, str, str]] = {}                   # doc id -> (key, filename, name)
+        self._keys: Dict[str, int] = {}
+        self._total_len = 0.0
+        self._dead = 0          # tombstoned doc ids still present in compacted postings
+        self._seen = 0          # highest doc id read from SQLite
+        self._delta_rows = 0
+
+    # ----- sqlite -----
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None or self._pid != os.getpid():
+            Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS docs (doc_id INTEGER PRIMARY KEY, key TEXT UNIQUE, filename TEXT,"
+                " name TEXT, length INTEGER, text BLOB, added REAL)"
+            )
+            conn.execute("CREATE TABLE IF NOT EXISTS postings (term TEXT PRIMARY KEY, ids BLOB, tfs BLOB)")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS postings_delta (term TEXT, doc_id INTEGER, tf REAL,"
+                " PRIMARY KEY (doc_id, term)) WITHOUT ROWID"
+            )
+            conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER)")
+            conn.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('generation', 0)")
+            # an empty index takes the current term normalization; a filled one keeps what it was built with
+            has_docs = conn.execute("SELECT 1 FROM docs LIMIT 1").fetchone() is not None
+            conn.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('terms_version', ?)",
+                         (1 if has_docs else TERMS_VERSION,))
+            version = conn.execute("SELECT value FROM meta WHERE key = 'terms_version'").fetchone()[0]
+            if version != TERMS_VERSION:
+                log.warning("candidate index %s was built with term normalization v%s (current v%s); "
+                            "run `python -m src.pipeline.candidate_index reindex`", self.db_path, version, TERMS_VERSION)
+            self._conn, self._pid = conn, os.getpid()
+            self._generation = None
+        return self._conn
+
+    def _register(self, doc_id: int, key: str, filename: str, name: str, length: int) -> None:
+        if doc_id >= len(self._lengths):
+            grown = np.zeros(max(doc_id + 1, len(self._lengths) * 2), dtype=np.float32)
+            grown[:len(self._lengths)] = self._lengths
+            self._lengths = grown
+        self._lengths[doc_id] = max(1, length)
+        self._docs[doc_id] = (key, filename, name)
+        self._keys[key] = doc_id
+        self._total_len += max(1, length)
+
+    def _append(self, term: str, doc_id: int, tf: float) -> None:
+        ids, tfs = self._pending.setdefault(term, ([], []))
+        ids.append(doc_id)
+        tfs.append(tf)
+
+    def _load_docs(self, conn: sqlite3.Connection, after: int) -> Set[int]:
+        new = set()
+        for doc_id, key, filename, name, length in conn.execute(
+                "SELECT doc_id, key, filename, name, length FROM docs WHERE doc_id > ? ORDER BY doc_id", (after,)):
+            if key is None:
+                # tombstone of a deleted resume
+                self._dead += 1
+            elif doc_id not in self._docs:
+                self._register(doc_id, key, filename, name, length)
+                new.add(doc_id)
+            self._seen = max(self._seen, doc_id)
+        return new
+
+    def _load_delta(self, conn: sqlite3.Connection, after: int, only: Optional[Set[int]] = None) -> None:
+        for term, doc_id, tf in conn.execute(
+                "SELECT term, doc_id, tf FROM postings_delta WHERE doc_id > ? ORDER BY doc_id", (after,)):
+            if only is None or doc_id in only:
+                self._append(term, doc_id, tf)
+                self._delta_rows += 1
+
+    def _sync(self) -> None:
+        """Catch up with SQLite: incremental for new docs, full reload after a compaction."""
+        conn = self._db()
+        generation = conn.execute("SELECT value FROM meta WHERE key = 'generation'").fetchone()[0]
+        if generation != self._generation:
+            self._reset()
+            for term, ids, tfs in conn.execute("SELECT term, ids, tfs FROM postings"):
+                self._postings[term] = (np.frombuffer(ids, dtype=np.int32), np.frombuffer(tfs, dtype=np.float32))
+            self._load_docs(conn, 0)
+            self._load_delta(conn, 0)
+            self._generation = generation
+            self.counters["reloads"] += 1
+            return
+        latest = conn.execute("SELECT COALESCE(MAX(doc_id), 0) FROM docs").fetchone()[0]
+        if latest > self._seen:
+            before = self._seen
+            new = self._load_docs(conn, before)
+            if new:
+                self._load_delta(conn, before, new)
+
+    def _get(self, term: str) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """Postings for a term, folding in anything appended since they were last built."""
+        pending = self._pending.pop(term, None)
+        base = self._postings.get(term)
+        if pending is not None:
+            ids = np.asarray(pending[0], dtype=np.int32)
+            tfs = np.asarray(pending[1], dtype=np.float32)
+            if base is not None:
+                ids, tfs = np.concatenate([base[0], ids]), np.concatenate([base[1], tfs])
+            base = self._postings[term] = (ids, tfs)
+        return base
+
+    # ----- writes -----
+    def add(self, key: str, filename: str, prep: Dict, text: str = "", added: float = None) -> bool:
+        """Index one preprocessed resume; False if this content was already indexed."""
+        terms, facets = index_terms(prep), index_facets(prep)
+        length = sum(terms.values())
+        name = (prep.get("contact") or {}).get("name") or ""
+        blob = zlib.compress(text.encode("utf-8"))
+        with self._lock:
+            self._sync()
+            if key in self._keys:
+                self.counters["skipped"] += 1
+                return False
+            conn = self._db()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                cur = conn.execute(
+                    "INSERT OR IGNORE INTO docs (key, filename, name, length, text, added) VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, filename, name, length, blob, added or time.time()),
+                )
+                if not cur.rowcount:
+                    # another worker indexed the same content first
+                    conn.execute("ROLLBACK")
+                    self.counters["skipped"] += 1
+                    return False
+                doc_id = cur.lastrowid
+                rows = [(t, doc_id, float(tf)) for t, tf in terms.items()] + [(f, doc_id, 1.0) for f in facets]
+                conn.executemany("INSERT OR IGNORE INTO postings_delta (term, doc_id, tf) VALUES (?, ?, ?)", rows)
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            self._register(doc_id, key, filename, name, length)
+            for term, doc, tf in rows:
+                self._append(term, doc, tf)
+            self._delta_rows += len(rows)
+            self.counters["added"] += 1
+            if self.compact_rows and self._delta_rows >= self.compact_rows:
+                self.compact()
+        return True
+
+    def compact(self) -> int:
+        """
+        Fold the delta table into the per-term numpy blobs (and drop deleted
+        docs from every blob); other workers reload on their next sync.
+        """
+        with self._lock:
+            conn = self._db()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._sync()
+                terms = {t for (t,) in conn.execute("SELECT DISTINCT term FROM postings_delta")}
+                purge = self._dead > 0
+                if purge:
+                    terms |= self._postings.keys() | self._pending.keys()
+                for term in terms:
+                    ids, tfs = self._get(term)
+                    if purge:
+                        live = self._lengths[ids] > 0
+                        ids, tfs = ids[live], tfs[live]
+                        if not len(ids):
+                            conn.execute("DELETE FROM postings WHERE term = ?", (term,))
+                            self._postings.pop(term, None)
+                            continue
+                        self._postings[term] = (ids, tfs)
+                    conn.execute("INSERT OR REPLACE INTO postings (term, ids, tfs) VALUES (?, ?, ?)",
+                                 (term, ids.astype(np.int32).tobytes(), tfs.astype(np.float32).tobytes()))
+                conn.execute("DELETE FROM postings_delta")
+                conn.execute("UPDATE meta SET value = value + 1 WHERE key = 'generation'")
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            self._generation = conn.execute("SELECT value FROM meta WHERE key = 'generation'").fetchone()[0]
+            self._delta_rows = 0
+            self._dead = 0
+            self.counters["compactions"] += 1
+            return len(terms)
+
+    def delete(self, keys: Iterable[str]) -> int:
+        """Remove resumes (by content key) from the index and erase their stored text; returns how many."""
+        keys = list(keys)
+        if not keys:
+            return 0
+        with self._lock:
+            conn = self._db()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                q = "SELECT doc_id FROM docs WHERE key IN (%s)" % ",".join("?" * len(keys))
+                doc_ids = [d for (d,) in conn.execute(q, keys)]
+                if not doc_ids:
+                    conn.execute("ROLLBACK")
+                    return 0
+                marks = ",".join("?" * len(doc_ids))
+                conn.execute("UPDATE docs SET key = NULL, filename = '', name = '', text = NULL, length = 0"
+                             " WHERE doc_id IN (%s)" % marks, doc_ids)
+                conn.execute("DELETE FROM postings_delta WHERE doc_id IN (%s)" % marks, doc_ids)
+                conn.execute("UPDATE meta SET value = value + 1 WHERE key = 'generation'")
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            self.counters["deleted"] += len(doc_ids)
+            # rewrite the compacted blobs without the deleted docs (full reload first)
+            self.compact()
+            return len(doc_ids)
+
+    def purge(self, max_age_days: float = RETENTION_DAYS) -> int:
+        """Delete every resume indexed more than max_age_days ago (no-op for 0)."""
+        self._last_purge = time.time()
+        if max_age_days <= 0:
+            return 0
+        cutoff = time.time() - max_age_days * 86400
+        with self._lock:
+            keys = [k for (k,) in self._db().execute(
+                "SELECT key FROM docs WHERE key IS NOT NULL AND added < ?", (cutoff,))]
+        return self.delete(keys)
+
+    # ----- background indexing -----
+    def enqueue(self, key: str, filename: str, text: str, base: Dict, jd_csv_path: str) -> None:
+        """Index a resume off the request path (skills are resolved on the writer thread)."""
+        if key in self._keys:
+            return
+        self._queue.put((key, filename, text, base, jd_csv_path))
+        if self._writer is None or not self._writer.is_alive():
+            with self._lock:
+                if self._writer is None or not self._writer.is_alive():
+                    self._writer = threading.Thread(target=self._write_loop, name="candidate-index", daemon=True)
+                    self._writer.start()
+
+    def _write_loop(self) -> None:
+        from src.pipeline.preprocess_resume_text import preprocess_resume_text
+        while True:
+            key, filename, text, base, jd_csv_path = self._queue.get()
+            try:
+                self.add(key, filename, preprocess_resume_text(text, jd_csv_path, base=base), text)
+                if time.time() - self._last_purge > PURGE_EVERY_S:
+                    self.purge()
+            except Exception as e:
+                self.counters["index_errors"] += 1
+                log.warning("could not index %s: %s", filename, e)
+
+    # ----- reads -----
+    def _filter(self, facets: List[str]) -> Optional[np.ndarray]:
+        """Doc ids carrying every facet (AND); None when there is no filter."""
+        allowed = None
+        for facet in facets:
+            post = self._get(facet)
+            if post is None:
+                return np.zeros(0, dtype=np.int32)
+            allowed = post[0] if allowed is None else np.intersect1d(allowed, post[0], assume_unique=True)
+        return allowed
+
+    def search(self, terms: Iterable[str], must_have: Iterable[str] = (), sections: Iterable[str] = (),
+               top_k: int = 20) -> List[Dict]:
+        """
+        Top-k candidates by BM25 of terms (normalized by query_terms), restricted
+        to resumes that have every must_have skill (canonicalized: "k8s" finds
+        kubernetes) and every listed section. Best first.
+        """
+        with self._lock:
+            self._sync()
+            self.counters["searches"] += 1
+            n_docs = len(self._docs)
+            if not n_docs or top_k <= 0:
+                return []
+            allowed = self._filter([SKILL_FACET + canonical_facet(s) for s in must_have if s.strip()] +
+                                   [SECTION_FACET + s.strip().lower() for s in sections if s.strip()])
+            if allowed is not None:
+                # deleted docs linger in compacted postings until the next compaction
+                allowed = allowed[self._lengths[allowed] > 0]
+                if not len(allowed):
+                    return []
+            lengths = self._lengths
+            norm = self.k1 * (1.0 - self.b + self.b * lengths / (self._total_len / n_docs))
+            scores = np.zeros(len(lengths), dtype=np.float32)
+            for term in query_terms(terms):
+                post = self._get(term)
+                if post is None:
+                    continue
+                ids, tfs = post
+                idf = math.log(1.0 + (n_docs - len(ids) + 0.5) / (len(ids) + 0.5))
+                scores[ids] += idf * tfs * (self.k1 + 1.0) / (tfs + norm[ids])
+            scores[lengths == 0] = 0.0
+            candidates = allowed if allowed is not None else np.flatnonzero(scores)
+            if not len(candidates):
+                return []
+            k = min(top_k, len(candidates))
+            cand_scores = scores[candidates]
+            top = np.argpartition(-cand_scores, k - 1)[:k]
+            top = top[np.argsort(-cand_scores[top], kind="stable")]
+            out = []
+            for i in top:
+                doc_id = int(candidates[i])
+                key, filename, name = self._docs[doc_id]
+                out.append({"doc_id": doc_id, "key": key, "file": filename, "name": name,
+                            "bm25": round(float(cand_scores[i]), 4)})
+            return out
+
+    def reindex(self, jd_csv_path: str) -> int:
+        """
+        Re-index every stored resume from its text with the current term
+        normalization (keeping its key and indexing time); returns how many.
+        """
+        from src.pipeline.preprocess_resume_text import preprocess_resume_text
+        with self._lock:
+            conn = self._db()
+            rows = conn.execute("SELECT key, filename, text, added FROM docs WHERE key IS NOT NULL").fetchall()
+            self.delete([r[0] for r in rows])
+            for key, filename, blob, added in rows:
+                text = zlib.decompress(blob).decode("utf-8") if blob is not None else ""
+                self.add(key, filename, preprocess_resume_text(text, jd_csv_path), text, added=added)
+            conn.execute("UPDATE meta SET value = ? WHERE key = 'terms_version'", (TERMS_VERSION,))
+            self.compact()
+            return len(rows)
+
+    def texts(self, doc_ids: List[int]) -> Dict[int, str]:
+        """Stored raw text of the given docs (for full scoring of a shortlist)."""
+        if not doc_ids:
+            return {}
+        with self._lock:
+            q = "SELECT doc_id, text FROM docs WHERE doc_id IN (%s)" % ",".join("?" * len(doc_ids))
+            return {d: zlib.decompress(t).decode("utf-8") for d, t in self._db().execute(q, doc_ids) if t is not None}
+
+    def metrics(self) -> Dict:
+        return {**self.counters, "docs": len(self._docs), "terms": len(self._postings.keys() | self._pending.keys()),
+                "delta_rows": self._delta_rows, "queued": self._queue.qsize()}
+
+# ---------- Process-wide index ----------
+_index: Optional[CandidateIndex] = None
+_lock = threading.Lock()
+
+def get_candidate_index() -> CandidateIndex:
+    global _index
+    if _index is None:
+        with _lock:
+            if _index is None:
+                _index = CandidateIndex()
+    return _index
+
+if __name__ == "__main__":
+    import sys, argparse
+    from src.pipeline.extraction import SUPPORTED_TYPES, ExtractionError, file_type_of
+    from src.pipeline.resume_cache import extract_and_preprocess
+    from src.pipeline.preprocess_resume_text import preprocess_resume_text
+    from src.pipeline.ats_scoring import _jd_terms_set
+
+    parser = argparse.ArgumentParser(description="Build / query the candidate search index.")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    build = sub.add_parser("build", help="index every resume in a folder")
+    build.add_argument("folder")
+    build.add_argument("--jd-csv", default=str(BASE_DIR / "job_keywords.csv"))
+    sub.add_parser("compact", help="fold pending rows into the postings blobs")
+    reindex = sub.add_parser("reindex", help="rebuild every resume's postings with the current term normalization")
+    reindex.add_argument("--jd-csv", default=str(BASE_DIR / "job_keywords.csv"))
+    delete = sub.add_parser("delete", help="remove resumes by key (as returned by /search)")
+    delete.add_argument("keys", nargs="+")
+    purge = sub.add_parser("purge", help="remove resumes indexed more than --days ago")
+    purge.add_argument("--days", type=float, default=RETENTION_DAYS)
+    search = sub.add_parser("search", help="BM25 top-k for a JD text file")
+    search.add_argument("jd")
+    search.add_argument("--must", default="", help="comma-separated required skills")
+    search.add_argument("--sections", default="", help="comma-separated required sections")
+    search.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    index = get_candidate_index()
+    if args.cmd == "build":
+        added = 0
+        for path in sorted(Path(args.folder).iterdir()):
+            if not (path.is_file() and file_type_of(path.name) in SUPPORTED_TYPES):
+                continue
+            try:
+                key, text, base = extract_and_preprocess(path.read_bytes(), path.name)
+            except ExtractionError as e:
+                print(f"skipping {path.name}: {e}", file=sys.stderr)
+                continue
+            added += index.add(key, path.name, preprocess_resume_text(text, args.jd_csv, base=base), text)
+        print(f"✅ Indexed {added} new resumes ({index.metrics()['docs']} total); compacted {index.compact()} terms")
+    elif args.cmd == "compact":
+        print(f"✅ Compacted {index.compact()} terms")
+    elif args.cmd == "reindex":
+        print(f"✅ Re-indexed {index.reindex(args.jd_csv)} resumes")
+    elif args.cmd == "delete":
+        print(f"✅ Deleted {index.delete(args.keys)} resumes")
+    elif args.cmd == "purge":
+        print(f"✅ Purged {index.purge(args.days)} resumes older than {args.days:g} days")
+    else:
+        start = time.perf_counter()
+        hits = index.search(_jd_terms_set(Path(args.jd).read_text(encoding="utf-8", errors="ignore")),
+                            args.must.split(","), args.sections.split(","), args.top)
+        elapsed = (time.perf_counter() - start) * 1000
+        for h in hits:
+            print(f"{h['bm25']:8.3f}  {h['file']}  {h['name']}")
+        print(f"{len(hits)} hits in {elapsed:.1f} ms")
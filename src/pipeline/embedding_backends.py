@@ -0,0 +1,158 @@
+# src/pipeline/embedding_backends.py
+"""
+CPU inference backends for the sentence embedding model (EMBEDDING_BACKEND):
+
+  torch       full-precision SentenceTransformer (default)
+  torch-int8  the same model with its Linear layers dynamically quantized to int8
+  onnx        an exported graph run by onnxruntime from EMBEDDING_MODEL_DIR
+              (EMBEDDING_ONNX_FILE selects model.onnx or model_int8.onnx)
+
+Every backend exposes the slice of the SentenceTransformer API that matcher
+uses: encode(), get_sentence_embedding_dimension() and max_seq_length.
+Export a model directory once with
+
+    python -m src.pipeline.embedding_backends export models/minilm-onnx [--int8]
+"""
+import os, json
+from pathlib import Path
+from typing import List, Union
+import numpy as np
+
+# ---------- Config ----------
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "torch")
+MODEL_DIR = os.getenv("EMBEDDING_MODEL_DIR", str(BASE_DIR / "models" / "minilm-onnx"))
+ONNX_FILE = os.getenv("EMBEDDING_ONNX_FILE", "model.onnx")
+# 0 = let onnxruntime pick (all physical cores)
+ONNX_THREADS = int(os.getenv("EMBEDDING_ONNX_THREADS", "0"))
+
+BACKENDS = ("torch", "torch-int8", "onnx")
+
+class UnknownEmbeddingBackend(ValueError):
+    pass
+
+# ---------- 1) PyTorch ----------
+def load_torch(model_name: str):
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer(model_name, device="cpu")
+
+def load_torch_int8(model_name: str):
+    """Dynamic int8 quantization: weights stored as int8, activations quantized per batch."""
+    import torch
+    return torch.quantization.quantize_dynamic(load_torch(model_name), {torch.nn.Linear}, dtype=torch.qint8)
+
+# ---------- 2) ONNX Runtime ----------
+class OnnxEncoder:
+    """
+    Transformer graph in onnxruntime plus the model's own mean pooling, so
+    vectors match SentenceTransformer.encode for the MiniLM family.
+    Texts are batched by length to keep padding (wasted compute) low.
+    """
+
+    def __init__(self, model_dir: str = MODEL_DIR, file_name: str = ONNX_FILE, threads: int = ONNX_THREADS):
+        import onnxruntime as ort
+        from transformers import AutoTokenizer
+
+        model_dir = Path(model_dir)
+        path = model_dir / file_name
+        if not path.exists():
+            raise FileNotFoundError(
+                f"No ONNX model at {path}; run `python -m src.pipeline.embedding_backends export {model_dir}`"
+            )
+        opts = ort.SessionOptions()
+        opts.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if threads:
+            opts.intra_op_num_threads = threads
+        self.session = ort.InferenceSession(str(path), opts, providers=["CPUExecutionProvider"])
+        self.input_names = {i.name for i in self.session.get_inputs()}
+        self.tokenizer = AutoTokenizer.from_pretrained(str(model_dir))
+        config = json.loads((model_dir / "config.json").read_text(encoding="utf-8"))
+        self.dim = int(config["hidden_size"])
+        st_config = model_dir / "sentence_bert_config.json"
+        self.max_seq_length = int(json.loads(st_config.read_text(encoding="utf-8")).get("max_seq_length", 256)) \
+            if st_config.exists() else 256
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.dim
+
+    def _embed(self, texts: List[str]) -> np.ndarray:
+        enc = self.tokenizer(texts, padding=True, truncation=True, max_length=self.max_seq_length, return_tensors="np")
+        feeds = {k: v.astype(np.int64) for k, v in enc.items() if k in self.input_names}
+        hidden = self.session.run(None, feeds)[0]
+        mask = enc["attention_mask"][..., None].astype(np.float32)
+        return (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+
+    def encode(self, sentences: Union[str, List[str]], batch_size: int = 32, convert_to_numpy: bool = True,
+               normalize_embeddings: bool = False, **_) -> np.ndarray:
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        out = np.zeros((len(texts), self.dim), dtype=np.float32)
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        for start in range(0, len(order), batch_size):
+            idx = order[start:start + batch_size]
+            out[idx] = self._embed([texts[i] for i in idx])
+        if normalize_embeddings:
+            out /= np.clip(np.linalg.norm(out, axis=1, keepdims=True), 1e-12, None)
+        return out[0] if single else out
+
+def load_onnx(model_name: str):
+    # model_name is fixed at export time; the directory decides what runs
+    return OnnxEncoder()
+
+# ---------- 3) Selection ----------
+_LOADERS = {"torch": load_torch, "torch-int8": load_torch_int8, "onnx": load_onnx}
+
+def load_encoder(model_name: str, backend: str = EMBEDDING_BACKEND):
+    if backend not in _LOADERS:
+        raise UnknownEmbeddingBackend(f"Unknown embedding backend {backend!r}; choose one of {', '.join(BACKENDS)}")
+    return _LOADERS[backend](model_name)
+
+def model_key(model_name: str, backend: str = EMBEDDING_BACKEND) -> str:
+    """
+    Identity of the vectors a backend produces (embedding cache and JD profile
+    key). Quantized / exported models drift slightly, so they never share cached
+    vectors with the full-precision model.
+    """
+    if backend == "torch":
+        return model_name
+    if backend == "onnx":
+        return f"{model_name}@onnx:{ONNX_FILE}"
+    return f"{model_name}@{backend}"
+
+# ---------- 4) Export ----------
+def export_onnx(out_dir, model_name: str, int8: bool = False, opset: int = 14) -> Path:
+    """Export the SentenceTransformer's transformer to ONNX (+ optional int8 copy) with its tokenizer."""
+    import torch
+    from sentence_transformers import SentenceTransformer
+
+    out = Path(out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    st = SentenceTransformer(model_name, device="cpu")
+    model, tokenizer = st[0].auto_model.eval(), st.tokenizer
+    dummy = tokenizer(["export sample text"], return_tensors="pt")
+    names = [n for n in ("input_ids", "attention_mask", "token_type_ids") if n in dummy]
+    axes = {n: {0: "batch", 1: "seq"} for n in names + ["last_hidden_state"]}
+    with torch.no_grad():
+        torch.onnx.export(model, tuple(dummy[n] for n in names), str(out / "model.onnx"),
+                          input_names=names, output_names=["last_hidden_state"],
+                          dynamic_axes=axes, opset_version=opset)
+    tokenizer.save_pretrained(str(out))
+    model.config.save_pretrained(str(out))
+    (out / "sentence_bert_config.json").write_text(json.dumps({"max_seq_length": st.max_seq_length}), encoding="utf-8")
+    if int8:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+        quantize_dynamic(str(out / "model.onnx"), str(out / "model_int8.onnx"), weight_type=QuantType.QInt8)
+    return out
+
+if __name__ == "__main__":
+    import argparse
+    from src.pipeline.matcher import MODEL_NAME
+
+    parser = argparse.ArgumentParser(description="Export the embedding model for the onnx backend.")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    exp = sub.add_parser("export")
+    exp.add_argument("out_dir", nargs="?", default=MODEL_DIR)
+    exp.add_argument("--model", default=MODEL_NAME)
+    exp.add_argument("--int8", action="store_true", help="also write a dynamically quantized model_int8.onnx")
+    args = parser.parse_args()
+    print(f"✅ Exported {args.model} to {export_onnx(args.out_dir, args.model, args.int8)}")
@@ -0,0 +1,148 @@
+# src/pipeline/embedding_benchmark.py
+"""
+Latency / throughput / memory / score-drift benchmark for the embedding backends.
+
+    python -m src.pipeline.embedding_benchmark path/to/resumes path/to/JD [--backends torch,onnx] [--repeat 3]
+
+Every resume (.pdf/.docx/.txt) is scored against every JD (.txt) with
+matcher.calculate_similarity, once per backend, each backend in its own fresh
+process with the embedding cache switched off, so the numbers are the model's.
+Drift is measured against the first backend listed (torch by default).
+"""
+import os, sys, json, time, argparse, resource
+import multiprocessing as mp
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# embedding modules read their env config at import, so only the per-backend
+# child processes import them (after setting the env)
+from src.pipeline.extraction import SUPPORTED_TYPES, ExtractionError, extract_text_from_bytes, file_type_of
+
+# ---------- Corpus ----------
+def load_texts(folder, types=SUPPORTED_TYPES) -> Dict[str, str]:
+    texts = {}
+    for path in sorted(Path(folder).iterdir()):
+        if path.is_file() and file_type_of(path.name) in types:
+            try:
+                texts[path.name] = extract_text_from_bytes(path.read_bytes(), path.name)
+            except ExtractionError as e:
+                print(f"skipping {path.name}: {e}", file=sys.stderr)
+    return texts
+
+def _rss_mb() -> float:
+    # ru_maxrss is KiB on Linux
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+def _percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))] if ordered else 0.0
+
+# ---------- One backend (fresh process: load time and RSS are per backend) ----------
+def _bench_backend(backend: str, resumes: List[str], jds: List[str], repeat: int) -> Dict:
+    os.environ["EMBEDDING_BACKEND"] = backend
+    # no SQLite / in-memory vector cache: every call reaches the model
+    os.environ["EMBEDDING_CACHE_DB"] = ""
+    os.environ["EMBEDDING_CACHE_MEM_ENTRIES"] = "0"
+    start = time.perf_counter()
+    from src.pipeline import matcher
+    model = matcher.get_model()
+    load_s = time.perf_counter() - start
+    rss_loaded = _rss_mb()
+
+    matcher.calculate_similarity(resumes[0], jds[0])    # warm-up (lazy kernels / allocator)
+    latencies, scores = [], []
+    for r in range(repeat):
+        for resume in resumes:
+            for jd in jds:
+                t = time.perf_counter()
+                score = matcher.calculate_similarity(resume, jd)
+                latencies.append(time.perf_counter() - t)
+                if r == 0:
+                    scores.append(score)
+
+    # throughput: every chunk of every text in one batched encode call
+    texts = [c for text in resumes + jds for c in matcher.chunk_text(text)]
+    t = time.perf_counter()
+    model.encode(texts, batch_size=32, convert_to_numpy=True, normalize_embeddings=True)
+    encode_s = time.perf_counter() - t
+
+    return {
+        "backend": backend,
+        "pairs": len(resumes) * len(jds),
+        "load_s": round(load_s, 2),
+        "p50_ms": round(_percentile(latencies, 0.50) * 1000, 2),
+        "p95_ms": round(_percentile(latencies, 0.95) * 1000, 2),
+        "chunks_per_sec": round(len(texts) / encode_s, 1) if encode_s else 0.0,
+        "rss_loaded_mb": rss_loaded,
+        "max_rss_mb": _rss_mb(),
+        "scores": scores,
+    }
+
+def score_drift(scores: List[float], reference: List[float], n_jds: int) -> Dict[str, float]:
+    """Absolute score differences (0-100 scale) and how often each JD keeps the same best resume."""
+    diffs = [abs(a - b) for a, b in zip(scores, reference)]
+    n_resumes = len(scores) // n_jds if n_jds else 0
+    same_top = 0
+    for j in range(n_jds):
+        col = [scores[r * n_jds + j] for r in range(n_resumes)]
+        ref = [reference[r * n_jds + j] for r in range(n_resumes)]
+        same_top += col.index(max(col)) == ref.index(max(ref))
+    return {
+        "mean_abs_drift": round(sum(diffs) / len(diffs), 3) if diffs else 0.0,
+        "max_abs_drift": round(max(diffs), 3) if diffs else 0.0,
+        "top1_agreement": round(same_top / n_jds, 3) if n_jds and n_resumes else 1.0,
+    }
+
+def run_benchmark(resume_folder, jd_folder, backends: Optional[List[str]] = None, repeat: int = 3) -> List[Dict]:
+    resumes = [t for t in load_texts(resume_folder).values() if t.strip()]
+    jds = [t for t in load_texts(jd_folder, ("txt",)).values() if t.strip()]
+    if not resumes or not jds:
+        raise SystemExit(f"Need at least one resume in {resume_folder} and one JD in {jd_folder}")
+    from src.pipeline.embedding_backends import BACKENDS
+    backends = backends or ["torch"]
+    unknown = [b for b in backends if b not in BACKENDS]
+    if unknown:
+        raise SystemExit(f"Unknown backend(s) {', '.join(unknown)}; choose from {', '.join(BACKENDS)}")
+
+    ctx = mp.get_context("spawn")
+    results = []
+    for backend in backends:
+        with ctx.Pool(1) as pool:
+            try:
+                results.append(pool.apply(_bench_backend, (backend, resumes, jds, repeat)))
+            except (ImportError, OSError) as e:
+                print(f"skipping {backend}: {e}", file=sys.stderr)
+    if results:
+        reference = results[0]["scores"]
+        for r in results:
+            r.update(score_drift(r.pop("scores"), reference, len(jds)))
+    return results
+
+def print_table(results: List[Dict]) -> None:
+    cols = ["backend", "pairs", "load_s", "p50_ms", "p95_ms", "chunks_per_sec", "rss_loaded_mb", "max_rss_mb",
+            "mean_abs_drift", "max_abs_drift", "top1_agreement"]
+    widths = {c: max(len(c), *(len(str(r[c])) for r in results)) for c in cols}
+    print("  ".join(c.ljust(widths[c]) for c in cols))
+    for r in results:
+        print("  ".join(str(r[c]).ljust(widths[c]) for c in cols))
+
+if __name__ == "__main__":
+    from src.pipeline.embedding_backends import BACKENDS
+    parser = argparse.ArgumentParser(description="Benchmark embedding inference backends on a resume/JD set.")
+    parser.add_argument("resumes", help="folder of sample resumes")
+    parser.add_argument("jds", help="folder of .txt JDs")
+    parser.add_argument("--backends", default="torch,torch-int8,onnx",
+                        help=f"comma-separated subset of {','.join(BACKENDS)}; the first is the drift reference")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", action="store_true", help="print raw JSON instead of a table")
+    args = parser.parse_args()
+
+    chosen = [b.strip() for b in args.backends.split(",") if b.strip()] or None
+    results = run_benchmark(args.resumes, args.jds, chosen, max(1, args.repeat))
+    if not results:
+        raise SystemExit("No backend could be loaded")
+    if args.json:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+    else:
+        print_table(results)
@@ -0,0 +1,102 @@
+# src/pipeline/embedding_scheduler.py
+import os, asyncio
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+
+from src.pipeline.matcher import encode_texts, score_section_chunks, section_chunks
+from src.pipeline.executors import get_inference_executor
+
+# ---------- Config ----------
+MAX_WAIT_MS = float(os.getenv("EMBED_BATCH_MAX_WAIT_MS", "5"))
+MAX_BATCH = int(os.getenv("EMBED_BATCH_MAX_SIZE", "32"))
+
+class EmbeddingScheduler:
+    """
+    Dynamic micro-batcher in front of matcher.encode_texts.
+    Concurrent coroutines enqueue single texts; a collector task waits up to
+    max_wait_ms (or until max_batch texts are queued), encodes them in one
+    call on the inference thread and resolves each caller's future with its own vector.
+    """
+
+    def __init__(self, max_wait_ms: float = MAX_WAIT_MS, max_batch: int = MAX_BATCH, executor=None):
+        self.max_wait = max_wait_ms / 1000.0
+        self.max_batch = max(1, max_batch)
+        self.executor = executor
+        self._queue: Optional[asyncio.Queue] = None
+        self._loop = None
+        self._worker = None
+        self.counters = {"requests": 0, "batches": 0, "batched_items": 0, "last_batch_size": 0, "max_batch_size": 0}
+
+    def _ensure_worker(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._worker is None or self._worker.done():
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run())
+
+    async def _collect(self) -> List[Tuple[str, asyncio.Future]]:
+        batch = [await self._queue.get()]
+        deadline = self._loop.time() + self.max_wait
+        while len(batch) < self.max_batch:
+            timeout = deadline - self._loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self) -> None:
+        while True:
+            batch = await self._collect()
+            texts = [t for t, _ in batch]
+            self.counters["batches"] += 1
+            self.counters["batched_items"] += len(batch)
+            self.counters["last_batch_size"] = len(batch)
+            self.counters["max_batch_size"] = max(self.counters["max_batch_size"], len(batch))
+            try:
+                vecs = await self._loop.run_in_executor(self.executor or get_inference_executor(), encode_texts, texts)
+            except Exception as e:
+                for _, fut in batch:
+                    if not fut.done():
+                        fut.set_exception(e)
+                continue
+            for (_, fut), vec in zip(batch, vecs):
+                if not fut.done():
+                    fut.set_result(vec)
+
+    async def encode(self, text: str) -> np.ndarray:
+        self._ensure_worker()
+        fut = self._loop.create_future()
+        self.counters["requests"] += 1
+        await self._queue.put((text, fut))
+        return await fut
+
+    async def similarity(self, resume_text: str, jd_embedding: np.ndarray) -> float:
+        """Async, batched equivalent of matcher.similarity_to_embedding."""
+        if not resume_text.strip() or jd_embedding is None:
+            return 0.0
+        vec = await self.encode(resume_text)
+        return round(float(np.dot(vec, jd_embedding)) * 100, 2)
+
+    async def section_similarity(self, sections: Dict[str, str], jd_chunks: np.ndarray) -> Tuple[float, Dict[str, float]]:
+        """Async matcher.section_similarity: all chunks are queued at once, so they share a batch."""
+        chunks = section_chunks(sections)
+        if not chunks or jd_chunks is None:
+            return 0.0, {}
+        vecs = await asyncio.gather(*(self.encode(c) for _, c in chunks))
+        return score_section_chunks([name for name, _ in chunks], np.vstack(vecs), jd_chunks)
+
+    def metrics(self) -> Dict:
+        batches = self.counters["batches"]
+        return {
+            **self.counters,
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "avg_batch_size": round(self.counters["batched_items"] / batches, 2) if batches else 0.0,
+            "max_wait_ms": self.max_wait * 1000.0,
+            "max_batch": self.max_batch,
+        }
+
+# ---------- Process-wide scheduler ----------
+embedding_scheduler = EmbeddingScheduler()
@@ -0,0 +1,166 @@
+# src/pipeline/embedding_store.py
+import os, re, time, sqlite3, hashlib, threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional
+import numpy as np
+
+# ---------- Config ----------
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+EMBEDDING_DB = os.getenv("EMBEDDING_CACHE_DB", str(BASE_DIR / ".cache" / "embeddings.sqlite"))
+MEM_ENTRIES = int(os.getenv("EMBEDDING_CACHE_MEM_ENTRIES", "4096"))
+MMAP_BYTES = int(os.getenv("EMBEDDING_CACHE_MMAP_MB", "256")) * 1024 * 1024
+# vector bytes the SQLite table may hold before least-recently-used rows are evicted
+DISK_MAX_BYTES = int(os.getenv("EMBEDDING_CACHE_DISK_MB", "512")) * 1024 * 1024
+
+MULTI_WS = re.compile(r"\s+")
+
+def normalize_for_embedding(text: str) -> str:
+    """Whitespace-only normalization: never changes what the tokenizer sees."""
+    return MULTI_WS.sub(" ", text).strip()
+
+def text_key(model_name: str, text: str) -> str:
+    return hashlib.sha256(f"{model_name}\x00{text}".encode("utf-8")).hexdigest()
+
+class EmbeddingStore:
+    """
+    Embedding vectors keyed by (model name, normalized-text hash).
+    In-process LRU in front of a memory-mapped SQLite blob table that every
+    worker process (and every restart) shares, evicted least-recently-used
+    once its vectors grow past disk_max_bytes.
+    """
+
+    def __init__(self, db_path: str = EMBEDDING_DB, mem_entries: int = MEM_ENTRIES,
+                 disk_max_bytes: int = DISK_MAX_BYTES):
+        self.db_path = db_path
+        self.mem_entries = mem_entries
+        self.disk_max_bytes = disk_max_bytes
+        self._mem: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = None
+        self._pid = None
+        # this process's estimate of the table; recounted before evicting, since workers share it
+        self._disk_rows = 0
+        self._disk_bytes = 0
+        self.counters = {"mem_hits": 0, "disk_hits": 0, "misses": 0, "mem_evictions": 0, "disk_evictions": 0}
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None or self._pid != os.getpid():
+            Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.db_path, timeout=10, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(f"PRAGMA mmap_size={MMAP_BYTES}")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                " key TEXT PRIMARY KEY, model TEXT, dim INTEGER, vec BLOB, created REAL, last_access REAL)"
+            )
+            cols = {r[1] for r in conn.execute("PRAGMA table_info(embeddings)")}
+            if "last_access" not in cols:   # stores from before eviction
+                conn.execute("ALTER TABLE embeddings ADD COLUMN last_access REAL")
+                conn.execute("UPDATE embeddings SET last_access = created")
+            conn.execute("CREATE INDEX IF NOT EXISTS embeddings_last_access ON embeddings(last_access)")
+            conn.commit()
+            self._conn, self._pid = conn, os.getpid()
+            self._recount()
+        return self._conn
+
+    def _recount(self) -> None:
+        rows, dims = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(dim), 0) FROM embeddings").fetchone()
+        self._disk_rows, self._disk_bytes = rows, dims * 4
+
+    def _evict(self) -> None:
+        self._recount()
+        if self._disk_bytes <= self.disk_max_bytes:
+            return
+        # drop least recently used vectors down to ~90% of the budget
+        target = self._disk_bytes - int(self.disk_max_bytes * 0.9)
+        freed = 0
+        victims = []
+        for key, dim in self._conn.execute("SELECT key, dim FROM embeddings ORDER BY last_access"):
+            if freed >= target:
+                break
+            victims.append((key,))
+            freed += dim * 4
+        self._conn.executemany("DELETE FROM embeddings WHERE key = ?", victims)
+        self.counters["disk_evictions"] += len(victims)
+        self._disk_rows -= len(victims)
+        self._disk_bytes -= freed
+
+    def get_many(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        found = {}
+        with self._lock:
+            missing = []
+            for k in keys:
+                vec = self._mem.get(k)
+                if vec is not None:
+                    self._mem.move_to_end(k)
+                    found[k] = vec
+                    self.counters["mem_hits"] += 1
+                else:
+                    missing.append(k)
+            if missing and self.db_path:
+                conn = self._db()
+                hits = []
+                for i in range(0, len(missing), 500):
+                    chunk = missing[i:i + 500]
+                    q = "SELECT key, vec FROM embeddings WHERE key IN (%s)" % ",".join("?" * len(chunk))
+                    for k, blob in conn.execute(q, chunk):
+                        vec = np.frombuffer(blob, dtype=np.float32)
+                        found[k] = vec
+                        hits.append((time.time(), k))
+                        self._mem_put(k, vec)
+                        self.counters["disk_hits"] += 1
+                if hits:
+                    conn.executemany("UPDATE embeddings SET last_access = ? WHERE key = ?", hits)
+                    conn.commit()
+            self.counters["misses"] += len(keys) - len(found)
+        return found
+
+    def put_many(self, model_name: str, items: Dict[str, np.ndarray]) -> None:
+        if not items:
+            return
+        with self._lock:
+            for k, vec in items.items():
+                self._mem_put(k, vec)
+            if self.db_path:
+                conn = self._db()
+                now = time.time()
+                rows = [(k, model_name, int(v.shape[0]), np.ascontiguousarray(v, dtype=np.float32).tobytes(), now, now)
+                        for k, v in items.items()]
+                added = conn.executemany(
+                    "INSERT OR IGNORE INTO embeddings (key, model, dim, vec, created, last_access)"
+                    " VALUES (?, ?, ?, ?, ?, ?)", rows,
+                ).rowcount
+                self._disk_rows += added
+                self._disk_bytes += added * rows[0][2] * 4
+                if self._disk_bytes > self.disk_max_bytes:
+                    self._evict()
+                conn.commit()
+
+    def _mem_put(self, key: str, vec: np.ndarray) -> None:
+        self._mem[key] = vec
+        self._mem.move_to_end(key)
+        while len(self._mem) > self.mem_entries:
+            self._mem.popitem(last=False)
+            self.counters["mem_evictions"] += 1
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.counters["mem_hits"] + self.counters["disk_hits"] + self.counters["misses"]
+            hits = lookups - self.counters["misses"]
+            return {
+                **self.counters,
+                "mem_entries": len(self._mem),
+                "disk_rows": self._disk_rows,
+                "disk_bytes": self._disk_bytes,
+                "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+            }
+
+# ---------- Process-wide store ----------
+_store: Optional[EmbeddingStore] = None
+
+def get_embedding_store() -> EmbeddingStore:
+    global _store
+    if _store is None:
+        _store = EmbeddingStore()
+    return _store
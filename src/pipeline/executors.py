@@ -0,0 +1,160 @@
+# src/pipeline/executors.py
+import os, asyncio, logging, threading
+from contextlib import asynccontextmanager
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, wait as wait_futures
+from typing import Awaitable, Callable, Dict, Set
+
+log = logging.getLogger(__name__)
+
+# ---------- Config ----------
+CPU_WORKERS = int(os.getenv("CPU_WORKERS", os.cpu_count() or 2))
+# max requests per stage that may be running or waiting for a worker
+STAGE_MAX_PENDING = int(os.getenv("STAGE_MAX_PENDING", str(CPU_WORKERS * 4)))
+# batch callers (/rank, /search; wait=True) run in their own lane per stage, capped so
+# at least half the workers stay free for interactive requests however big the batch
+BATCH_MAX_RUNNING = int(os.getenv("STAGE_BATCH_MAX_RUNNING", str(max(1, CPU_WORKERS // 2))))
+STAGE_TIMEOUTS = {
+    "extract": float(os.getenv("EXTRACT_TIMEOUT_S", "30")),
+    "score": float(os.getenv("SCORE_TIMEOUT_S", "15")),
+    "inference": float(os.getenv("INFERENCE_TIMEOUT_S", "20")),
+}
+
+class StageBusy(Exception):
+    """A stage queue is full; the caller should back off (HTTP 503)."""
+
+class StageTimeout(Exception):
+    """A stage took longer than its configured timeout (HTTP 504)."""
+
+# ---------- Executors ----------
+_cpu_pool = None
+_inference_executor = None
+_lock = threading.Lock()
+# in-flight futures per pool, so a retired pool is only killed once its other work is done
+_inflight: Dict[int, Set[Future]] = {}
+_pool_counters = {"recycled_pools": 0}
+
+def get_cpu_pool() -> ProcessPoolExecutor:
+    """Process pool for CPU-bound work: PDF/DOCX extraction, preprocessing, compute_ats."""
+    global _cpu_pool
+    with _lock:
+        if _cpu_pool is None:
+            _cpu_pool = ProcessPoolExecutor(max_workers=CPU_WORKERS)
+        return _cpu_pool
+
+def get_inference_executor() -> ThreadPoolExecutor:
+    """Single dedicated thread that owns the transformer (torch parallelizes internally)."""
+    global _inference_executor
+    with _lock:
+        if _inference_executor is None:
+            _inference_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="inference")
+        return _inference_executor
+
+def shutdown_executors() -> None:
+    global _cpu_pool, _inference_executor
+    with _lock:
+        if _cpu_pool is not None:
+            _cpu_pool.shutdown(wait=False, cancel_futures=True)
+            _cpu_pool = None
+        if _inference_executor is not None:
+            _inference_executor.shutdown(wait=False, cancel_futures=True)
+            _inference_executor = None
+
+def _submit(pool: ProcessPoolExecutor, fn: Callable, *args) -> Future:
+    fut = pool.submit(fn, *args)
+    with _lock:
+        running = _inflight.setdefault(id(pool), set())
+        running.add(fut)
+    fut.add_done_callback(running.discard)
+    return fut
+
+def _retire_pool(pool: ProcessPoolExecutor, stuck: Future) -> None:
+    # let the pool's other tasks finish (they have their own timeouts), then kill
+    # every worker process, including the one still stuck on the timed-out task
+    with _lock:
+        others = [f for f in _inflight.pop(id(pool), set()) if f is not stuck]
+    wait_futures(others, timeout=max(STAGE_TIMEOUTS.values()))
+    for proc in list((getattr(pool, "_processes", None) or {}).values()):
+        if proc.is_alive():
+            proc.kill()
+    pool.shutdown(wait=False, cancel_futures=True)
+
+def recycle_cpu_pool(pool: ProcessPoolExecutor, stuck: Future) -> None:
+    """
+    A timed-out task keeps its worker busy (a running future cannot be
+    cancelled): new work goes to a fresh pool and the old one is torn down.
+    """
+    global _cpu_pool
+    with _lock:
+        if _cpu_pool is not pool:
+            return
+        _cpu_pool = None
+        _pool_counters["recycled_pools"] += 1
+    log.warning("CPU pool task timed out; recycling the pool")
+    threading.Thread(target=_retire_pool, args=(pool, stuck), name="cpu-pool-reaper", daemon=True).start()
+
+# ---------- Bounded stages ----------
+_semaphores: Dict[str, asyncio.Semaphore] = {}
+_pending: Dict[str, int] = {}
+# stage_metrics() may be called off the event loop (e.g. from a worker thread)
+_pending_lock = threading.Lock()
+
+def _semaphore(lane: str) -> asyncio.Semaphore:
+    with _pending_lock:
+        if lane not in _semaphores:
+            _semaphores[lane] = asyncio.Semaphore(BATCH_MAX_RUNNING if lane.endswith(":batch") else STAGE_MAX_PENDING)
+            _pending[lane] = 0
+        return _semaphores[lane]
+
+def _add_pending(lane: str, n: int) -> None:
+    with _pending_lock:
+        _pending[lane] += n
+
+async def with_timeout(stage: str, aw: Awaitable):
+    try:
+        return await asyncio.wait_for(aw, STAGE_TIMEOUTS.get(stage))
+    except asyncio.TimeoutError:
+        raise StageTimeout(f"{stage} stage timed out after {STAGE_TIMEOUTS.get(stage)}s")
+
+@asynccontextmanager
+async def admit(stage: str, wait: bool = False):
+    """
+    Admission control for a stage. Interactive requests (wait=False) are
+    rejected when the stage is full; batch callers pass wait=True to queue
+    for a slot in the stage's separate, smaller batch lane instead, so a big
+    upload never takes the slots interactive requests need.
+    """
+    lane = f"{stage}:batch" if wait else stage
+    sem = _semaphore(lane)
+    if not wait and sem.locked():
+        raise StageBusy(f"{stage} stage is at capacity ({STAGE_MAX_PENDING} pending)")
+    async with sem:
+        _add_pending(lane, 1)
+        try:
+            yield
+        finally:
+            _add_pending(lane, -1)
+
+async def run_stage(stage: str, fn: Callable, *args, wait: bool = False):
+    """Run fn(*args) in the CPU process pool under the stage's admission limit and timeout."""
+    async with admit(stage, wait):
+        pool = get_cpu_pool()
+        fut = _submit(pool, fn, *args)
+        try:
+            return await with_timeout(stage, asyncio.wrap_future(fut))
+        except StageTimeout:
+            recycle_cpu_pool(pool, fut)
+            raise
+
+def stage_metrics() -> Dict:
+    with _lock:
+        pool_counters = dict(_pool_counters)
+    with _pending_lock:
+        pending = dict(_pending)
+    return {
+        "cpu_workers": CPU_WORKERS,
+        "max_pending": STAGE_MAX_PENDING,
+        "batch_max_running": BATCH_MAX_RUNNING,
+        **pool_counters,
+        "timeouts_s": STAGE_TIMEOUTS,
+        "pending": pending,
+    }
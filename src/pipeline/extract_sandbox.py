@@ -0,0 +1,203 @@
+# src/pipeline/extract_sandbox.py
+import os, time, queue, asyncio, threading
+import multiprocessing as mp
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional
+
+from src.pipeline.extraction import ExtractionError, ExtractionLimitExceeded, MAX_UPLOAD_BYTES, upload_too_large
+from src.pipeline.resume_cache import build_resume_entry
+from src.pipeline.executors import STAGE_TIMEOUTS
+
+# ---------- Config ----------
+EXTRACT_WORKERS = int(os.getenv("EXTRACT_WORKERS", os.cpu_count() or 2))
+EXTRACT_TIMEOUT_S = STAGE_TIMEOUTS["extract"]
+EXTRACT_MAX_RSS_MB = int(os.getenv("EXTRACT_MAX_RSS_MB", "512"))
+EXTRACT_MAX_PAGES = int(os.getenv("EXTRACT_MAX_PAGES", "50"))
+EXTRACT_MAX_TASKS = int(os.getenv("EXTRACT_MAX_TASKS_PER_WORKER", "200"))
+
+POLL_S = 0.05
+BOOT_TIMEOUT_S = 60.0
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+def _rss_bytes(pid: int) -> Optional[int]:
+    """Resident set size from /proc (Linux); None where unavailable."""
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        return None
+
+# ---------- Worker process ----------
+def _worker_main(conn, max_pages: int) -> None:
+    conn.send(("ready", None))
+    while True:
+        try:
+            msg = conn.recv()
+        except (EOFError, OSError):
+            break
+        if msg is None:
+            break
+        data, filename, pdf_backend = msg
+        try:
+            conn.send(("ok", build_resume_entry(data, filename, max_pages=max_pages, pdf_backend=pdf_backend)))
+        except ExtractionLimitExceeded as e:
+            conn.send(("limit", str(e)))
+        except MemoryError:
+            conn.send(("error", "ran out of memory while parsing"))
+        except Exception as e:
+            conn.send(("error", f"{type(e).__name__}: {e}"))
+
+# ---------- Sandbox ----------
+class ExtractionSandbox:
+    """
+    Recyclable extraction workers with per-file limits.
+    Each file is parsed in a separate process; the parent enforces a
+    wall-clock timeout and an RSS ceiling, kills offending workers and spawns
+    fresh ones, so a pathological PDF only ever costs its own request.
+    Workers are also retired after max_tasks files to cap slow leaks.
+    """
+
+    def __init__(self, workers: int = EXTRACT_WORKERS, timeout_s: float = EXTRACT_TIMEOUT_S,
+                 max_rss_mb: int = EXTRACT_MAX_RSS_MB, max_pages: int = EXTRACT_MAX_PAGES,
+                 max_tasks: int = EXTRACT_MAX_TASKS, max_upload_bytes: int = MAX_UPLOAD_BYTES):
+        self.workers = max(1, workers)
+        self.timeout_s = timeout_s
+        self.max_rss = max_rss_mb * 1024 * 1024 if max_rss_mb else None
+        self.max_pages = max_pages
+        self.max_tasks = max_tasks
+        self.max_upload = max_upload_bytes
+        # forkserver: workers never inherit the API process (model, sockets, threads)
+        self._ctx = mp.get_context("forkserver" if "forkserver" in mp.get_all_start_methods() else "spawn")
+        self._idle: "queue.Queue[Dict]" = queue.Queue()
+        self._live = 0
+        self._lock = threading.Lock()
+        self._dispatch = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="extract-dispatch")
+        self.counters = {"spawned": 0, "recycled": 0, "killed_timeout": 0, "killed_memory": 0, "crashed": 0}
+
+    def _count(self, name: str) -> None:
+        # dispatch threads update counters concurrently
+        with self._lock:
+            self.counters[name] += 1
+
+    # ----- worker lifecycle -----
+    def _spawn(self) -> Dict:
+        parent, child = self._ctx.Pipe()
+        proc = self._ctx.Process(target=_worker_main, args=(child, self.max_pages), daemon=True)
+        proc.start()
+        child.close()
+        self._count("spawned")
+        # wait for imports to finish so boot time never counts against a file's timeout
+        try:
+            ready = parent.poll(BOOT_TIMEOUT_S) and parent.recv()[0] == "ready"
+        except (EOFError, OSError):
+            ready = False
+        if not ready:
+            proc.kill()
+            parent.close()
+            raise ExtractionError("extraction worker failed to start")
+        return {"proc": proc, "conn": parent, "tasks": 0}
+
+    def _acquire(self) -> Dict:
+        # re-check periodically: a killed worker frees a slot without touching the idle queue
+        while True:
+            try:
+                return self._idle.get_nowait()
+            except queue.Empty:
+                pass
+            with self._lock:
+                spawn = self._live < self.workers
+                if spawn:
+                    self._live += 1
+            if spawn:
+                try:
+                    return self._spawn()
+                except Exception:
+                    with self._lock:
+                        self._live -= 1
+                    raise
+            try:
+                return self._idle.get(timeout=POLL_S)
+            except queue.Empty:
+                continue
+
+    def _retire(self, w: Dict, kill: bool) -> None:
+        try:
+            if kill:
+                w["proc"].kill()
+            else:
+                w["conn"].send(None)
+            w["proc"].join(timeout=1)
+        except (OSError, ValueError):
+            pass
+        finally:
+            w["conn"].close()
+            with self._lock:
+                self._live -= 1
+
+    def _release(self, w: Dict) -> None:
+        w["tasks"] += 1
+        if self.max_tasks and w["tasks"] >= self.max_tasks:
+            self._count("recycled")
+            self._retire(w, kill=False)
+        else:
+            self._idle.put(w)
+
+    # ----- blocking call (runs on a dispatch thread) -----
+    def run(self, data: bytes, filename: str, pdf_backend: str = None) -> Dict:
+        if self.max_upload and len(data) > self.max_upload:
+            raise upload_too_large(filename, self.max_upload)
+        w = self._acquire()
+        try:
+            w["conn"].send((data, filename, pdf_backend))
+            deadline = time.monotonic() + self.timeout_s
+            while not w["conn"].poll(POLL_S):
+                if time.monotonic() > deadline:
+                    self._count("killed_timeout")
+                    self._retire(w, kill=True)
+                    raise ExtractionError(f"{filename} could not be parsed within {self.timeout_s:.0f}s")
+                rss = _rss_bytes(w["proc"].pid) if self.max_rss else None
+                if rss is not None and rss > self.max_rss:
+                    self._count("killed_memory")
+                    self._retire(w, kill=True)
+                    raise ExtractionError(f"{filename} exceeded the {self.max_rss // (1024 * 1024)} MB parser memory limit")
+            status, payload = w["conn"].recv()
+        except (EOFError, OSError):
+            self._count("crashed")
+            self._retire(w, kill=True)
+            raise ExtractionError(f"parser crashed on {filename}")
+        self._release(w)
+        if status == "ok":
+            return payload
+        if status == "limit":
+            raise ExtractionLimitExceeded(payload)
+        raise ExtractionError(f"could not parse {filename}: {payload}")
+
+    # ----- async API -----
+    async def extract(self, data: bytes, filename: str, pdf_backend: str = None) -> Dict:
+        """{"text", "base"} for one upload, parsed in a sandboxed worker."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._dispatch, self.run, data, filename, pdf_backend)
+
+    def metrics(self) -> Dict:
+        with self._lock:
+            return {**self.counters, "live_workers": self._live, "idle_workers": self._idle.qsize()}
+
+    def shutdown(self) -> None:
+        while not self._idle.empty():
+            self._retire(self._idle.get(), kill=False)
+        self._dispatch.shutdown(wait=False, cancel_futures=True)
+
+# ---------- Process-wide sandbox ----------
+_sandbox: Optional[ExtractionSandbox] = None
+
+def get_extraction_sandbox() -> ExtractionSandbox:
+    global _sandbox
+    if _sandbox is None:
+        _sandbox = ExtractionSandbox()
+    return _sandbox
+
+def shutdown_extraction_sandbox() -> None:
+    global _sandbox
+    if _sandbox is not None:
+        _sandbox.shutdown()
+        _sandbox = None
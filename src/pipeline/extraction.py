@@ -0,0 +1,203 @@
+# src/pipeline/extraction.py
+import io, os, zipfile, importlib.util
+from typing import BinaryIO, Callable, Dict, Iterator, List, Tuple, Union
+from PyPDF2 import PdfReader
+import docx2txt
+
+SUPPORTED_TYPES = {"pdf", "docx", "txt"}
+# "pypdf2" | "pdfminer" | "pymupdf"; can be overridden per request
+PDF_BACKEND = os.getenv("RESUME_PDF_BACKEND", "pypdf2").lower()
+MAX_UPLOAD_BYTES = int(float(os.getenv("MAX_UPLOAD_MB", "10")) * 1024 * 1024)
+# uncompressed bytes a single .zip upload may expand to, across all its members
+MAX_ARCHIVE_UNPACKED_BYTES = int(float(os.getenv("MAX_ARCHIVE_UNPACKED_MB", "500")) * 1024 * 1024)
+READ_CHUNK = 1 << 16
+# stop extracting once this many pages / characters were read (0 = no limit, the default);
+# a budget drops whatever is past it from scoring, so it is opt-in
+PAGE_BUDGET = int(os.getenv("EXTRACT_PAGE_BUDGET", "0"))
+CHAR_BUDGET = int(os.getenv("EXTRACT_CHAR_BUDGET", "0"))
+
+class ExtractionError(Exception):
+    """The upload could not be turned into text (HTTP 422)."""
+    status_code = 422
+
+class ExtractionLimitExceeded(ExtractionError):
+    """The upload is over a configured size/page limit (HTTP 413)."""
+    status_code = 413
+
+class UnknownPdfBackend(ExtractionError):
+    """The requested PDF backend does not exist or is not installed (HTTP 400)."""
+    status_code = 400
+
+def file_type_of(filename: str) -> str:
+    return (filename or "").split(".")[-1].lower()
+
+def upload_too_large(filename: str, max_bytes: int = MAX_UPLOAD_BYTES) -> ExtractionLimitExceeded:
+    return ExtractionLimitExceeded(f"{filename} is larger than the {max_bytes / 1e6:.1f} MB upload limit")
+
+def read_limited(stream: BinaryIO, filename: str, max_bytes: int = MAX_UPLOAD_BYTES,
+                 declared_size: int = None) -> bytes:
+    """
+    Read an upload stream in chunks, rejecting it up front when its declared
+    size is over max_bytes, or as soon as the stream itself passes max_bytes.
+    """
+    if declared_size is not None and max_bytes and declared_size > max_bytes:
+        raise upload_too_large(filename, max_bytes)
+    buf = bytearray()
+    while True:
+        chunk = stream.read(READ_CHUNK)
+        if not chunk:
+            break
+        buf += chunk
+        if max_bytes and len(buf) > max_bytes:
+            raise upload_too_large(filename, max_bytes)
+    return bytes(buf)
+
+# ---------- PDF backends ----------
+# Each backend is a generator over the PDF's pages: a page is only parsed when
+# the consumer asks for it, so stopping early skips the rest of the document.
+def _check_pages(n: int, max_pages: int = None) -> None:
+    if max_pages and n > max_pages:
+        raise ExtractionLimitExceeded(f"PDF has {n} pages (limit {max_pages})")
+
+def _pdf_pypdf2(data, max_pages: int = None) -> Iterator[str]:
+    pages = PdfReader(io.BytesIO(data)).pages
+    _check_pages(len(pages), max_pages)
+    for pg in pages:
+        yield pg.extract_text() or ""
+
+def _pdf_pdfminer(data, max_pages: int = None) -> Iterator[str]:
+    # low-level pdfminer API: one interpreter, one text device re-used across pages
+    from pdfminer3.converter import TextConverter
+    from pdfminer3.layout import LAParams
+    from pdfminer3.pdfdocument import PDFDocument
+    from pdfminer3.pdfinterp import PDFPageInterpreter, PDFResourceManager
+    from pdfminer3.pdfpage import PDFPage
+    from pdfminer3.pdfparser import PDFParser
+    from pdfminer3.pdftypes import resolve1
+
+    doc = PDFDocument(PDFParser(io.BytesIO(data)))
+    _check_pages(int(resolve1(doc.catalog["Pages"]).get("Count", 0)), max_pages)
+    manager = PDFResourceManager()
+    out = io.StringIO()
+    device = TextConverter(manager, out, laparams=LAParams())
+    interpreter = PDFPageInterpreter(manager, device)
+    try:
+        for page in PDFPage.create_pages(doc):
+            interpreter.process_page(page)
+            yield out.getvalue()
+            out.seek(0)
+            out.truncate(0)
+    finally:
+        device.close()
+
+def _pdf_pymupdf(data, max_pages: int = None) -> Iterator[str]:
+    import fitz  # PyMuPDF
+    with fitz.open(stream=bytes(data), filetype="pdf") as doc:
+        _check_pages(doc.page_count, max_pages)
+        for page in doc:
+            yield page.get_text()
+
+PDF_BACKENDS: Dict[str, Tuple[str, Callable]] = {
+    "pypdf2": ("PyPDF2", _pdf_pypdf2),
+    "pdfminer": ("pdfminer3", _pdf_pdfminer),
+    "pymupdf": ("fitz", _pdf_pymupdf),
+}
+
+def available_pdf_backends() -> List[str]:
+    return [name for name, (module, _) in PDF_BACKENDS.items() if importlib.util.find_spec(module) is not None]
+
+def resolve_pdf_backend(name: str = None) -> str:
+    """Validate a backend name (None → RESUME_PDF_BACKEND) before any work is queued."""
+    name = (name or PDF_BACKEND).lower()
+    if name not in PDF_BACKENDS:
+        raise UnknownPdfBackend(f"Unknown PDF backend '{name}' (choose from {', '.join(PDF_BACKENDS)})")
+    if importlib.util.find_spec(PDF_BACKENDS[name][0]) is None:
+        raise UnknownPdfBackend(f"PDF backend '{name}' is not installed")
+    return name
+
+def iter_pdf_pages(data, max_pages: int = None, backend: str = None) -> Iterator[str]:
+    return PDF_BACKENDS[resolve_pdf_backend(backend)][1](data, max_pages)
+
+def extract_pdf_pages(data, max_pages: int = None, backend: str = None) -> List[str]:
+    """Every page, no budget (benchmarks)."""
+    return list(iter_pdf_pages(data, max_pages, backend))
+
+# ---------- Budgeted page stream ----------
+def iter_text_pages(data: Union[bytes, memoryview], filename: str, max_pages: int = None, pdf_backend: str = None,
+                    page_budget: int = PAGE_BUDGET, char_budget: int = CHAR_BUDGET) -> Iterator[str]:
+    """
+    Yield an upload's text one page at a time (DOCX/TXT are a single page),
+    stopping once page_budget pages or char_budget characters were produced (0 = no limit).
+    The budget bounds both parse time and memory, whatever the document's length.
+    """
+    file_type = file_type_of(filename)
+    if file_type == "pdf":
+        pages = iter_pdf_pages(data, max_pages, pdf_backend)
+    elif file_type == "docx":
+        pages = iter([docx2txt.process(io.BytesIO(data)) or ""])
+    elif file_type == "txt":
+        # utf-8 is at most 4 bytes per char, so never decode more than the budget can use
+        raw = data[:char_budget * 4] if char_budget else data
+        pages = iter([bytes(raw).decode("utf-8", errors="ignore")])
+    else:
+        raise ValueError(f"Unsupported file type: .{file_type}")
+
+    chars = 0
+    try:
+        for n, page in enumerate(pages, 1):
+            if char_budget and chars + len(page) >= char_budget:
+                yield page[:char_budget - chars]
+                return
+            chars += len(page)
+            yield page
+            if page_budget and n >= page_budget:
+                return
+    finally:
+        if hasattr(pages, "close"):
+            pages.close()
+
+def extract_text_from_bytes(data: Union[bytes, memoryview], filename: str, max_pages: int = None,
+                            pdf_backend: str = None) -> str:
+    """Extract (budgeted) text from an in-memory PDF / DOCX / TXT upload (no temp files)."""
+    sep = "\n" if file_type_of(filename) == "pdf" else ""
+    return "".join([page + sep for page in iter_text_pages(data, filename, max_pages, pdf_backend)])
+
+def iter_archive(data: bytes, max_member_bytes: int = MAX_UPLOAD_BYTES,
+                 max_total_bytes: int = MAX_ARCHIVE_UNPACKED_BYTES) -> Iterator[Tuple[str, bytes]]:
+    """
+    Yield (member name, bytes) for every supported resume inside a zip. Each
+    member is held to the single-upload limit and the archive as a whole to
+    max_total_bytes uncompressed. Sizes in the zip headers are checked first,
+    but reads are bounded too, since headers can lie.
+    """
+    try:
+        zf = zipfile.ZipFile(io.BytesIO(data))
+    except zipfile.BadZipFile as e:
+        raise ExtractionError(f"Not a valid zip archive: {e}")
+    total = 0
+    with zf:
+        for info in zf.infolist():
+            if info.is_dir() or info.filename.startswith("__MACOSX/"):
+                continue
+            if file_type_of(info.filename) not in SUPPORTED_TYPES:
+                continue
+            if max_member_bytes and info.file_size > max_member_bytes:
+                raise upload_too_large(info.filename, max_member_bytes)
+            cap = max_member_bytes or info.file_size
+            if max_total_bytes:
+                cap = min(cap, max_total_bytes - total)
+                if info.file_size > cap:
+                    raise ExtractionLimitExceeded(
+                        f"Archive expands past the {max_total_bytes / 1e6:.1f} MB uncompressed limit")
+            try:
+                with zf.open(info) as member:
+                    body = member.read(cap + 1)
+            except (zipfile.BadZipFile, NotImplementedError, RuntimeError) as e:
+                raise ExtractionError(f"Could not unpack {info.filename}: {e}")
+            if len(body) > cap:
+                if max_member_bytes and len(body) > max_member_bytes:
+                    raise upload_too_large(info.filename, max_member_bytes)
+                raise ExtractionLimitExceeded(
+                    f"Archive expands past the {max_total_bytes / 1e6:.1f} MB uncompressed limit")
+            total += len(body)
+            yield info.filename, body
@@ -0,0 +1,161 @@
+# src/pipeline/jd_catalogue.py
+import os, logging, threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from src.pipeline.jd_index import index_from_profiles
+from src.pipeline.jd_profile import load_jd_profile
+from src.pipeline.executors import get_inference_executor
+
+log = logging.getLogger(__name__)
+
+# ---------- Config ----------
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+JD_FOLDER = Path(os.getenv("JD_FOLDER", str(BASE_DIR / "JD")))
+JD_CSV = os.getenv("JD_KEYWORDS_CSV", str(BASE_DIR / "job_keywords.csv"))
+POLL_S = float(os.getenv("JD_CATALOGUE_POLL_S", "2"))
+
+def _scan(folder) -> Dict[str, Tuple[int, int]]:
+    """{file name: (mtime_ns, size)} for every .txt JD in the folder."""
+    out = {}
+    with os.scandir(folder) as it:
+        for e in it:
+            if e.is_file() and e.name.lower().endswith(".txt"):
+                st = e.stat()
+                out[e.name] = (st.st_mtime_ns, st.st_size)
+    return out
+
+class JDCatalogue:
+    """
+    In-memory JD catalogue: compiled profiles plus the stacked embedding index.
+    refresh() recompiles only JDs that were added or changed since the last
+    scan and publishes a new immutable snapshot with a single reference swap,
+    so readers never see a half-built catalogue. A poller thread calls it every
+    poll_s seconds; uploads call add_jd(), which refreshes immediately.
+    """
+
+    def __init__(self, folder=JD_FOLDER, csv_path: Optional[str] = JD_CSV, poll_s: float = POLL_S):
+        self.folder = Path(folder)
+        self.csv_path = csv_path
+        self.poll_s = poll_s
+        self._snapshot = {**index_from_profiles({}), "version": 0}
+        self._stats: Dict[str, Tuple[int, int]] = {}
+        self._refresh_lock = threading.Lock()
+        self._keywords_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.counters = {"refreshes": 0, "compiled": 0, "removed": 0, "keyword_runs": 0}
+
+    # ----- reads (lock-free) -----
+    def snapshot(self) -> Dict:
+        """{"version", "names", "matrix", "profiles"}: consistent for as long as the caller holds it."""
+        return self._snapshot
+
+    def names(self) -> List[str]:
+        return sorted(self._snapshot["profiles"])
+
+    def get_profile(self, name: str) -> Optional[Dict]:
+        return self._snapshot["profiles"].get(name)
+
+    def ensure_loaded(self) -> None:
+        """Block until the first snapshot exists (start() builds it off the startup path)."""
+        if self._snapshot["version"] == 0:
+            self.refresh()
+
+    # ----- writes -----
+    def refresh(self) -> bool:
+        """Pick up added / changed / removed JDs. Returns True if a new snapshot was published."""
+        with self._refresh_lock:
+            if not self.folder.exists():
+                return False
+            current = _scan(self.folder)
+            if current == self._stats:
+                return False
+            old = self._snapshot["profiles"]
+            changed = [fn for fn, st in current.items() if self._stats.get(fn) != st or fn not in old]
+            profiles = {fn: old[fn] for fn in current if fn in old and fn not in changed}
+            # compile on the inference thread, which owns the embedding model
+            executor = get_inference_executor()
+            compiled = 0
+            for fn in changed:
+                try:
+                    profiles[fn] = executor.submit(load_jd_profile, self.folder / fn).result()
+                    compiled += 1
+                except (OSError, ValueError) as e:
+                    # left out of _stats, so the next scan retries it
+                    log.warning("could not compile JD %s: %s", fn, e)
+                    current.pop(fn, None)
+            removed = set(old) - set(current)
+
+            self._snapshot = {**index_from_profiles(profiles), "version": self._snapshot["version"] + 1}
+            self._stats = current
+            self.counters["refreshes"] += 1
+            self.counters["compiled"] += compiled
+            self.counters["removed"] += len(removed)
+        if (changed or removed) and self.csv_path:
+            # the new JD is already scoreable; the lexicon CSV catches up in the background
+            threading.Thread(target=self._update_keywords, name="jd-keywords", daemon=True).start()
+        return True
+
+    def _update_keywords(self) -> None:
+        # JD lexicon CSV: only changed JDs go through spaCy; API workers hot-reload the file
+        try:
+            from src.pipeline.jd_keywords import build_jd_keywords
+            with self._keywords_lock:
+                build_jd_keywords(self.folder, self.csv_path, n_process=1)
+            self.counters["keyword_runs"] += 1
+        except ImportError:
+            log.info("spaCy not installed; %s left unchanged", self.csv_path)
+        except Exception as e:
+            log.warning("JD keyword refresh failed: %s", e)
+
+    def add_jd(self, filename: str, data: bytes) -> Dict:
+        """Upload event: write the JD atomically, then compile it straight away."""
+        name = os.path.basename(filename)
+        if not name.lower().endswith(".txt"):
+            raise ValueError("JDs must be .txt files")
+        self.folder.mkdir(parents=True, exist_ok=True)
+        tmp = self.folder / f".{name}.{os.getpid()}.tmp"
+        tmp.write_bytes(data)
+        os.replace(tmp, self.folder / name)
+        self.refresh()
+        return self.get_profile(name)
+
+    # ----- watcher -----
+    def _watch(self) -> None:
+        while True:
+            try:
+                self.refresh()
+            except Exception as e:
+                log.warning("JD catalogue refresh failed: %s", e)
+            if self.poll_s <= 0 or self._stop.wait(self.poll_s):
+                return
+
+    def start(self) -> None:
+        """Initial compile and polling both run on the watcher thread, so startup never waits for the model."""
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._watch, name="jd-catalogue", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.poll_s + 1)
+            self._thread = None
+
+    def metrics(self) -> Dict:
+        snap = self._snapshot
+        return {**self.counters, "version": snap["version"], "jds": len(snap["profiles"]), "poll_s": self.poll_s}
+
+# ---------- Process-wide catalogue ----------
+_catalogue: Optional[JDCatalogue] = None
+_lock = threading.Lock()
+
+def get_jd_catalogue() -> JDCatalogue:
+    global _catalogue
+    if _catalogue is None:
+        with _lock:
+            if _catalogue is None:
+                _catalogue = JDCatalogue()
+    return _catalogue
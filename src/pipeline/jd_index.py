@@ -0,0 +1,31 @@
+# src/pipeline/jd_index.py
+# The process-wide index is owned by jd_catalogue.get_jd_catalogue(); this module
+# only stacks profiles into a matrix and queries it.
+from typing import Dict, List, Tuple
+import numpy as np
+
+# ---------- 1) Build ----------
+def index_from_profiles(profiles: Dict[str, Dict]) -> Dict:
+    """
+    Stack the normalized embeddings of every JD profile into one (N x d) matrix,
+    so scoring a resume against all JDs is a single matrix-vector product.
+    """
+    names, rows = [], []
+    for fn in sorted(profiles):
+        if profiles[fn]["embedding"] is not None:
+            names.append(fn)
+            rows.append(profiles[fn]["embedding"])
+    matrix = np.vstack(rows).astype(np.float32) if rows else np.zeros((0, 0), dtype=np.float32)
+    return {"names": names, "matrix": matrix, "profiles": dict(profiles)}
+
+# ---------- 2) Query ----------
+def search_jd_index(index: Dict, resume_embedding: np.ndarray, top_k: int = 5) -> List[Tuple[str, float]]:
+    """Top-k (jd file, similarity 0-100) by cosine similarity, best first."""
+    matrix = index["matrix"]
+    if not len(index["names"]) or resume_embedding is None:
+        return []
+    sims = matrix @ resume_embedding
+    k = min(top_k, len(sims))
+    top = np.argpartition(-sims, k - 1)[:k]
+    top = top[np.argsort(-sims[top])]
+    return [(index["names"][i], round(float(sims[i]) * 100, 2)) for i in top]
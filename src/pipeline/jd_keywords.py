@@ -0,0 +1,122 @@
+# src/pipeline/jd_keywords.py
+"""
+JD keyword extraction (produces job_keywords.csv, the JD lexicon read by jd_lexicon).
+
+Incremental: every row carries the SHA-256 of the JD it came from, so a rerun
+only sends new or edited JDs through spaCy and drops rows for deleted files.
+The CSV is replaced atomically; running API workers pick the new file up on
+their next request (get_jd_lexicon re-checks mtime/size).
+"""
+import os, re, csv, ast, hashlib, threading
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple
+
+from src.pipeline.warmup import load_timer
+
+# ---------- Config ----------
+SPACY_MODEL = os.getenv("JD_SPACY_MODEL", "en_core_web_sm")
+# POS tags are all we use: tok2vec + tagger + attribute_ruler stay, the rest is excluded
+SPACY_EXCLUDE = ["parser", "ner", "lemmatizer", "senter"]
+NLP_PROCESSES = int(os.getenv("JD_NLP_PROCESSES", os.cpu_count() or 1))
+NLP_BATCH_SIZE = int(os.getenv("JD_NLP_BATCH_SIZE", "32"))
+KEYWORD_POS = {"NOUN", "PROPN", "ADJ"}
+CSV_FIELDS = ["file_name", "sha256", "keywords"]
+
+# ---------- 1) spaCy ----------
+_nlp = None
+_nlp_lock = threading.Lock()
+
+def get_nlp():
+    global _nlp
+    if _nlp is None:
+        with _nlp_lock:
+            if _nlp is None:
+                import spacy
+                with load_timer("spacy"):
+                    _nlp = spacy.load(SPACY_MODEL, exclude=SPACY_EXCLUDE)
+    return _nlp
+
+def clean_jd_text(text: str) -> str:
+    text = text.lower()
+    return re.sub(r'[^a-z0-9\s\+\#\.\-]', ' ', text)  # keep words, +, #, ., -
+
+def keywords_from_doc(doc, min_freq: int = 1) -> List[str]:
+    """Nouns, proper nouns and adjectives (no stopwords), sorted."""
+    freq = Counter(
+        token.text for token in doc
+        if token.pos_ in KEYWORD_POS and len(token.text) > 1
+    )
+    vocab = doc.vocab
+    return sorted(word for word, count in freq.items() if count >= min_freq and not vocab[word].is_stop)
+
+def extract_keywords(text: str, min_freq: int = 1) -> List[str]:
+    """Keywords for a single JD (for ad-hoc use; batches should go through build_jd_keywords)."""
+    return keywords_from_doc(get_nlp()(clean_jd_text(text)), min_freq)
+
+# ---------- 2) Existing output ----------
+def _sha256(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+def read_keywords_csv(csv_path) -> Dict[str, Tuple[str, List[str]]]:
+    """file_name -> (sha256, keywords) from a previous run ('' sha for legacy rows)."""
+    rows = {}
+    try:
+        with open(csv_path, newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                try:
+                    rows[row["file_name"]] = (row.get("sha256") or "", list(ast.literal_eval(row["keywords"])))
+                except (KeyError, ValueError, SyntaxError):
+                    continue
+    except FileNotFoundError:
+        pass
+    return rows
+
+def write_keywords_csv(csv_path, rows: Iterable[Tuple[str, str, List[str]]]) -> None:
+    """Atomic write: readers only ever see the old or the new file."""
+    csv_path = Path(csv_path)
+    tmp = csv_path.with_name(f".{csv_path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(CSV_FIELDS)
+            for file_name, sha, keywords in rows:
+                writer.writerow([file_name, sha, str(list(keywords))])
+        os.replace(tmp, csv_path)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+
+# ---------- 3) Pipeline ----------
+def build_jd_keywords(jd_folder, csv_path, min_freq: int = 1, n_process: int = NLP_PROCESSES,
+                      batch_size: int = NLP_BATCH_SIZE) -> Dict[str, int]:
+    """
+    (Re)build the keywords CSV for every .txt JD in jd_folder.
+    Only JDs whose content hash changed are parsed, batched through nlp.pipe
+    across n_process worker processes. Returns run statistics.
+    """
+    previous = read_keywords_csv(csv_path)
+    current: Dict[str, Tuple[str, str]] = {}
+    for fn in sorted(os.listdir(jd_folder)):
+        if fn.endswith(".txt"):
+            with open(os.path.join(jd_folder, fn), "r", encoding="utf-8") as f:
+                text = f.read()
+            current[fn] = (_sha256(text), text)
+
+    todo = [fn for fn, (sha, _) in current.items() if previous.get(fn, ("",))[0] != sha]
+    fresh: Dict[str, List[str]] = {}
+    if todo:
+        nlp = get_nlp()
+        # extra processes only pay off once there is more than a batch or two of work
+        procs = max(1, min(n_process, len(todo) // batch_size))
+        texts = (clean_jd_text(current[fn][1]) for fn in todo)
+        for fn, doc in zip(todo, nlp.pipe(texts, batch_size=batch_size, n_process=procs)):
+            fresh[fn] = keywords_from_doc(doc, min_freq)
+
+    removed = set(previous) - set(current)
+    if todo or removed:
+        write_keywords_csv(csv_path, (
+            (fn, sha, fresh[fn] if fn in fresh else previous[fn][1])
+            for fn, (sha, _) in current.items()
+        ))
+    return {"total": len(current), "processed": len(todo), "reused": len(current) - len(todo), "removed": len(removed)}
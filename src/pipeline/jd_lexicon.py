@@ -0,0 +1,93 @@
+# src/pipeline/jd_lexicon.py
+import os, csv, ast, hashlib, pickle, threading
+from typing import Dict, FrozenSet, Optional, Set, Tuple
+from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
+
+# ---------- Config ----------
+# Optional compact binary snapshot of the parsed lexicon (e.g. "job_keywords.lexicon.pkl").
+# When set, workers load the snapshot instead of re-parsing the CSV.
+LEXICON_BIN = os.getenv("JD_LEXICON_BIN")
+
+# ---------- 1) CSV parsing ----------
+def load_jd_lexicon(csv_path: str) -> Set[str]:
+    vocab = set()
+    with open(csv_path, newline="", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        for row in reader:
+            try:
+                kw_list = ast.literal_eval(row["keywords"])
+            except Exception:
+                continue
+            for kw in kw_list:
+                w = kw.strip().lower()
+                if w and w.isalpha() and w not in ENGLISH_STOP_WORDS:
+                    vocab.add(w)
+    return vocab
+
+# ---------- 2) Binary snapshot ----------
+def _file_sha256(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+def _read_binary(bin_path: str, digest: str) -> Optional[FrozenSet[str]]:
+    try:
+        with open(bin_path, "rb") as f:
+            payload = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError):
+        return None
+    if not isinstance(payload, dict) or payload.get("sha256") != digest:
+        return None
+    return frozenset(payload["vocab"])
+
+def _write_binary(bin_path: str, digest: str, vocab: FrozenSet[str]) -> None:
+    tmp = f"{bin_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, "wb") as f:
+            pickle.dump({"sha256": digest, "vocab": tuple(sorted(vocab))}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, bin_path)
+    except OSError:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+# ---------- 3) Process-wide store ----------
+# abs csv path -> ((mtime_ns, size), sha256, vocab)
+_STORE: Dict[str, Tuple[Tuple[int, int], str, FrozenSet[str]]] = {}
+_LOCK = threading.Lock()
+
+def get_jd_lexicon(csv_path: str, bin_path: Optional[str] = None) -> FrozenSet[str]:
+    """
+    Cached JD vocabulary. Parsed once per process and re-parsed only when the CSV
+    changes (mtime/size first, content hash to confirm).
+    """
+    path = os.path.abspath(csv_path)
+    st = os.stat(path)
+    stat_key = (st.st_mtime_ns, st.st_size)
+
+    entry = _STORE.get(path)
+    if entry and entry[0] == stat_key:
+        return entry[2]
+
+    with _LOCK:
+        entry = _STORE.get(path)
+        if entry and entry[0] == stat_key:
+            return entry[2]
+
+        digest = _file_sha256(path)
+        bin_path = bin_path or LEXICON_BIN
+        if entry and entry[1] == digest:
+            vocab = entry[2]  # touched, not changed
+        else:
+            vocab = _read_binary(bin_path, digest) if bin_path else None
+            if vocab is None:
+                vocab = frozenset(load_jd_lexicon(path))
+                if bin_path:
+                    _write_binary(bin_path, digest, vocab)
+        _STORE[path] = (stat_key, digest, vocab)
+    return vocab
+
+def clear_jd_lexicon_cache() -> None:
+    with _LOCK:
+        _STORE.clear()
@@ -0,0 +1,197 @@
+# src/pipeline/jd_profile.py
+import os, re, json, hashlib, threading
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+import numpy as np
+
+from src.pipeline.ats_scoring import (
+    TECH_HINTS, SOFT_HINTS, GENERIC_NOISE, PHRASES, _jd_terms_set, _split_skills_for_jd,
+)
+from src.pipeline.matcher import MODEL_KEY, CHUNK_WORDS, CHUNK_OVERLAP, encode_chunks, encode_text
+from src.pipeline.skill_matcher import taxonomy_signature
+
+# ---------- Config ----------
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+PROFILE_DIR = Path(os.getenv("JD_PROFILE_DIR", str(BASE_DIR / ".jd_profiles")))
+PROFILE_VERSION = 4
+MULTI_WS = re.compile(r"\s+")
+
+_LEXICON_SIGNATURE: Optional[str] = None
+
+def lexicon_signature() -> str:
+    """
+    Changes whenever the hint sets or skills taxonomy used to compile a profile
+    change. Computed on first use: it needs the taxonomy, which loads lazily.
+    """
+    global _LEXICON_SIGNATURE
+    if _LEXICON_SIGNATURE is not None:
+        return _LEXICON_SIGNATURE
+    h = hashlib.sha256(taxonomy_signature().encode("utf-8"))
+    for group in (TECH_HINTS, SOFT_HINTS, GENERIC_NOISE, PHRASES):
+        h.update("\x1f".join(sorted(group)).encode("utf-8"))
+        h.update(b"\x1e")
+    _LEXICON_SIGNATURE = h.hexdigest()[:16]
+    return _LEXICON_SIGNATURE
+
+def clean_text(text: str) -> str:
+    """Lower-cased, whitespace-collapsed text, as /score has always embedded it."""
+    text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return MULTI_WS.sub(" ", text).lower().strip()
+
+# ---------- 1) Compile ----------
+def compile_jd_profile(jd_text: str, name: str = "", with_embedding: bool = True) -> Dict:
+    """
+    Turn a JD into everything the scorer needs from it:
+      terms, tech/soft partitions, phrase hits, the normalized embedding (raw
+      text, and clean_text for /score) and the per-chunk embeddings used by
+      the section-aware semantic score.
+    """
+    terms = _jd_terms_set(jd_text)
+    tech, soft = _split_skills_for_jd(terms)
+    embedding = clean_embedding = chunk_embeddings = None
+    if with_embedding and jd_text.strip():
+        embedding = encode_text(jd_text)
+        clean_embedding = encode_text(clean_text(jd_text))
+        chunk_embeddings = encode_chunks(jd_text)
+    return {
+        "name": name,
+        "sha256": hashlib.sha256(jd_text.encode("utf-8")).hexdigest(),
+        "terms": frozenset(terms),
+        "tech": frozenset(tech),
+        "soft": frozenset(soft),
+        "phrases": frozenset(t for t in terms if t in PHRASES or " " in t),
+        "embedding": embedding,
+        "clean_embedding": clean_embedding,
+        "chunk_embeddings": chunk_embeddings,
+    }
+
+# ---------- 2) Persist ----------
+def _artifact_paths(sha: str, profile_dir: Path) -> Tuple[Path, Path, Path, Path]:
+    return (profile_dir / f"{sha}.json", profile_dir / f"{sha}.npy", profile_dir / f"{sha}.clean.npy",
+            profile_dir / f"{sha}.chunks.npy")
+
+def _save_npy(path: Path, arr: np.ndarray) -> None:
+    tmp = path.with_name(f"{path.name[:-4]}.{os.getpid()}.tmp.npy")
+    np.save(tmp, arr)
+    os.replace(tmp, path)
+
+def save_jd_profile(profile: Dict, profile_dir: Path = PROFILE_DIR) -> None:
+    profile_dir.mkdir(parents=True, exist_ok=True)
+    meta_path, emb_path, clean_path, chunks_path = _artifact_paths(profile["sha256"], profile_dir)
+    meta = {
+        "version": PROFILE_VERSION,
+        "model": MODEL_KEY,
+        "chunking": [CHUNK_WORDS, CHUNK_OVERLAP],
+        "lexicon": lexicon_signature(),
+        "name": profile["name"],
+        "sha256": profile["sha256"],
+        "terms": sorted(profile["terms"]),
+        "tech": sorted(profile["tech"]),
+        "soft": sorted(profile["soft"]),
+        "phrases": sorted(profile["phrases"]),
+        "has_embedding": profile["embedding"] is not None,
+    }
+    # embeddings first, metadata last: a readable .json implies a complete artifact
+    if profile["embedding"] is not None:
+        _save_npy(emb_path, profile["embedding"])
+        _save_npy(clean_path, profile["clean_embedding"])
+        _save_npy(chunks_path, profile["chunk_embeddings"])
+    tmp = meta_path.with_name(f"{meta_path.stem}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(meta), encoding="utf-8")
+    os.replace(tmp, meta_path)
+
+def read_jd_profile(sha: str, profile_dir: Path = PROFILE_DIR) -> Optional[Dict]:
+    """Load a persisted artifact; None if missing or compiled with other settings."""
+    meta_path, emb_path, clean_path, chunks_path = _artifact_paths(sha, profile_dir)
+    try:
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        if (meta.get("version"), meta.get("model"), meta.get("lexicon"), meta.get("chunking")) != \
+                (PROFILE_VERSION, MODEL_KEY, lexicon_signature(), [CHUNK_WORDS, CHUNK_OVERLAP]):
+            return None
+        embedding = clean_embedding = chunk_embeddings = None
+        if meta.get("has_embedding"):
+            embedding, clean_embedding = np.load(emb_path), np.load(clean_path)
+            chunk_embeddings = np.load(chunks_path)
+    except (OSError, ValueError):
+        return None
+    return {
+        "name": meta["name"],
+        "sha256": meta["sha256"],
+        "terms": frozenset(meta["terms"]),
+        "tech": frozenset(meta["tech"]),
+        "soft": frozenset(meta["soft"]),
+        "phrases": frozenset(meta["phrases"]),
+        "embedding": embedding,
+        "clean_embedding": clean_embedding,
+        "chunk_embeddings": chunk_embeddings,
+    }
+
+# ---------- 3) Lookup ----------
+# abs jd path -> ((mtime_ns, size), profile)
+_PROFILES: Dict[str, Tuple[Tuple[int, int], Dict]] = {}
+_LOCK = threading.Lock()
+
+def load_jd_profile(jd_path, profile_dir: Path = PROFILE_DIR) -> Dict:
+    """
+    Profile for a JD file. Served from memory while the file is unchanged,
+    otherwise from its persisted artifact, compiling it only on first sight.
+    """
+    path = os.path.abspath(jd_path)
+    st = os.stat(path)
+    stat_key = (st.st_mtime_ns, st.st_size)
+
+    entry = _PROFILES.get(path)
+    if entry and entry[0] == stat_key:
+        return entry[1]
+
+    with _LOCK:
+        entry = _PROFILES.get(path)
+        if entry and entry[0] == stat_key:
+            return entry[1]
+
+        jd_text = Path(path).read_text(encoding="utf-8", errors="ignore")
+        profile = _profile_for_text(jd_text, os.path.basename(path), profile_dir)
+        _PROFILES[path] = (stat_key, profile)
+    return profile
+
+def _profile_for_text(jd_text: str, name: str, profile_dir: Path) -> Dict:
+    sha = hashlib.sha256(jd_text.encode("utf-8")).hexdigest()
+    profile = read_jd_profile(sha, profile_dir)
+    if profile is None:
+        profile = compile_jd_profile(jd_text, name=name)
+        save_jd_profile(profile, profile_dir)
+    elif profile["name"] != name:
+        profile = {**profile, "name": name}
+    return profile
+
+# sha -> profile of JD snapshots (texts stored with queued jobs)
+_SNAPSHOTS: Dict[str, Dict] = {}
+SNAPSHOT_ENTRIES = 32
+
+def jd_profile_for_text(jd_text: str, name: str = "", profile_dir: Path = PROFILE_DIR) -> Dict:
+    """Profile of a JD given by its text rather than a file, e.g. the snapshot a bulk job was submitted with."""
+    sha = hashlib.sha256(jd_text.encode("utf-8")).hexdigest()
+    profile = _SNAPSHOTS.get(sha)
+    if profile is None:
+        with _LOCK:
+            profile = _SNAPSHOTS.get(sha)
+            if profile is None:
+                profile = _profile_for_text(jd_text, name, profile_dir)
+                if len(_SNAPSHOTS) >= SNAPSHOT_ENTRIES:
+                    _SNAPSHOTS.clear()
+                _SNAPSHOTS[sha] = profile
+    return profile
+
+def compile_jd_folder(jd_folder, profile_dir: Path = PROFILE_DIR) -> Dict[str, Dict]:
+    """Precompile every .txt JD in a folder (e.g. at deploy time)."""
+    out = {}
+    for fn in sorted(os.listdir(jd_folder)):
+        if fn.lower().endswith(".txt"):
+            out[fn] = load_jd_profile(os.path.join(jd_folder, fn), profile_dir)
+    return out
+
+if __name__ == "__main__":
+    import sys
+    folder = sys.argv[1] if len(sys.argv) > 1 else str(BASE_DIR / "JD")
+    profiles = compile_jd_folder(folder)
+    print(f"✅ Compiled {len(profiles)} JD profiles into {PROFILE_DIR}")
@@ -0,0 +1,514 @@
+# src/pipeline/job_queue.py
+"""
+Durable bulk-scoring jobs on a local SQLite (WAL) queue, no external broker.
+
+POST /jobs stores one task per resume (bytes included) and returns at once;
+worker processes claim tasks under a lease, run extraction -> compute_ats ->
+semantic similarity and write each result back. A task whose worker dies is
+handed out again (immediately when the supervisor sees the crash, otherwise
+when its lease runs out) until it has been tried JOB_MAX_ATTEMPTS times. The
+JD text is stored with the job, so editing the JD file afterwards does not
+change how its queued resumes are scored.
+
+Workers run as their own service, and any number can join from other shells:
+
+    python -m src.pipeline.job_queue worker --workers 4
+
+With JOB_WORKERS > 0 the API also supervises that many workers itself; when
+the API runs several server processes, only the one holding the supervisor
+lock (next to the queue file) starts them.
+"""
+import os, json, time, uuid, socket, hashlib, logging, sqlite3, threading
+import multiprocessing as mp
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+log = logging.getLogger(__name__)
+
+# ---------- Config ----------
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+JOB_DB = os.getenv("JOB_QUEUE_DB", str(BASE_DIR / ".cache" / "jobs.sqlite"))
+# workers supervised by the API process (0 = run them with the worker CLI instead)
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "0"))
+CLI_WORKERS = 2
+# a running task is re-queued when its worker stops renewing the lease (crash / hang of the whole process)
+LEASE_S = float(os.getenv("JOB_LEASE_S", "300"))
+MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+# admission limit: queued (not yet claimed) tasks across all jobs
+MAX_QUEUED = int(os.getenv("JOB_MAX_QUEUED_TASKS", "20000"))
+# finished jobs (and their results) are dropped after this long
+RETENTION_S = float(os.getenv("JOB_RETENTION_S", str(7 * 86400)))
+POLL_S = float(os.getenv("JOB_POLL_S", "0.5"))
+
+class JobQueueFull(Exception):
+    pass
+
+def worker_id(pid: int = None) -> str:
+    return f"{socket.gethostname()}:{pid or os.getpid()}"
+
+# ---------- 1) Queue ----------
+class JobQueue:
+    """Jobs and their per-resume tasks in one SQLite file shared by the API and every worker."""
+
+    def __init__(self, db_path: str = JOB_DB, lease_s: float = LEASE_S, max_attempts: int = MAX_ATTEMPTS,
+                 max_queued: int = MAX_QUEUED, retention_s: float = RETENTION_S):
+        self.db_path = db_path
+        self.lease_s = lease_s
+        self.max_attempts = max_attempts
+        self.max_queued = max_queued
+        self.retention_s = retention_s
+        self._lock = threading.Lock()
+        self._conn = None
+        self._pid = None
+        self.counters = {"submitted_jobs": 0, "submitted_tasks": 0, "rejected_jobs": 0}
+
+    def _db(self) -> sqlite3.Connection:
+        # one connection per process (workers are separate processes)
+        if self._conn is None or self._pid != os.getpid():
+            Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                " id TEXT PRIMARY KEY, jd_file TEXT, jd_path TEXT, jd_csv TEXT, fresher INTEGER,"
+                " pdf_backend TEXT, total INTEGER, created REAL, finished REAL, jd_sha TEXT, jd_text TEXT)"
+            )
+            cols = {r[1] for r in conn.execute("PRAGMA table_info(jobs)")}
+            for col in ("jd_sha", "jd_text"):
+                if col not in cols:   # queue files from before JD snapshots
+                    conn.execute(f"ALTER TABLE jobs ADD COLUMN {col} TEXT")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS tasks ("
+                " id INTEGER PRIMARY KEY AUTOINCREMENT, job_id TEXT, filename TEXT, data BLOB,"
+                " status TEXT, attempts INTEGER DEFAULT 0, lease_until REAL, worker TEXT,"
+                " result TEXT, error TEXT, updated REAL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS tasks_status ON tasks(status, id)")
+            conn.execute("CREATE INDEX IF NOT EXISTS tasks_job ON tasks(job_id, status)")
+            self._conn, self._pid = conn, os.getpid()
+        return self._conn
+
+    def _write(self, fn, *args):
+        # BEGIN IMMEDIATE: one writer at a time across processes, readers never block
+        with self._lock:
+            conn = self._db()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                out = fn(conn, *args)
+                conn.execute("COMMIT")
+                return out
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+    # ----- API side -----
+    def submit(self, jd_file: str, jd_text: str, jd_csv: str, items: Sequence[Tuple[str, bytes]],
+               fresher: Optional[bool] = None, pdf_backend: Optional[str] = None) -> Dict:
+        """
+        Store a job (with the JD text it is scored against) and one queued task
+        per (filename, bytes); JobQueueFull when over MAX_QUEUED.
+        """
+        job_id = uuid.uuid4().hex
+        jd_sha = hashlib.sha256(jd_text.encode("utf-8")).hexdigest()
+
+        def tx(conn):
+            queued = conn.execute("SELECT COUNT(*) FROM tasks WHERE status = 'queued'").fetchone()[0]
+            if self.max_queued and queued + len(items) > self.max_queued:
+                raise JobQueueFull(f"job queue is full ({queued} resumes waiting, limit {self.max_queued})")
+            now = time.time()
+            self._purge(conn, now)
+            conn.execute(
+                "INSERT INTO jobs (id, jd_file, jd_sha, jd_text, jd_csv, fresher, pdf_backend, total, created)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (job_id, jd_file, jd_sha, jd_text, jd_csv, None if fresher is None else int(fresher), pdf_backend,
+                 len(items), now),
+            )
+            conn.executemany(
+                "INSERT INTO tasks (job_id, filename, data, status, updated) VALUES (?, ?, ?, 'queued', ?)",
+                [(job_id, name, data, now) for name, data in items],
+            )
+
+        try:
+            self._write(tx)
+        except JobQueueFull:
+            self.counters["rejected_jobs"] += 1
+            raise
+        self.counters["submitted_jobs"] += 1
+        self.counters["submitted_tasks"] += len(items)
+        return self.job(job_id)
+
+    def _purge(self, conn, now: float) -> None:
+        old = [r[0] for r in conn.execute("SELECT id FROM jobs WHERE finished < ?", (now - self.retention_s,))]
+        if old:
+            conn.executemany("DELETE FROM tasks WHERE job_id = ?", [(j,) for j in old])
+            conn.executemany("DELETE FROM jobs WHERE id = ?", [(j,) for j in old])
+
+    def job(self, job_id: str) -> Optional[Dict]:
+        """Status and progress of a job; None if unknown (or already purged)."""
+        with self._lock:
+            conn = self._db()
+            row = conn.execute("SELECT jd_file, jd_sha, total, created, finished FROM jobs WHERE id = ?",
+                               (job_id,)).fetchone()
+            if row is None:
+                return None
+            counts = dict(conn.execute("SELECT status, COUNT(*) FROM tasks WHERE job_id = ? GROUP BY status", (job_id,)))
+        jd_file, jd_sha, total, created, finished = row
+        progress = {s: counts.get(s, 0) for s in ("queued", "running", "done", "failed")}
+        completed = progress["done"] + progress["failed"]
+        if completed == total:
+            status = "done"
+        elif completed or progress["running"]:
+            status = "running"
+        else:
+            status = "queued"
+        return {
+            "job_id": job_id,
+            "jd_file": jd_file,
+            "jd_sha256": jd_sha,
+            "status": status,
+            "total": total,
+            **progress,
+            "percent": round(100.0 * completed / total, 1) if total else 100.0,
+            "elapsed_s": round((finished or time.time()) - created, 2),
+        }
+
+    def results(self, job_id: str) -> Tuple[List[Dict], List[Dict]]:
+        """(scored rows, failed {file, error} rows) of a job so far."""
+        with self._lock:
+            rows = self._db().execute(
+                "SELECT filename, status, result, error FROM tasks WHERE job_id = ? AND status IN ('done', 'failed') ORDER BY id",
+                (job_id,),
+            ).fetchall()
+        done = [json.loads(r[2]) for r in rows if r[1] == "done"]
+        failed = [{"file": r[0], "error": r[3]} for r in rows if r[1] == "failed"]
+        return done, failed
+
+    # ----- worker side -----
+    def claim(self, worker: str) -> Optional[Dict]:
+        """Lease the oldest runnable task (queued, or running past its lease) to worker."""
+        def tx(conn):
+            now = time.time()
+            # leases that ran out on their last allowed attempt fail instead of looping forever
+            conn.execute(
+                "UPDATE tasks SET status = 'failed', data = NULL, updated = ?,"
+                " error = 'worker stopped responding on every attempt'"
+                " WHERE status = 'running' AND lease_until < ? AND attempts >= ?",
+                (now, now, self.max_attempts),
+            )
+            self._finish_jobs(conn, now)
+            row = conn.execute(
+                "SELECT t.id, t.job_id, t.filename, t.data, t.attempts, j.jd_file, j.jd_text, j.jd_path, j.jd_csv,"
+                " j.fresher, j.pdf_backend"
+                " FROM tasks t JOIN jobs j ON j.id = t.job_id"
+                " WHERE t.status = 'queued' OR (t.status = 'running' AND t.lease_until < ?)"
+                " ORDER BY t.id LIMIT 1",
+                (now,),
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE tasks SET status = 'running', attempts = attempts + 1, lease_until = ?, worker = ?, updated = ?"
+                " WHERE id = ?",
+                (now + self.lease_s, worker, now, row[0]),
+            )
+            keys = ("id", "job_id", "filename", "data", "attempts", "jd_file", "jd_text", "jd_path", "jd_csv",
+                    "fresher", "pdf_backend")
+            task = dict(zip(keys, row))
+            task["attempts"] += 1
+            task["fresher"] = None if task["fresher"] is None else bool(task["fresher"])
+            return task
+        return self._write(tx)
+
+    # complete / fail / heartbeat only touch a task the caller still holds: once a
+    # lease ran out and another worker claimed it, the first worker's late writes
+    # are dropped (they return False) instead of clobbering the new owner's state
+    def complete(self, task_id: int, worker: str, result: Dict) -> bool:
+        def tx(conn):
+            now = time.time()
+            n = conn.execute(
+                "UPDATE tasks SET status = 'done', result = ?, data = NULL, error = NULL, updated = ?"
+                " WHERE id = ? AND worker = ? AND status = 'running'",
+                (json.dumps(result), now, task_id, worker),
+            ).rowcount
+            if n:
+                self._finish_jobs(conn, now)
+            return bool(n)
+        return self._write(tx)
+
+    def fail(self, task_id: int, worker: str, error: str, retry: bool = True) -> bool:
+        """Record an error; retryable errors re-queue the task until it has used MAX_ATTEMPTS."""
+        def tx(conn):
+            now = time.time()
+            row = conn.execute("SELECT attempts FROM tasks WHERE id = ? AND worker = ? AND status = 'running'",
+                               (task_id, worker)).fetchone()
+            if row is None:
+                return False
+            if retry and row[0] < self.max_attempts:
+                conn.execute("UPDATE tasks SET status = 'queued', error = ?, lease_until = NULL, updated = ? WHERE id = ?",
+                             (error, now, task_id))
+                self._reopen_jobs(conn)
+            else:
+                conn.execute("UPDATE tasks SET status = 'failed', error = ?, data = NULL, updated = ? WHERE id = ?",
+                             (error, now, task_id))
+                self._finish_jobs(conn, now)
+            return True
+        return self._write(tx)
+
+    def heartbeat(self, task_id: int, worker: str) -> bool:
+        """Extend the lease of a task still being processed; False once the task is no longer ours."""
+        def tx(conn):
+            now = time.time()
+            return bool(conn.execute(
+                "UPDATE tasks SET lease_until = ?, updated = ? WHERE id = ? AND worker = ? AND status = 'running'",
+                (now + self.lease_s, now, task_id, worker),
+            ).rowcount)
+        return self._write(tx)
+
+    def release_worker(self, worker: str) -> int:
+        """Hand the tasks of a worker that died back to the queue (or fail them on their last attempt)."""
+        def tx(conn):
+            now = time.time()
+            conn.execute(
+                "UPDATE tasks SET status = 'failed', data = NULL, updated = ?, error = 'worker crashed on every attempt'"
+                " WHERE status = 'running' AND worker = ? AND attempts >= ?",
+                (now, worker, self.max_attempts),
+            )
+            n = conn.execute(
+                "UPDATE tasks SET status = 'queued', lease_until = NULL, error = 'worker crashed', updated = ?"
+                " WHERE status = 'running' AND worker = ?",
+                (now, worker),
+            ).rowcount
+            self._reopen_jobs(conn)
+            self._finish_jobs(conn, now)
+            return n
+        return self._write(tx)
+
+    def _reopen_jobs(self, conn) -> None:
+        # a job with re-queued work is not finished (and must not be purged)
+        conn.execute(
+            "UPDATE jobs SET finished = NULL WHERE finished IS NOT NULL AND EXISTS"
+            " (SELECT 1 FROM tasks WHERE tasks.job_id = jobs.id AND status IN ('queued', 'running'))"
+        )
+
+    def _finish_jobs(self, conn, now: float) -> None:
+        conn.execute(
+            "UPDATE jobs SET finished = ? WHERE finished IS NULL AND NOT EXISTS"
+            " (SELECT 1 FROM tasks WHERE tasks.job_id = jobs.id AND status IN ('queued', 'running'))",
+            (now,),
+        )
+
+    def metrics(self) -> Dict:
+        with self._lock:
+            conn = self._db()
+            counts = dict(conn.execute("SELECT status, COUNT(*) FROM tasks GROUP BY status"))
+            active = conn.execute("SELECT COUNT(*) FROM jobs WHERE finished IS NULL").fetchone()[0]
+        return {**self.counters, "active_jobs": active, "tasks": counts, "max_queued": self.max_queued}
+
+# ---------- 2) Worker process ----------
+def process_task(task: Dict, sandbox) -> Dict:
+    """extraction (resume cache, else sandboxed parser) -> compute_ats -> semantic similarity for one resume."""
+    from src.pipeline.resume_cache import resume_key, get_resume_cache
+    from src.pipeline.jd_profile import jd_profile_for_text, load_jd_profile
+    from src.pipeline.matcher import EMBEDDING_MODE, section_similarity, similarity_to_embedding
+    from src.pipeline.ranking import leaderboard_entry, public_entry
+    from src.pipeline.preprocess_resume_text import preprocess_resume_text
+    from src.pipeline.ats_scoring import compute_ats
+    from src.pipeline.candidate_index import AUTO_INDEX, get_candidate_index
+
+    data, filename = task["data"], task["filename"]
+    cache = get_resume_cache()
+    key = resume_key(data, filename, task["pdf_backend"])
+    entry = cache.get(key)
+    if entry is None:
+        entry = sandbox.run(data, filename, task["pdf_backend"])
+        cache.put(key, entry)
+    text, base = entry["text"], entry["base"]
+
+    if task["jd_text"] is not None:
+        jd_profile = jd_profile_for_text(task["jd_text"], task["jd_file"])
+    else:   # jobs queued before JD snapshots were stored
+        jd_profile = load_jd_profile(task["jd_path"])
+    prep = preprocess_resume_text(text, task["jd_csv"], base=base)
+    ats = compute_ats(text, None, task["jd_csv"], fresher=task["fresher"], jd_profile=jd_profile, prep=prep)
+    if AUTO_INDEX:
+        # bulk uploads are recruiter-side: searchable via /search like /rank uploads
+        get_candidate_index().add(key, filename, prep, text)
+    row = leaderboard_entry(filename, text, ats, base["sections"])
+    if EMBEDDING_MODE == "sections":
+        row["semantic_score"], row["semantic_sections"] = section_similarity(base["sections"], jd_profile["chunk_embeddings"])
+    else:
+        row["semantic_score"] = similarity_to_embedding(text, jd_profile["embedding"])
+    return public_entry(row)
+
+def _heartbeat(queue: JobQueue, task_id: int, worker: str, done: threading.Event) -> None:
+    # renew the lease well before it runs out, for as long as the task is processing
+    while not done.wait(queue.lease_s / 3):
+        if not queue.heartbeat(task_id, worker):
+            break
+
+def run_worker(db_path: str = JOB_DB, stop=None) -> None:
+    """Claim and process tasks until stop (a multiprocessing Event) is set."""
+    from src.pipeline.extraction import ExtractionError
+    from src.pipeline.extract_sandbox import ExtractionSandbox
+
+    queue = JobQueue(db_path)
+    sandbox = ExtractionSandbox(workers=1)
+    me = worker_id()
+    try:
+        while stop is None or not stop.is_set():
+            task = queue.claim(me)
+            if task is None:
+                time.sleep(POLL_S)
+                continue
+            done = threading.Event()
+            beat = threading.Thread(target=_heartbeat, args=(queue, task["id"], me, done), name="job-heartbeat",
+                                    daemon=True)
+            beat.start()
+            try:
+                kept = queue.complete(task["id"], me, process_task(task, sandbox))
+            except ExtractionError as e:
+                # the file itself is the problem: retrying gives the same answer
+                kept = queue.fail(task["id"], me, str(e), retry=False)
+            except Exception as e:
+                log.warning("task %s (%s) failed on attempt %d: %s", task["id"], task["filename"], task["attempts"], e)
+                kept = queue.fail(task["id"], me, f"{type(e).__name__}: {e}")
+            finally:
+                done.set()
+                beat.join()
+            if not kept:
+                log.warning("task %s (%s) was re-leased to another worker; result dropped", task["id"], task["filename"])
+    except KeyboardInterrupt:
+        pass
+    finally:
+        sandbox.shutdown()
+
+# ---------- 3) Supervisor ----------
+class JobWorkers:
+    """
+    Keeps `workers` worker processes alive: a dead one has its leased tasks
+    re-queued straight away and is replaced. Workers are not daemonic, since
+    each runs its own extraction sandbox (child processes). With elect=True
+    (the API) only the process holding the supervisor lock starts workers.
+    """
+
+    def __init__(self, workers: int = JOB_WORKERS, db_path: str = JOB_DB, elect: bool = False):
+        self.workers = workers
+        self.db_path = db_path
+        self.elect = elect
+        self._lock_file = None
+        self.queue = JobQueue(db_path)
+        self._ctx = mp.get_context("spawn")
+        self._stop = self._ctx.Event()
+        self._procs: List = []
+        self._thread: Optional[threading.Thread] = None
+        self.counters = {"spawned": 0, "crashed": 0, "requeued": 0}
+
+    def _spawn(self):
+        proc = self._ctx.Process(target=run_worker, args=(self.db_path, self._stop), name="job-worker")
+        proc.start()
+        self.counters["spawned"] += 1
+        return proc
+
+    def _supervise(self) -> None:
+        while not self._stop.wait(POLL_S):
+            for i, proc in enumerate(self._procs):
+                if not proc.is_alive() and not self._stop.is_set():
+                    self.counters["crashed"] += 1
+                    n = self.queue.release_worker(worker_id(proc.pid))
+                    self.counters["requeued"] += n
+                    log.warning("job worker %s exited (code %s); %d task(s) re-queued", proc.pid, proc.exitcode, n)
+                    self._procs[i] = self._spawn()
+
+    def _acquire_supervisor_lock(self) -> bool:
+        try:
+            import fcntl
+        except ImportError:   # no flock (Windows): every API process supervises
+            return True
+        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        f = open(f"{self.db_path}.supervisor.lock", "a+")
+        try:
+            fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            f.close()
+            return False
+        self._lock_file = f
+        return True
+
+    def start(self) -> None:
+        if self.workers <= 0 or self._thread is not None:
+            return
+        if self.elect and not self._acquire_supervisor_lock():
+            log.info("job workers are supervised by another process on %s", self.db_path)
+            return
+        self._procs = [self._spawn() for _ in range(self.workers)]
+        self._thread = threading.Thread(target=self._supervise, name="job-supervisor", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+        deadline = time.monotonic() + timeout
+        for proc in self._procs:
+            proc.join(timeout=max(0.0, deadline - time.monotonic()))
+            if proc.is_alive():
+                proc.terminate()
+                proc.join(timeout=1)
+                # whatever it held goes back to the queue for the next start
+                self.queue.release_worker(worker_id(proc.pid))
+        self._procs, self._thread = [], None
+        if self._lock_file is not None:
+            self._lock_file.close()   # closing drops the flock
+            self._lock_file = None
+
+    def metrics(self) -> Dict:
+        return {**self.counters, "workers": self.workers, "alive": sum(p.is_alive() for p in self._procs),
+                "supervisor": bool(self._procs)}
+
+# ---------- Process-wide queue / workers ----------
+_queue: Optional[JobQueue] = None
+_workers: Optional[JobWorkers] = None
+_lock = threading.Lock()
+
+def get_job_queue() -> JobQueue:
+    global _queue
+    if _queue is None:
+        with _lock:
+            if _queue is None:
+                _queue = JobQueue()
+    return _queue
+
+def get_job_workers() -> JobWorkers:
+    global _workers
+    if _workers is None:
+        with _lock:
+            if _workers is None:
+                _workers = JobWorkers(elect=True)
+    return _workers
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Run bulk-scoring workers against the local job queue.")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    wk = sub.add_parser("worker")
+    wk.add_argument("--workers", type=int, default=JOB_WORKERS or CLI_WORKERS)
+    wk.add_argument("--db", default=JOB_DB)
+    st = sub.add_parser("status")
+    st.add_argument("job_id", nargs="?")
+    st.add_argument("--db", default=JOB_DB)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    if args.cmd == "worker":
+        pool = JobWorkers(max(1, args.workers), args.db)
+        pool.start()
+        print(f"✅ {pool.workers} job worker(s) running on {args.db} (Ctrl+C to stop)")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pool.stop()
+    else:
+        q = JobQueue(args.db)
+        print(json.dumps(q.job(args.job_id) if args.job_id else q.metrics(), indent=2))
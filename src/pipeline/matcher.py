@@ -1,8 +1,91 @@
 # src/pipeline/matcher.py
-from sentence_transformers import SentenceTransformer, util
+import os, threading
+from typing import Dict, List, Optional, Tuple
+import numpy as np
 
-# Load model once at startup (fast inference)
-_model = SentenceTransformer("all-MiniLM-L6-v2")
+from src.pipeline.embedding_backends import EMBEDDING_BACKEND, load_encoder, model_key
+from src.pipeline.embedding_store import get_embedding_store, normalize_for_embedding, text_key
+from src.pipeline.preprocess_resume_text import normalize_text, sectionize
+from src.pipeline.warmup import load_timer
+
+MODEL_NAME = "all-MiniLM-L6-v2"
+# what cached vectors / compiled JD profiles are keyed by: model + inference backend
+MODEL_KEY = model_key(MODEL_NAME, EMBEDDING_BACKEND)
+
+# ---------- Config ----------
+# "document": one vector per text (the model truncates at max_seq_length);
+# "sections" (opt-in, changes scores): score every resume section in model-sized chunks
+EMBEDDING_MODE = os.getenv("EMBEDDING_MODE", "document")
+# all-MiniLM-L6-v2 truncates at 256 word pieces; at ~1.3-1.5 pieces per English word
+# 160-word windows stay under it
+CHUNK_WORDS = int(os.getenv("EMBED_CHUNK_WORDS", "160"))
+CHUNK_OVERLAP = int(os.getenv("EMBED_CHUNK_OVERLAP", "24"))
+# how the chunk scores of one section combine: max | mean
+SECTION_AGG = os.getenv("EMBED_SECTION_AGG", "max")
+
+# ---------- Model ----------
+# Loaded on first use (or by the warm-up hook), not at import: endpoints that
+# never embed don't pay for torch / the model. EMBEDDING_BACKEND picks torch / torch-int8 / onnx.
+_model = None
+_model_lock = threading.Lock()
+
+def get_model():
+    global _model
+    if _model is None:
+        with _model_lock:
+            if _model is None:
+                with load_timer("embedding_model"):
+                    _model = load_encoder(MODEL_NAME, EMBEDDING_BACKEND)
+    return _model
+
+def encode_texts(texts: List[str], batch_size: int = 32) -> np.ndarray:
+    """
+    L2-normalized float32 embeddings for many texts. Vectors come from the
+    persistent embedding store when available; only unseen texts reach the
+    transformer, in one batched call.
+    """
+    if not texts:
+        return np.zeros((0, get_model().get_sentence_embedding_dimension()), dtype=np.float32)
+    normed = [normalize_for_embedding(t) for t in texts]
+    keys = [text_key(MODEL_KEY, t) for t in normed]
+
+    store = get_embedding_store()
+    found = store.get_many(list(dict.fromkeys(keys)))
+    todo = {k: t for k, t in zip(keys, normed) if k not in found}
+    if todo:
+        vecs = get_model().encode(
+            list(todo.values()), batch_size=batch_size, convert_to_numpy=True, normalize_embeddings=True
+        ).astype(np.float32)
+        fresh = dict(zip(todo.keys(), vecs))
+        store.put_many(MODEL_KEY, fresh)
+        found.update(fresh)
+    return np.vstack([found[k] for k in keys])
+
+def encode_text(text: str) -> np.ndarray:
+    """L2-normalized float32 embedding for a single text."""
+    return encode_texts([text])[0]
+
+def similarities_to_embedding(resume_texts: List[str], jd_embedding: np.ndarray) -> List[float]:
+    """Batched similarity_to_embedding: one encode call for all resumes."""
+    if jd_embedding is None:
+        return [0.0] * len(resume_texts)
+    keep = [i for i, t in enumerate(resume_texts) if t.strip()]
+    scores = [0.0] * len(resume_texts)
+    if keep:
+        sims = encode_texts([resume_texts[i] for i in keep]) @ jd_embedding
+        for i, sim in zip(keep, sims):
+            scores[i] = round(float(sim) * 100, 2)
+    return scores
+
+def similarity_to_embedding(resume_text: str, jd_embedding: np.ndarray) -> float:
+    """
+    Same score as calculate_similarity, but against a precomputed
+    (normalized) JD embedding, e.g. from a compiled JD profile.
+    """
+    if not resume_text.strip() or jd_embedding is None:
+        return 0.0
+    similarity_score = float(np.dot(encode_text(resume_text), jd_embedding))
+    return round(similarity_score * 100, 2)
 
 def calculate_similarity(resume_text: str, jd_text: str) -> float:
     """
@@ -12,8 +95,68 @@ def calculate_similarity(resume_text: str, jd_text: str) -> float:
     if not resume_text.strip() or not jd_text.strip():
         return 0.0
 
-    resume_embedding = _model.encode(resume_text, convert_to_tensor=True)
-    jd_embedding = _model.encode(jd_text, convert_to_tensor=True)
+    if EMBEDDING_MODE == "sections":
+        sections = sectionize(normalize_text(resume_text))
+        chunks = section_chunks(sections)
+        jd_chunks = chunk_text(jd_text)
+        # resume and JD chunks go through the encoder together
+        vecs = encode_texts([c for _, c in chunks] + jd_chunks)
+        score, _ = score_section_chunks([name for name, _ in chunks], vecs[:len(chunks)], vecs[len(chunks):])
+        return score
 
-    similarity_score = util.cos_sim(resume_embedding, jd_embedding).item()
+    resume_embedding, jd_embedding = encode_texts([resume_text, jd_text])
+
+    similarity_score = float(np.dot(resume_embedding, jd_embedding))
     return round(similarity_score * 100, 2)
+
+# ---------- Section / chunk mode ----------
+def chunk_text(text: str, max_words: int = CHUNK_WORDS, overlap: int = CHUNK_OVERLAP) -> List[str]:
+    """Overlapping word windows small enough that the encoder sees all of them."""
+    words = text.split()
+    if len(words) <= max_words:
+        return [" ".join(words)] if words else []
+    step = max(1, max_words - overlap)
+    return [" ".join(words[i:i + max_words]) for i in range(0, len(words) - overlap, step)]
+
+def section_chunks(sections: Dict[str, str]) -> List[Tuple[str, str]]:
+    """(section name, chunk) for every chunk of every section, in section order."""
+    return [(name, chunk) for name, text in sections.items() for chunk in chunk_text(text)]
+
+def encode_chunks(text: str) -> np.ndarray:
+    """(n_chunks x d) embeddings of a text, e.g. a JD at compile time."""
+    return encode_texts(chunk_text(text))
+
+def score_section_chunks(names: List[str], chunk_vecs: np.ndarray, jd_chunks: Optional[np.ndarray],
+                         agg: str = SECTION_AGG) -> Tuple[float, Dict[str, float]]:
+    """
+    (semantic score, {section: score}), both 0-100. Every resume chunk takes
+    its best-matching JD chunk; a section is the max (or mean) of its chunks
+    and the document score is the mean over sections.
+    """
+    if not names or jd_chunks is None or not len(jd_chunks):
+        return 0.0, {}
+    best = (chunk_vecs @ jd_chunks.T).max(axis=1)
+    grouped: Dict[str, List[float]] = {}
+    for name, sim in zip(names, best):
+        grouped.setdefault(name, []).append(float(sim))
+    per_section = {
+        name: round((max(sims) if agg == "max" else sum(sims) / len(sims)) * 100, 2)
+        for name, sims in grouped.items()
+    }
+    return round(sum(per_section.values()) / len(per_section), 2), per_section
+
+def section_similarities(sections_list: List[Dict[str, str]], jd_chunks: Optional[np.ndarray]) -> List[Tuple[float, Dict[str, float]]]:
+    """score_section_chunks for many resumes: every chunk of every resume in one encode call."""
+    chunked = [section_chunks(s) for s in sections_list]
+    if jd_chunks is None or not any(chunked):
+        return [(0.0, {}) for _ in sections_list]
+    vecs = encode_texts([c for chunks in chunked for _, c in chunks])
+    out, pos = [], 0
+    for chunks in chunked:
+        n = len(chunks)
+        out.append(score_section_chunks([name for name, _ in chunks], vecs[pos:pos + n], jd_chunks))
+        pos += n
+    return out
+
+def section_similarity(sections: Dict[str, str], jd_chunks: Optional[np.ndarray]) -> Tuple[float, Dict[str, float]]:
+    return section_similarities([sections], jd_chunks)[0]
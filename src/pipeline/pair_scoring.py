@@ -0,0 +1,169 @@
+# src/pipeline/pair_scoring.py
+"""
+Vectorized all-pairs (resumes x JDs) keyword scoring for batch matching.
+
+Resumes and JDs become sparse binary term matrices over one shared skills
+vocabulary; every pair's coverage is then a single sparse matrix product
+instead of one Python set intersection per pair:
+
+  skills_technical / skills_non_technical  same numbers as compute_ats
+                                           (_skills_scores) for every pair
+  idf_overlap                              share of the JD's IDF mass (rarity
+                                           across the resume pool) the resume covers
+
+    python -m src.pipeline.pair_scoring path/to/resumes path/to/JD --top 10 --out matches.csv
+"""
+import os, csv, sys, argparse
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Sequence, Tuple
+import numpy as np
+from scipy import sparse
+
+# ---------- Config ----------
+# resume rows per matrix product; bounds the dense (block x JDs) score arrays
+BLOCK_SIZE = int(os.getenv("PAIR_SCORING_BLOCK", "4096"))
+
+# ---------- 1) Term matrices ----------
+def build_vocabulary(*groups: Iterable[Iterable[str]]) -> Dict[str, int]:
+    """term -> column, shared by every matrix built for one run."""
+    vocab: Dict[str, int] = {}
+    for group in groups:
+        for terms in group:
+            for t in terms:
+                if t not in vocab:
+                    vocab[t] = len(vocab)
+    return vocab
+
+def term_matrix(rows: Sequence[Iterable[str]], vocab: Dict[str, int]) -> sparse.csr_matrix:
+    """Binary (rows x vocab) CSR matrix; terms outside the vocabulary are ignored."""
+    indptr, indices = [0], []
+    for terms in rows:
+        cols = {vocab[t] for t in terms if t in vocab}
+        indices.extend(sorted(cols))
+        indptr.append(len(indices))
+    data = np.ones(len(indices), dtype=np.float64)
+    return sparse.csr_matrix((data, np.asarray(indices, dtype=np.int64), np.asarray(indptr, dtype=np.int64)),
+                             shape=(len(rows), len(vocab)))
+
+def resume_skill_sets(prep: Dict) -> Tuple[List[str], List[str]]:
+    """The (technical, non-technical) skills compute_ats compares against a JD."""
+    skills = prep.get("skills", {})
+    return skills.get("technical", []), skills.get("non_technical", [])
+
+# ---------- 2) Scoring ----------
+def _coverage(resumes: sparse.csr_matrix, jds: sparse.csr_matrix, jd_sizes: np.ndarray) -> np.ndarray:
+    """(len(jd ∩ resume) / len(jd)) * 100 for every pair, rounded like _skills_scores (100 for an empty JD set)."""
+    overlap = (resumes @ jds.T).toarray()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cov = overlap / np.maximum(jd_sizes, 1.0) * 100.0
+    cov[:, jd_sizes == 0] = 100.0
+    return np.round(cov, 1)
+
+class PairScorer:
+    """
+    Holds the JD side (matrices, sizes, vocabulary) so any number of resume
+    blocks can be scored against it; IDF is taken over the resume pool passed
+    to fit_idf (defaults to uniform weights).
+    """
+
+    def __init__(self, jd_profiles: Sequence[Dict], resume_skills: Sequence[Tuple[Iterable[str], Iterable[str]]] = ()):
+        self.names = [p.get("name", "") for p in jd_profiles]
+        jd_tech = [p["tech"] for p in jd_profiles]
+        jd_soft = [p["soft"] for p in jd_profiles]
+        self.vocab = build_vocabulary(jd_tech, jd_soft)
+        self.jd_tech = term_matrix(jd_tech, self.vocab)
+        self.jd_soft = term_matrix(jd_soft, self.vocab)
+        self.jd_all = (self.jd_tech + self.jd_soft).sign()
+        self.tech_sizes = np.asarray(self.jd_tech.sum(axis=1)).ravel()
+        self.soft_sizes = np.asarray(self.jd_soft.sum(axis=1)).ravel()
+        self._set_idf(np.ones(len(self.vocab)))
+        if resume_skills:
+            self.fit_idf(resume_skills)
+
+    def _set_idf(self, idf: np.ndarray) -> None:
+        self.idf = idf
+        self.weighted_jd = (self.jd_all @ sparse.diags(idf)).tocsr()
+        self.jd_mass = np.asarray(self.weighted_jd.sum(axis=1)).ravel()
+
+    def fit_idf(self, resume_skills: Sequence[Tuple[Iterable[str], Iterable[str]]]) -> None:
+        """Smoothed IDF of every JD term over the resume pool: rare skills weigh more."""
+        df = np.zeros(len(self.vocab))
+        for tech, soft in resume_skills:
+            for col in {self.vocab[t] for t in (*tech, *soft) if t in self.vocab}:
+                df[col] += 1
+        n = len(resume_skills)
+        self._set_idf(np.log((1.0 + n) / (1.0 + df)) + 1.0)
+
+    def score(self, resume_skills: Sequence[Tuple[Iterable[str], Iterable[str]]]) -> Dict[str, np.ndarray]:
+        """(resumes x JDs) arrays: skills_technical, skills_non_technical, idf_overlap (all 0-100)."""
+        r_tech = term_matrix([t for t, _ in resume_skills], self.vocab)
+        r_soft = term_matrix([s for _, s in resume_skills], self.vocab)
+        r_all = (r_tech + r_soft).sign()
+        covered = (r_all @ self.weighted_jd.T).toarray()
+        with np.errstate(divide="ignore", invalid="ignore"):
+            idf_overlap = np.where(self.jd_mass > 0, covered / np.maximum(self.jd_mass, 1e-12) * 100.0, 100.0)
+        return {
+            "skills_technical": _coverage(r_tech, self.jd_tech, self.tech_sizes),
+            "skills_non_technical": _coverage(r_soft, self.jd_soft, self.soft_sizes),
+            "idf_overlap": np.round(idf_overlap, 2),
+        }
+
+    def iter_blocks(self, resume_skills: Sequence[Tuple[Iterable[str], Iterable[str]]],
+                    block_size: int = BLOCK_SIZE) -> Iterator[Tuple[int, Dict[str, np.ndarray]]]:
+        """(first resume row, score arrays) per block, so memory stays bounded for large pools."""
+        for start in range(0, len(resume_skills), block_size):
+            yield start, self.score(resume_skills[start:start + block_size])
+
+def score_all_pairs(resume_preps: Sequence[Dict], jd_profiles: Sequence[Dict]) -> Dict[str, np.ndarray]:
+    """Coverage / IDF overlap for every resume x JD pair in one go (small pools)."""
+    skills = [resume_skill_sets(p) for p in resume_preps]
+    return PairScorer(jd_profiles, skills).score(skills)
+
+def top_matches(scores: Dict[str, np.ndarray], k: int, key: str = "idf_overlap") -> np.ndarray:
+    """Column indices of the k best JDs per resume row, best first."""
+    values = scores[key]
+    k = min(k, values.shape[1])
+    top = np.argpartition(-values, k - 1, axis=1)[:, :k]
+    order = np.argsort(-np.take_along_axis(values, top, axis=1), axis=1, kind="stable")
+    return np.take_along_axis(top, order, axis=1)
+
+if __name__ == "__main__":
+    from src.pipeline.extraction import SUPPORTED_TYPES, ExtractionError, file_type_of
+    from src.pipeline.resume_cache import extract_and_preprocess
+    from src.pipeline.preprocess_resume_text import preprocess_resume_text
+    from src.pipeline.jd_profile import compile_jd_folder
+
+    parser = argparse.ArgumentParser(description="Score every resume against every JD (keyword coverage).")
+    parser.add_argument("resumes", help="folder of resumes")
+    parser.add_argument("jds", help="folder of .txt JDs")
+    parser.add_argument("--jd-csv", default=str(Path(__file__).resolve().parent.parent.parent / "job_keywords.csv"))
+    parser.add_argument("--top", type=int, default=10, help="JDs kept per resume")
+    parser.add_argument("--rank-by", default="idf_overlap", choices=["idf_overlap", "skills_technical", "skills_non_technical"])
+    parser.add_argument("--out", default="-", help="CSV path (default stdout)")
+    args = parser.parse_args()
+
+    names, skills = [], []
+    for path in sorted(Path(args.resumes).iterdir()):
+        if path.is_file() and file_type_of(path.name) in SUPPORTED_TYPES:
+            try:
+                _, text, base = extract_and_preprocess(path.read_bytes(), path.name)
+            except ExtractionError as e:
+                print(f"skipping {path.name}: {e}", file=sys.stderr)
+                continue
+            names.append(path.name)
+            skills.append(resume_skill_sets(preprocess_resume_text(text, args.jd_csv, base=base)))
+    profiles = list(compile_jd_folder(args.jds).values())
+    if not names or not profiles:
+        raise SystemExit("Need at least one resume and one JD")
+
+    scorer = PairScorer(profiles, skills)
+    out = sys.stdout if args.out == "-" else open(args.out, "w", newline="", encoding="utf-8")
+    writer = csv.writer(out)
+    writer.writerow(["resume", "jd_file", "skills_technical", "skills_non_technical", "idf_overlap"])
+    for start, scores in scorer.iter_blocks(skills):
+        for row, cols in enumerate(top_matches(scores, args.top, args.rank_by)):
+            for j in cols:
+                writer.writerow([names[start + row], scorer.names[j], scores["skills_technical"][row, j],
+                                 scores["skills_non_technical"][row, j], scores["idf_overlap"][row, j]])
+    if out is not sys.stdout:
+        out.close()
@@ -0,0 +1,127 @@
+# src/pipeline/pdf_benchmark.py
+"""
+Speed / memory / quality benchmark for the PDF extraction backends.
+
+    python -m src.pipeline.pdf_benchmark path/to/resumes [--backends pypdf2,pymupdf] [--repeat 3]
+
+Corpus layout: any number of <name>.pdf files. For sectionize accuracy, add a
+reference next to a PDF, either <name>.sections.json ({"skills": "...", ...})
+or <name>.txt (clean text of the resume, sectionized the same way).
+PDFs without a reference still count towards speed and memory.
+"""
+import sys, json, time, argparse, resource, tracemalloc
+import multiprocessing as mp
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from src.pipeline.extraction import PDF_BACKENDS, ExtractionError, available_pdf_backends, extract_pdf_pages, resolve_pdf_backend
+from src.pipeline.preprocess_resume_text import normalize_text, sectionize, tokenize
+
+# ---------- Corpus ----------
+def load_corpus(folder) -> List[Dict]:
+    docs = []
+    for pdf in sorted(Path(folder).glob("*.pdf")):
+        doc = {"name": pdf.name, "data": pdf.read_bytes(), "truth": None}
+        ref_json, ref_txt = pdf.with_suffix(".sections.json"), pdf.with_suffix(".txt")
+        if ref_json.exists():
+            doc["truth"] = json.loads(ref_json.read_text(encoding="utf-8"))
+        elif ref_txt.exists():
+            doc["truth"] = sectionize(normalize_text(ref_txt.read_text(encoding="utf-8", errors="ignore")))
+        docs.append(doc)
+    return docs
+
+# ---------- Accuracy ----------
+def section_accuracy(found: Dict[str, str], truth: Dict[str, str]) -> Dict[str, float]:
+    """Heading F1 between the two section sets, plus mean token overlap of the sections both found."""
+    got, want = set(found), set(truth)
+    both = got & want
+    precision = len(both) / len(got) if got else 0.0
+    recall = len(both) / len(want) if want else 0.0
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    overlaps = []
+    for k in both:
+        a, b = set(tokenize(found[k])), set(tokenize(truth[k]))
+        overlaps.append(len(a & b) / len(a | b) if a | b else 1.0)
+    return {"heading_f1": f1, "content_overlap": sum(overlaps) / len(overlaps) if overlaps else 0.0}
+
+# ---------- One backend (runs in its own process so max RSS is per backend) ----------
+def _bench_backend(backend: str, docs: List[Dict], repeat: int) -> Dict:
+    errors, pages, texts = 0, 0, {}
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for doc in docs:
+            try:
+                out = extract_pdf_pages(doc["data"], backend=backend)
+            except Exception:
+                errors += 1
+                continue
+            pages += len(out)
+            texts[doc["name"]] = "".join(p + "\n" for p in out)
+    elapsed = time.perf_counter() - start
+
+    # separate pass: tracemalloc slows extraction down, so keep it out of the timing
+    tracemalloc.start()
+    for doc in docs:
+        try:
+            extract_pdf_pages(doc["data"], backend=backend)
+        except Exception:
+            pass
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    scores = [
+        section_accuracy(sectionize(normalize_text(texts[d["name"]])), d["truth"])
+        for d in docs if d["truth"] and d["name"] in texts
+    ]
+    return {
+        "backend": backend,
+        "files": len(docs),
+        "errors": errors // repeat,
+        "pages_per_sec": round(pages / elapsed, 2) if elapsed else 0.0,
+        "ms_per_file": round(elapsed * 1000 / (len(docs) * repeat), 2) if docs else 0.0,
+        "peak_python_mb": round(peak / 1e6, 2),
+        # ru_maxrss is KiB on Linux; includes C allocations (MuPDF) that tracemalloc cannot see
+        "max_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "scored_files": len(scores),
+        "heading_f1": round(sum(s["heading_f1"] for s in scores) / len(scores), 3) if scores else None,
+        "content_overlap": round(sum(s["content_overlap"] for s in scores) / len(scores), 3) if scores else None,
+    }
+
+def run_benchmark(folder, backends: Optional[List[str]] = None, repeat: int = 3) -> List[Dict]:
+    docs = load_corpus(folder)
+    if not docs:
+        raise SystemExit(f"No PDFs found in {folder}")
+    try:
+        backends = [resolve_pdf_backend(b) for b in backends] if backends else available_pdf_backends()
+    except ExtractionError as e:
+        raise SystemExit(str(e))
+    ctx = mp.get_context("spawn")
+    results = []
+    for backend in backends:
+        with ctx.Pool(1) as pool:
+            results.append(pool.apply(_bench_backend, (backend, docs, repeat)))
+    return results
+
+def print_table(results: List[Dict]) -> None:
+    cols = ["backend", "files", "errors", "pages_per_sec", "ms_per_file", "peak_python_mb", "max_rss_mb",
+            "heading_f1", "content_overlap"]
+    widths = {c: max(len(c), *(len(str(r[c])) for r in results)) for c in cols}
+    print("  ".join(c.ljust(widths[c]) for c in cols))
+    for r in results:
+        print("  ".join(str(r[c]).ljust(widths[c]) for c in cols))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark PDF extraction backends on a resume corpus.")
+    parser.add_argument("corpus", help="folder of sample resume PDFs (+ optional references)")
+    parser.add_argument("--backends", default="", help=f"comma-separated subset of {','.join(PDF_BACKENDS)}")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", action="store_true", help="print raw JSON instead of a table")
+    args = parser.parse_args()
+
+    chosen = [b.strip() for b in args.backends.split(",") if b.strip()] or None
+    results = run_benchmark(args.corpus, chosen, max(1, args.repeat))
+    if args.json:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+    else:
+        print_table(results)
@@ -1,29 +1,41 @@
-import re, os, json, csv, ast
+import re, os, json
 from collections import defaultdict
-from typing import Dict, List, Tuple, Set
+from typing import Dict, Iterable, Iterator, List, Tuple, Set
 from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
 
+# JD lexicon parsing/caching lives in jd_lexicon (load_jd_lexicon re-exported for callers)
+from src.pipeline.jd_lexicon import get_jd_lexicon, load_jd_lexicon
+from src.pipeline.skill_matcher import get_skill_matcher, canonical_skills
+
 # ---------- 1) Helpers: normalization ----------
 MULTISPACE = re.compile(r"[ \t]+")
 LINEJUNK = re.compile(r"^\s*(page\s*\d+|resume|curriculum vitae|cv)\s*$", re.I)
 
-def normalize_text(text: str) -> str:
-    text = text.replace("\r\n", "\n").replace("\r", "\n")
-    lines = []
-    for ln in text.split("\n"):
+def normalize_lines(lines: Iterable[str]) -> Iterator[str]:
+    """
+    Streaming form of normalize_text: cleans lines as they arrive and glues
+    wrapped continuation lines onto the previous one (one line of lookahead).
+    """
+    prev = None
+    for ln in lines:
         ln = MULTISPACE.sub(" ", ln).strip()
         if not ln or LINEJUNK.match(ln):
             continue
-        lines.append(ln)
-    text = "\n".join(lines)
+        if prev is not None and not prev.endswith((".", "!", "?", ":")) and ln[:1].islower():
+            prev += " " + ln
+            continue
+        if prev is not None:
+            yield prev
+        prev = ln
+    if prev is not None:
+        yield prev
 
-    fixed = []
-    for i, ln in enumerate(text.split("\n")):
-        if fixed and not fixed[-1].endswith((".", "!", "?", ":" )) and ln and ln[:1].islower():
-            fixed[-1] += " " + ln
-        else:
-            fixed.append(ln)
-    return "\n".join(fixed).strip()
+def page_lines(pages: Iterable[str]) -> Iterator[str]:
+    for page in pages:
+        yield from page.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+
+def normalize_text(text: str) -> str:
+    return "\n".join(normalize_lines(page_lines([text])))
 
 # ---------- 2) Contact info ----------
 RE_EMAIL = re.compile(r"[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9.-]+")
@@ -67,39 +79,103 @@ SECTION_HEADS = {
     "achievements": ["achievements","awards","honors","accomplishments"],
 }
 
+HEAD_LOOKUP = {}
+for _key, _heads in SECTION_HEADS.items():
+    for _h in _heads:
+        HEAD_LOOKUP.setdefault(_h.lower(), _key)
+
+class SectionBuilder:
+    """
+    Incremental sectionizer: feed lines one at a time (e.g. while pages are
+    still being extracted). A line that is exactly a known heading opens a
+    section; each section is recorded as [first_line, end_line) spans into the
+    line table. Text before the first heading is dropped unless the resume has
+    no headings at all, in which case everything is "other".
+    """
+
+    def __init__(self):
+        self.spans = defaultdict(list)
+        self.current = None
+        self.n = 0
+
+    def feed(self, line: str) -> None:
+        key = HEAD_LOOKUP.get(line.strip().lower())
+        if key is not None:
+            self.current = [self.n + 1, self.n + 1]
+            self.spans[key].append(self.current)
+        elif self.current is not None:
+            self.current[1] = self.n + 1
+        self.n += 1
+
+    def section_spans(self) -> Dict[str, List[List[int]]]:
+        return dict(self.spans) if self.spans else {"other": [[0, self.n]]}
+
+def span_text(lines: List[str], spans: List[List[int]]) -> str:
+    return "\n".join("\n".join(lines[a:b]).strip() for a, b in spans).strip()
+
+def sections_from_spans(lines: List[str], spans: Dict[str, List[List[int]]]) -> Dict[str, str]:
+    if "other" in spans:
+        return {"other": "\n".join(lines)}
+    texts = {k: span_text(lines, sp) for k, sp in spans.items()}
+    return {k: v for k, v in texts.items() if v}
+
 def sectionize(text: str) -> Dict[str, str]:
-    pattern = r"^(?:%s)\s*$" % "|".join(
-        [re.escape(h) for heads in SECTION_HEADS.values() for h in heads]
-    )
-    head_re = re.compile(pattern, re.I | re.M)
-
-    indices = []
-    for m in head_re.finditer(text):
-        indices.append((m.start(), m.group(0).strip().lower()))
-    indices.sort()
-    sections = defaultdict(str)
-    if not indices:
-        sections["other"] = text
-        return sections
-    for i, (pos, hdr) in enumerate(indices):
-        end = indices[i+1][0] if i+1 < len(indices) else len(text)
-        block = text[pos:end].split("\n", 1)
-        body = block[1] if len(block) > 1 else ""
-        key = None
-        for k, aliases in SECTION_HEADS.items():
-            if any(hdr.lower() == a.lower() for a in aliases):
-                key = k; break
-        sections[key] += body.strip() + "\n"
-    return {k:v.strip() for k,v in sections.items() if v.strip()}
+    lines = text.split("\n")
+    builder = SectionBuilder()
+    for ln in lines:
+        builder.feed(ln)
+    return sections_from_spans(lines, builder.section_spans())
+
+# ---------- 3b) Document model ----------
+# Built once per resume in a single pass over the normalized lines; every
+# later consumer (skills, readability, compute_ats scorers) reads from it
+# instead of re-tokenizing or re-splitting the text.
+def build_document(lines: Iterable[str]) -> Dict:
+    """
+    {"lines", "line_starts"   (char offset of each line in "\n".join(lines)),
+     "tokens", "token_starts" (lowercased TOKEN_RE tokens and their char offsets),
+     "line_tokens"            (index of each line's first token; one extra entry at the end),
+     "sections"               ({name: [[first_line, end_line), ...]})}
+    Plain lists/dicts so it can be cached as JSON.
+    """
+    doc = {"lines": [], "line_starts": [], "tokens": [], "token_starts": [], "line_tokens": []}
+    builder = SectionBuilder()
+    pos = 0
+    for ln in lines:
+        doc["lines"].append(ln)
+        doc["line_starts"].append(pos)
+        doc["line_tokens"].append(len(doc["tokens"]))
+        for m in TOKEN_RE.finditer(ln):
+            doc["tokens"].append(m.group(0).lower())
+            doc["token_starts"].append(pos + m.start())
+        builder.feed(ln)
+        pos += len(ln) + 1
+    doc["line_tokens"].append(len(doc["tokens"]))
+    spans = builder.section_spans()
+    if "other" not in spans:
+        spans = {k: sp for k, sp in spans.items() if span_text(doc["lines"], sp)}
+    doc["sections"] = spans
+    return doc
+
+def doc_text(doc: Dict) -> str:
+    return "\n".join(doc["lines"])
+
+def doc_section_lines(doc: Dict, name: str) -> List[str]:
+    return [ln for a, b in doc["sections"].get(name, []) for ln in doc["lines"][a:b]]
+
+def doc_section_tokens(doc: Dict, name: str) -> List[str]:
+    lt = doc["line_tokens"]
+    return [t for a, b in doc["sections"].get(name, []) for t in doc["tokens"][lt[a]:lt[b]]]
 
 # ---------- 4) Bullets & Dates ----------
 BULLET_RE = re.compile(r"^\s*(?:[-*•\u2022\u25CF]|\d+[.)])\s+(.*)$")
 MONTHS = "(jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec|january|february|march|april|june|july|august|september|october|november|december)"
 DATE_RE = re.compile(rf"({MONTHS}\s+\d{{2,4}}|\d{{1,2}}/\d{{4}}|\d{{4}})", re.I)
 
-def collect_bullets_and_dates(section_text: str, section_name: str) -> List[Dict]:
+def collect_bullets_and_dates(section_text: str, section_name: str, lines: List[str] = None) -> List[Dict]:
+    """lines: the section's lines from the document model (skips re-splitting section_text)."""
     out = []
-    for ln in section_text.split("\n"):
+    for ln in (lines if lines is not None else section_text.split("\n")):
         m = BULLET_RE.match(ln)
         if m:
             txt = m.group(1).strip()
@@ -118,23 +194,8 @@ def tokenize(text: str) -> List[str]:
     toks = [t for t in toks if t not in SAFE_STOP and len(t) > 1]
     return toks
 
-# ---------- 6) JD lexicon loading ----------
-def load_jd_lexicon(csv_path: str) -> Set[str]:
-    vocab = set()
-    with open(csv_path, newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            try:
-                kw_list = ast.literal_eval(row["keywords"])
-            except Exception:
-                continue
-            for kw in kw_list:
-                w = kw.strip().lower()
-                if w and w.isalpha() and w not in ENGLISH_STOP_WORDS:
-                    vocab.add(w)
-    return vocab
-
-# ---------- 7) Skill aliasing ----------
+# ---------- 6) Skill aliasing ----------
+# Default taxonomy for skill_matcher (SKILLS_TAXONOMY replaces it with a CSV).
 ALIASES = {
     "scikit-learn": "sklearn",
     "scikit": "sklearn",
@@ -143,7 +204,9 @@ ALIASES = {
     "ml": "machine learning",
     "dl": "deep learning",
     "postgres": "postgresql",
+    "postgre sql": "postgresql",
     "np": "numpy",
+    "k8s": "kubernetes",
 }
 
 TECH_HINTS = {
@@ -161,48 +224,51 @@ def normalize_term(t: str) -> str:
     t = t.lower()
     return ALIASES.get(t, t)
 
-def extract_skills(tokens: List[str], jd_vocab: Set[str]) -> Dict[str, List[str]]:
-    raw = set(normalize_term(t) for t in tokens)
-    keep = {t for t in raw if (t in jd_vocab) or (t in TECH_HINTS) or (t in NONTECH_HINTS)}
-    tech = sorted([t for t in keep if t in TECH_HINTS])
-    nontech = sorted([t for t in keep if t in NONTECH_HINTS])
-
-    text_join = " " + " ".join(tokens) + " "
-    for phrase in ["machine learning","deep learning","computer vision"]:
-        if f" {phrase} " in text_join:
-            keep.add(phrase)
-            tech = sorted(set(tech) | {phrase})
+SKILL_PHRASES = ["machine learning","deep learning","computer vision"]
+
+def extract_skills(tokens: List[str], jd_vocab: Set[str], stream: List[str] = None) -> Dict[str, List[str]]:
+    """
+    Taxonomy skills (single- and multi-word, aliases resolved) from one pass of
+    the skill matcher over the token stream, near-misses ("pytorch2", "kubernets")
+    from the fuzzy canonicalizer, plus any JD-lexicon words present.
+    stream: the unfiltered token stream (doc["tokens"]), so phrases containing
+    stopwords still match; defaults to tokens.
+    """
+    matcher = get_skill_matcher()
+    found = canonical_skills(stream if stream is not None else tokens, tokens)
+    keep = found | {t for t in (normalize_term(t) for t in tokens) if t in jd_vocab}
+    tech = sorted(t for t in found if matcher.category.get(t) == "tech")
+    nontech = sorted(t for t in found if matcher.category.get(t) == "soft")
     return {"all": sorted(keep), "technical": tech, "non_technical": nontech}
 
-# ---------- 8) Readability ----------
-def readability_features(text: str, bullets: List[Dict]) -> Dict[str, float]:
-    sentences = re.split(r"[.!?;\n•]+", text)
-    sentences = [s for s in sentences if s.strip()]
-    words = TOKEN_RE.findall(text)
-    total_lines = len([ln for ln in text.split("\n") if ln.strip()])
+# ---------- 7) Readability ----------
+SENTENCE_SPLIT = re.compile(r"[.!?;•]+")
+
+def readability_features(doc: Dict, bullets: List[Dict]) -> Dict[str, float]:
+    # newlines also end sentences, so counting per line matches splitting the whole text
+    sentences = sum(1 for ln in doc["lines"] for s in SENTENCE_SPLIT.split(ln) if s.strip())
+    words = len(doc["tokens"])
+    total_lines = len([ln for ln in doc["lines"] if ln.strip()])
     bullet_lines = len(bullets)
     return {
-        "words": len(words),
-        "sentences": len(sentences),
-        "avg_sentence_len": round(len(words) / max(1, len(sentences)), 2),
+        "words": words,
+        "sentences": sentences,
+        "avg_sentence_len": round(words / max(1, sentences), 2),
         "bullet_ratio": round(bullet_lines / max(1, total_lines), 2)
     }
 
-# ---------- 9) Main ----------
-def preprocess_resume_text(raw_text: str, jd_csv_path: str) -> Dict:
-    text = normalize_text(raw_text)
-    contact = extract_contact(text)
-    sections = sectionize(text)
+# ---------- 8) Main ----------
+def _base_from(doc: Dict) -> Dict:
+    sections = sections_from_spans(doc["lines"], doc["sections"])
+    contact = extract_contact(doc_text(doc))
 
     bullets = []
     for sec in ["experience","projects","internships"]:
         if sec in sections:
-            bullets.extend(collect_bullets_and_dates(sections[sec], sec))
+            bullets.extend(collect_bullets_and_dates(sections[sec], sec, doc_section_lines(doc, sec)))
 
-    tokens = tokenize(text)
-    jd_vocab = load_jd_lexicon(jd_csv_path)
-    skills = extract_skills(tokens, jd_vocab)
-    rb = readability_features(text, bullets)
+    tokens = [t for t in doc["tokens"] if t not in SAFE_STOP and len(t) > 1]
+    rb = readability_features(doc, bullets)
 
     return {
         "contact": contact,
@@ -211,6 +277,33 @@ def preprocess_resume_text(raw_text: str, jd_csv_path: str) -> Dict:
         "education": sections.get("education","").split("\n"),
         "bullets": bullets,
         "tokens": tokens,
-        "skills": skills,
-        "readability": rb
+        "readability": rb,
+        "doc": doc,
     }
+
+def preprocess_resume_base(raw_text: str) -> Dict:
+    """Everything in the prep dict that doesn't depend on the JD lexicon (safe to cache per resume)."""
+    return _base_from(build_document(normalize_lines(page_lines([raw_text]))))
+
+def preprocess_resume_pages(pages: Iterable[str], page_sep: str = "\n") -> Tuple[str, Dict]:
+    """
+    (raw text, preprocess_resume_base output) from a lazy page stream.
+    Normalization and the document model are built line by line as each page
+    arrives, so nothing waits for the whole document and only budgeted pages are parsed.
+    """
+    raw = []
+
+    def tee():
+        for page in pages:
+            raw.append(page + page_sep)
+            yield page
+    doc = build_document(normalize_lines(page_lines(tee())))
+    return "".join(raw), _base_from(doc)
+
+def preprocess_resume_text(raw_text: str, jd_csv_path: str, base: Dict = None) -> Dict:
+    """base: optional preprocess_resume_base() output (e.g. from the resume cache)."""
+    if base is None:
+        base = preprocess_resume_base(raw_text)
+    jd_vocab = get_jd_lexicon(jd_csv_path)
+    skills = extract_skills(base["tokens"], jd_vocab, base["doc"]["tokens"])
+    return {**base, "skills": skills}
@@ -0,0 +1,57 @@
+# src/pipeline/ranking.py
+from typing import Dict, List, Tuple
+
+from src.pipeline.preprocess_resume_text import preprocess_resume_base, preprocess_resume_text
+from src.pipeline.ats_scoring import compute_ats
+
+def score_prepared(text: str, base: Dict, jd_profile: Dict, jd_csv_path: str, fresher: bool = None) -> Dict:
+    """compute_ats for an already extracted/preprocessed resume (process-pool entry point)."""
+    prep = preprocess_resume_text(text, jd_csv_path, base=base)
+    return compute_ats(text, None, jd_csv_path, fresher=fresher, jd_profile=jd_profile, prep=prep)
+
+def score_candidate(text: str, base: Dict, jd_profile: Dict, jd_csv_path: str, fresher: bool = None) -> Tuple[Dict, Dict]:
+    """score_prepared for a stored resume whose cached prep may be gone; also returns its sections."""
+    if base is None:
+        base = preprocess_resume_base(text)
+    return score_prepared(text, base, jd_profile, jd_csv_path, fresher), base["sections"]
+
+def score_against_profiles(text: str, base: Dict, jd_profiles: List[Dict], jd_csv_path: str, fresher: bool = None) -> List[Dict]:
+    """compute_ats of one resume against several JDs, preprocessing it once."""
+    prep = preprocess_resume_text(text, jd_csv_path, base=base)
+    return [
+        compute_ats(text, None, jd_csv_path, fresher=fresher, jd_profile=p, prep=prep)
+        for p in jd_profiles
+    ]
+
+# kept on a /rank row for the batched embedding pass, never sent to the client
+WORKER_ONLY = ("text", "sections")
+
+def leaderboard_entry(filename: str, text: str, ats: Dict, sections: Dict = None) -> Dict:
+    """One /rank row; "text" / "sections" feed the batched embedding pass and are stripped by public_entry."""
+    return {
+        "file": filename,
+        "text": text,
+        "sections": sections or {},
+        "label": ats["label"],
+        "final_score": ats["total_score"],
+        "breakdown": ats["components"],
+        "matched_keywords": ats["matched_skills"],
+        "missing_keywords": ats["missing_skills"],
+        "preview": {
+            "name": ats["contact"].get("name"),
+            "email": ats["contact"].get("email"),
+            "skills_top": ats["skills_top"],
+        },
+    }
+
+def public_entry(result: Dict) -> Dict:
+    """Strip worker-only fields (raw text, sections) before sending a result to the client."""
+    return {k: v for k, v in result.items() if k not in WORKER_ONLY}
+
+def build_leaderboard(results: List[Dict]) -> List[Dict]:
+    """Sort scored resumes by ATS score (semantic score breaks ties) and number them."""
+    scored = [public_entry(r) for r in results if "error" not in r]
+    scored.sort(key=lambda r: (r["final_score"], r.get("semantic_score", 0.0)), reverse=True)
+    for i, r in enumerate(scored, start=1):
+        r["rank"] = i
+    return scored
@@ -0,0 +1,190 @@
+# src/pipeline/result_cache.py
+"""
+Cache of finished API responses, keyed by what determines them: the resume's
+content hash, the JD's content hash, the endpoint and its options. Every entry
+is stamped with the scoring version (weights, lexicons, embedding model, cache
+formats) it was computed under; an entry from an older version is a miss and
+is dropped when it is next read, so a bump never needs a flush.
+"""
+import os, json, zlib, time, sqlite3, hashlib, threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from src.pipeline.ats_weights import WEIGHT_PROFILE, profile_signature
+from src.pipeline.extraction import PAGE_BUDGET, CHAR_BUDGET
+from src.pipeline.jd_profile import PROFILE_VERSION, lexicon_signature
+from src.pipeline.matcher import MODEL_KEY, EMBEDDING_MODE, CHUNK_WORDS, CHUNK_OVERLAP, SECTION_AGG
+from src.pipeline.resume_cache import CACHE_VERSION
+from src.pipeline.skill_matcher import FUZZY_CUTOFF, FUZZY_MIN_LEN
+
+# ---------- Config ----------
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+RESULT_DB = os.getenv("RESULT_CACHE_DB", str(BASE_DIR / ".cache" / "results.sqlite"))
+TTL_S = float(os.getenv("RESULT_CACHE_TTL_S", "86400"))
+MEM_ENTRIES = int(os.getenv("RESULT_CACHE_MEM_ENTRIES", "512"))
+DISK_MAX_BYTES = int(os.getenv("RESULT_CACHE_DISK_MB", "64")) * 1024 * 1024
+# bump when a cached endpoint's response changes shape or meaning
+RESULT_VERSION = 1
+
+# ---------- 1) Keys ----------
+_digests: Dict[str, Tuple[Tuple[int, int], str]] = {}
+
+def file_digest(path: str) -> str:
+    """Content hash of a file, re-hashed only when its mtime/size change (a rewrite with equal content keeps it)."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return "-"
+    stat_key = (st.st_mtime_ns, st.st_size)
+    cached = _digests.get(path)
+    if cached is None or cached[0] != stat_key:
+        with open(path, "rb") as f:
+            cached = (stat_key, hashlib.sha256(f.read()).hexdigest()[:16])
+        _digests[path] = cached
+    return cached[1]
+
+def scoring_version(jd_csv_path: str) -> str:
+    """Stamp of everything besides the resume and JD that a score depends on."""
+    parts = [
+        RESULT_VERSION, CACHE_VERSION, PROFILE_VERSION, lexicon_signature(), file_digest(jd_csv_path),
+        WEIGHT_PROFILE, profile_signature(WEIGHT_PROFILE),
+        MODEL_KEY, EMBEDDING_MODE, CHUNK_WORDS, CHUNK_OVERLAP, SECTION_AGG,
+        FUZZY_CUTOFF, FUZZY_MIN_LEN, PAGE_BUDGET, CHAR_BUDGET,
+    ]
+    return hashlib.sha256("\x1f".join(map(str, parts)).encode("utf-8")).hexdigest()[:16]
+
+def result_key(endpoint: str, resume_key: str, jd_sha: str, **options) -> str:
+    """resume_key already includes the PDF backend and extraction budgets; options are the request's other form fields."""
+    opts = json.dumps(options, sort_keys=True)
+    return hashlib.sha256("\x1f".join((endpoint, resume_key, jd_sha, opts)).encode("utf-8")).hexdigest()
+
+# ---------- 2) Cache ----------
+class ResultCache:
+    """
+    Tier 1: in-process LRU. Tier 2: SQLite file shared by all workers. Both
+    honour the TTL; the SQLite tier is trimmed least-recently-used once it
+    grows past disk_max_bytes.
+    """
+
+    def __init__(self, db_path: str = RESULT_DB, ttl_s: float = TTL_S, mem_entries: int = MEM_ENTRIES,
+                 disk_max_bytes: int = DISK_MAX_BYTES):
+        self.db_path = db_path
+        self.ttl_s = ttl_s
+        self.mem_entries = mem_entries
+        self.disk_max_bytes = disk_max_bytes
+        self._mem: "OrderedDict[str, Tuple[float, str, Dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = None
+        self._pid = None
+        self.counters = {"hits": 0, "misses": 0, "expired": 0, "stale": 0, "mem_evictions": 0, "disk_evictions": 0}
+
+    # ----- sqlite tier -----
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None or self._pid != os.getpid():
+            Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.db_path, timeout=10, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                " key TEXT PRIMARY KEY, version TEXT, payload BLOB, size INTEGER, created REAL, last_access REAL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS results_last_access ON results(last_access)")
+            self._conn, self._pid = conn, os.getpid()
+        return self._conn
+
+    def _disk_get(self, key: str) -> Optional[Tuple[float, str, Dict]]:
+        conn = self._db()
+        row = conn.execute("SELECT created, version, payload FROM results WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        conn.execute("UPDATE results SET last_access = ? WHERE key = ?", (time.time(), key))
+        conn.commit()
+        return row[0], row[1], json.loads(zlib.decompress(row[2]))
+
+    def _disk_put(self, key: str, created: float, version: str, result: Dict) -> None:
+        conn = self._db()
+        payload = zlib.compress(json.dumps(result).encode("utf-8"))
+        conn.execute(
+            "INSERT OR REPLACE INTO results (key, version, payload, size, created, last_access) VALUES (?, ?, ?, ?, ?, ?)",
+            (key, version, payload, len(payload), created, created),
+        )
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+        if total > self.disk_max_bytes:
+            # expired entries go first, then least recently used down to ~90% of the budget
+            conn.execute("DELETE FROM results WHERE created < ?", (time.time() - self.ttl_s,))
+            total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+            target = total - int(self.disk_max_bytes * 0.9)
+            freed, victims = 0, []
+            for k, size in conn.execute("SELECT key, size FROM results ORDER BY last_access"):
+                if freed >= target:
+                    break
+                victims.append((k,))
+                freed += size
+            conn.executemany("DELETE FROM results WHERE key = ?", victims)
+            self.counters["disk_evictions"] += len(victims)
+        conn.commit()
+
+    def _discard(self, key: str) -> None:
+        self._mem.pop(key, None)
+        if self.db_path:
+            conn = self._db()
+            conn.execute("DELETE FROM results WHERE key = ?", (key,))
+            conn.commit()
+
+    # ----- public -----
+    def get(self, key: str, version: str) -> Optional[Dict]:
+        with self._lock:
+            entry = self._mem.get(key)
+            if entry is not None:
+                self._mem.move_to_end(key)
+            elif self.db_path:
+                entry = self._disk_get(key)
+            if entry is None:
+                self.counters["misses"] += 1
+                return None
+            created, entry_version, result = entry
+            if entry_version != version or time.time() - created > self.ttl_s:
+                self.counters["stale" if entry_version != version else "expired"] += 1
+                self.counters["misses"] += 1
+                self._discard(key)
+                return None
+            self.counters["hits"] += 1
+            self._mem_put(key, entry)
+            return result
+
+    def put(self, key: str, version: str, result: Dict) -> None:
+        created = time.time()
+        with self._lock:
+            self._mem_put(key, (created, version, result))
+            if self.db_path:
+                self._disk_put(key, created, version, result)
+
+    def _mem_put(self, key: str, entry: Tuple[float, str, Dict]) -> None:
+        self._mem[key] = entry
+        self._mem.move_to_end(key)
+        while len(self._mem) > self.mem_entries:
+            self._mem.popitem(last=False)
+            self.counters["mem_evictions"] += 1
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.counters["hits"] + self.counters["misses"]
+            return {
+                **self.counters,
+                "mem_entries": len(self._mem),
+                "ttl_s": self.ttl_s,
+                "hit_rate": round(self.counters["hits"] / lookups, 3) if lookups else 0.0,
+            }
+
+# ---------- Process-wide cache ----------
+_cache: Optional[ResultCache] = None
+_cache_lock = threading.Lock()
+
+def get_result_cache() -> ResultCache:
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ResultCache()
+    return _cache
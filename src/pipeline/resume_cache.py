@@ -0,0 +1,164 @@
+# src/pipeline/resume_cache.py
+import os, json, zlib, time, sqlite3, hashlib, threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from src.pipeline.extraction import PAGE_BUDGET, CHAR_BUDGET, iter_text_pages, file_type_of, resolve_pdf_backend
+from src.pipeline.preprocess_resume_text import preprocess_resume_pages
+
+# ---------- Config ----------
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+CACHE_DB = os.getenv("RESUME_CACHE_DB", str(BASE_DIR / ".cache" / "resumes.sqlite"))
+MEM_ENTRIES = int(os.getenv("RESUME_CACHE_MEM_ENTRIES", "256"))
+DISK_MAX_BYTES = int(os.getenv("RESUME_CACHE_DISK_MB", "512")) * 1024 * 1024
+# bump when preprocess_resume_base() output changes shape
+# (2: text capped by the extraction budget, 3: shared document model under "doc")
+CACHE_VERSION = 3
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+def resume_key(data: bytes, filename: str, pdf_backend: str = None) -> str:
+    """
+    Cache key for an upload: PDFs are keyed per extraction backend, since text
+    differs between them, and every upload per page/character budget, since
+    those decide how much of the document is read.
+    """
+    key = content_hash(data)
+    if file_type_of(filename) == "pdf":
+        key += ":" + resolve_pdf_backend(pdf_backend)
+    return f"{key}@{PAGE_BUDGET}p{CHAR_BUDGET}c"
+
+class ResumeCache:
+    """
+    Content-addressed cache of {text, base} per uploaded file (SHA-256 of the bytes).
+    Tier 1: in-process LRU. Tier 2: SQLite file shared by all workers, evicted
+    least-recently-used once it grows past disk_max_bytes.
+    """
+
+    def __init__(self, db_path: str = CACHE_DB, mem_entries: int = MEM_ENTRIES, disk_max_bytes: int = DISK_MAX_BYTES):
+        self.db_path = db_path
+        self.mem_entries = mem_entries
+        self.disk_max_bytes = disk_max_bytes
+        self._mem: "OrderedDict[str, Dict]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = None
+        self._pid = None
+        self.counters = {"mem_hits": 0, "disk_hits": 0, "misses": 0, "mem_evictions": 0, "disk_evictions": 0}
+
+    # ----- sqlite tier -----
+    def _db(self) -> sqlite3.Connection:
+        # one connection per process (pool workers are forked)
+        if self._conn is None or self._pid != os.getpid():
+            Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.db_path, timeout=10, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS resumes ("
+                " sha TEXT PRIMARY KEY, version INTEGER, payload BLOB, size INTEGER, last_access REAL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS resumes_last_access ON resumes(last_access)")
+            self._conn, self._pid = conn, os.getpid()
+        return self._conn
+
+    def _disk_get(self, key: str) -> Optional[Dict]:
+        conn = self._db()
+        row = conn.execute("SELECT payload FROM resumes WHERE sha = ? AND version = ?", (key, CACHE_VERSION)).fetchone()
+        if row is None:
+            return None
+        conn.execute("UPDATE resumes SET last_access = ? WHERE sha = ?", (time.time(), key))
+        conn.commit()
+        return json.loads(zlib.decompress(row[0]))
+
+    def _disk_put(self, key: str, entry: Dict) -> None:
+        conn = self._db()
+        payload = zlib.compress(json.dumps(entry).encode("utf-8"))
+        conn.execute(
+            "INSERT OR REPLACE INTO resumes (sha, version, payload, size, last_access) VALUES (?, ?, ?, ?, ?)",
+            (key, CACHE_VERSION, payload, len(payload), time.time()),
+        )
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM resumes").fetchone()[0]
+        if total > self.disk_max_bytes:
+            # drop oldest entries down to ~90% of the budget
+            target = total - int(self.disk_max_bytes * 0.9)
+            freed = 0
+            victims = []
+            for sha, size in conn.execute("SELECT sha, size FROM resumes ORDER BY last_access"):
+                if freed >= target:
+                    break
+                victims.append((sha,))
+                freed += size
+            conn.executemany("DELETE FROM resumes WHERE sha = ?", victims)
+            self.counters["disk_evictions"] += len(victims)
+        conn.commit()
+
+    # ----- public -----
+    def get(self, key: str) -> Optional[Dict]:
+        with self._lock:
+            entry = self._mem.get(key)
+            if entry is not None:
+                self._mem.move_to_end(key)
+                self.counters["mem_hits"] += 1
+                return entry
+            entry = self._disk_get(key) if self.db_path else None
+            if entry is None:
+                self.counters["misses"] += 1
+                return None
+            self.counters["disk_hits"] += 1
+            self._mem_put(key, entry)
+            return entry
+
+    def put(self, key: str, entry: Dict) -> None:
+        with self._lock:
+            self._mem_put(key, entry)
+            if self.db_path:
+                self._disk_put(key, entry)
+
+    def _mem_put(self, key: str, entry: Dict) -> None:
+        self._mem[key] = entry
+        self._mem.move_to_end(key)
+        while len(self._mem) > self.mem_entries:
+            self._mem.popitem(last=False)
+            self.counters["mem_evictions"] += 1
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.counters["mem_hits"] + self.counters["disk_hits"] + self.counters["misses"]
+            hits = lookups - self.counters["misses"]
+            return {
+                **self.counters,
+                "mem_entries": len(self._mem),
+                "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+            }
+
+# ---------- Process-wide cache ----------
+_cache: Optional[ResumeCache] = None
+
+def get_resume_cache() -> ResumeCache:
+    global _cache
+    if _cache is None:
+        _cache = ResumeCache()
+    return _cache
+
+def build_resume_entry(data: bytes, filename: str, max_pages: int = None, pdf_backend: str = None) -> Dict:
+    """
+    Uncached extraction + JD-independent preprocessing (worker-process entry point).
+    Pages stream straight into normalization/sectionizing and stop at the page/char budget.
+    """
+    pages = iter_text_pages(data, filename, max_pages=max_pages, pdf_backend=pdf_backend)
+    text, base = preprocess_resume_pages(pages, "\n" if file_type_of(filename) == "pdf" else "")
+    return {"text": text, "base": base}
+
+def extract_and_preprocess(data: bytes, filename: str, pdf_backend: str = None) -> Tuple[str, str, Dict]:
+    """
+    (cache key, raw text, JD-independent prep) for an uploaded file.
+    A repeat upload of the same bytes skips extraction and preprocessing entirely.
+    """
+    key = resume_key(data, filename, pdf_backend)
+    cache = get_resume_cache()
+    entry = cache.get(key)
+    if entry is None:
+        entry = build_resume_entry(data, filename, pdf_backend=pdf_backend)
+        cache.put(key, entry)
+    return key, entry["text"], entry["base"]
@@ -0,0 +1,303 @@
+# src/pipeline/skill_matcher.py
+import os, csv, re, hashlib, pickle, threading
+from collections import OrderedDict, deque
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+import numpy as np
+from rapidfuzz import fuzz, process
+from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
+
+from src.pipeline.warmup import load_timer
+
+# ---------- Config ----------
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+# CSV with columns: skill, category (tech / soft / ...), aliases ("|"-separated)
+TAXONOMY_CSV = os.getenv("SKILLS_TAXONOMY")
+MATCHER_BIN = os.getenv("SKILLS_MATCHER_BIN", str(BASE_DIR / ".cache" / "skills_matcher.pkl"))
+# bump when the automaton layout changes
+MATCHER_VERSION = 2
+# fuzzy canonicalization of tokens the automaton doesn't know ("pytorch2", "kubernets")
+FUZZY_CUTOFF = float(os.getenv("FUZZY_SKILL_CUTOFF", "88"))
+FUZZY_MIN_LEN = int(os.getenv("FUZZY_SKILL_MIN_LEN", "4"))
+FUZZY_MEMO_SIZE = int(os.getenv("FUZZY_SKILL_MEMO_SIZE", "100000"))
+# rapidfuzz threads per cdist call; 1 because scoring already runs one call per pool
+# worker (-1 = all cores, only sensible for single-process CLI use)
+FUZZY_WORKERS = int(os.getenv("FUZZY_SKILL_WORKERS", "1"))
+# a known word plus one of these is an inflection ("flasks", "vectors"), not a typo
+INFLECTION_SUFFIXES = ("s", "es", "ed", "ing", "er", "ers")
+
+PATTERN_TOKEN_RE = re.compile(r"[A-Za-z][A-Za-z0-9\-\+\.#]*")
+
+def match_key(token: str) -> str:
+    """Token normalization shared by patterns and input streams ("Python." -> "python")."""
+    return token.lower().rstrip(".")
+
+def pattern_tokens(phrase: str) -> Tuple[str, ...]:
+    return tuple(match_key(t) for t in PATTERN_TOKEN_RE.findall(phrase) if match_key(t))
+
+# ---------- 1) Taxonomy ----------
+# canonical skill -> (category, aliases)
+Taxonomy = Dict[str, Tuple[str, Tuple[str, ...]]]
+
+def default_taxonomy() -> Taxonomy:
+    """
+    The curated resume skill lists (hints, phrases, aliases) that used to be
+    hard-coded in preprocess_resume_text. The scorer's JD-side PHRASES are
+    added under the "phrase" category: they let one matcher pass find
+    multi-word JD terms but never count as resume skills. The scorer's broader
+    single-word hint sets ("ray", "rest", "vector", ...) stay out, since as
+    plain resume words they are mostly ordinary English.
+    """
+    from src.pipeline import preprocess_resume_text as prep
+    from src.pipeline import ats_scoring as ats
+
+    tax: Dict[str, List] = {}
+    for cat, group in (("tech", prep.TECH_HINTS | set(prep.SKILL_PHRASES)),
+                       ("soft", prep.NONTECH_HINTS),
+                       ("phrase", ats.PHRASES)):
+        for skill in group:
+            tax.setdefault(skill, [cat, []])
+    for alias, canonical in prep.ALIASES.items():
+        tax.setdefault(canonical, ["tech", []])[1].append(alias)
+    return {k: (cat, tuple(sorted(aliases))) for k, (cat, aliases) in tax.items()}
+
+def load_taxonomy(csv_path: str) -> Taxonomy:
+    tax = {}
+    with open(csv_path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            skill = (row.get("skill") or "").strip().lower()
+            if not skill:
+                continue
+            aliases = tuple(a.strip().lower() for a in (row.get("aliases") or "").split("|") if a.strip())
+            tax[skill] = ((row.get("category") or "tech").strip().lower(), aliases)
+    return tax
+
+# ---------- 2) Automaton ----------
+class SkillMatcher:
+    """
+    Aho-Corasick automaton over token sequences: every skill and alias
+    (single- or multi-word) is found in one left-to-right pass over a token
+    stream, however large the taxonomy. State is plain lists/dicts so the
+    compiled matcher pickles and loads quickly.
+    """
+
+    def __init__(self, taxonomy: Taxonomy):
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.out: List[List[int]] = [[]]
+        self.patterns: List[Tuple[str, int]] = []   # (canonical, token length)
+        self.category: Dict[str, str] = {}
+        self.unigrams: Dict[str, str] = {}           # single-token surface -> canonical (fuzzy vocabulary)
+        for skill, (cat, aliases) in taxonomy.items():
+            self.category[skill] = cat
+            for surface in (skill, *aliases):
+                self._add(pattern_tokens(surface), skill)
+        self._link()
+
+    def _add(self, toks: Tuple[str, ...], canonical: str) -> None:
+        if not toks:
+            return
+        if len(toks) == 1:
+            self.unigrams.setdefault(toks[0], canonical)
+        state = 0
+        for t in toks:
+            nxt = self.goto[state].get(t)
+            if nxt is None:
+                nxt = len(self.goto)
+                self.goto[state][t] = nxt
+                self.goto.append({})
+                self.fail.append(0)
+                self.out.append([])
+            state = nxt
+        self.out[state].append(len(self.patterns))
+        self.patterns.append((canonical, len(toks)))
+
+    def _link(self) -> None:
+        # BFS: fail(child) = longest proper suffix that is also a trie path
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for tok, nxt in self.goto[state].items():
+                queue.append(nxt)
+                f = self.fail[state]
+                while f and tok not in self.goto[f]:
+                    f = self.fail[f]
+                self.fail[nxt] = self.goto[f].get(tok, 0) if state else 0
+                self.out[nxt] = self.out[nxt] + self.out[self.fail[nxt]]
+
+    def find(self, tokens: Iterable[str]) -> List[Tuple[int, int, str]]:
+        """All (start, end, canonical) matches, overlapping ones included."""
+        hits = []
+        state = 0
+        for i, tok in enumerate(tokens):
+            tok = match_key(tok)
+            while state and tok not in self.goto[state]:
+                state = self.fail[state]
+            state = self.goto[state].get(tok, 0)
+            for pid in self.out[state]:
+                canonical, n = self.patterns[pid]
+                hits.append((i + 1 - n, i + 1, canonical))
+        return hits
+
+    def skills(self, tokens: Iterable[str]) -> Set[str]:
+        """Canonical resume skills (JD-only "phrase" entries excluded)."""
+        return {canonical for _, _, canonical in self.find(tokens) if self.category.get(canonical) != "phrase"}
+
+    def phrases(self, tokens: Iterable[str]) -> Set[str]:
+        """Canonical skills matched by a multi-word surface form."""
+        return {canonical for start, end, canonical in self.find(tokens) if end - start > 1}
+
+# ---------- 3) Fuzzy canonicalization ----------
+class FuzzyCanonicalizer:
+    """
+    Maps tokens the automaton has no exact entry for onto the nearest
+    single-token skill. All new tokens of a resume are scored against the whole
+    vocabulary in one vectorized rapidfuzz cdist call (with a score cutoff);
+    every answer, including "no match", is memoized in a bounded LRU.
+    """
+
+    def __init__(self, matcher: SkillMatcher, cutoff: float = FUZZY_CUTOFF,
+                 min_len: int = FUZZY_MIN_LEN, memo_size: int = FUZZY_MEMO_SIZE, workers: int = FUZZY_WORKERS):
+        self.vocab = sorted(matcher.unigrams)
+        self.canonical = [matcher.unigrams[v] for v in self.vocab]
+        self.known = matcher.unigrams
+        self.cutoff = cutoff
+        self.min_len = min_len
+        self.memo_size = memo_size
+        self.workers = workers
+        self._memo: "OrderedDict[str, Optional[str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _inflected(self, key: str) -> bool:
+        for suffix in INFLECTION_SUFFIXES:
+            stem = key[:-len(suffix)]
+            if key.endswith(suffix) and (stem in self.known or stem + "e" in self.known):
+                return True
+        return False
+
+    def _candidate(self, key: str) -> bool:
+        return (len(key) >= self.min_len and key not in self.known and key not in ENGLISH_STOP_WORDS
+                and not self._inflected(key))
+
+    def canonicalize(self, tokens: Iterable[str]) -> Dict[str, str]:
+        """{token key: canonical skill} for the tokens that fuzzily match one."""
+        keys = {k for k in (match_key(t) for t in tokens) if self._candidate(k)}
+        out: Dict[str, str] = {}
+        with self._lock:
+            misses = []
+            for k in keys:
+                if k in self._memo:
+                    self._memo.move_to_end(k)
+                    if self._memo[k] is not None:
+                        out[k] = self._memo[k]
+                else:
+                    misses.append(k)
+        if misses and self.vocab:
+            scores = process.cdist(misses, self.vocab, scorer=fuzz.ratio, score_cutoff=self.cutoff,
+                                   dtype=np.uint8, workers=self.workers)
+            best = scores.argmax(axis=1)
+            with self._lock:
+                for i, (k, j) in enumerate(zip(misses, best)):
+                    # below-cutoff scores come back as 0
+                    hit = self.canonical[j] if scores[i, j] else None
+                    self._memo[k] = hit
+                    if hit is not None:
+                        out[k] = hit
+                while len(self._memo) > self.memo_size:
+                    self._memo.popitem(last=False)
+        return out
+
+    def skills(self, tokens: Iterable[str]) -> Set[str]:
+        return set(self.canonicalize(tokens).values())
+
+# ---------- 4) Serialization ----------
+def _taxonomy_digest(taxonomy: Taxonomy) -> str:
+    h = hashlib.sha256(str(MATCHER_VERSION).encode("utf-8"))
+    for skill in sorted(taxonomy):
+        cat, aliases = taxonomy[skill]
+        h.update(f"{skill}\x1f{cat}\x1f{'|'.join(aliases)}\x1e".encode("utf-8"))
+    return h.hexdigest()
+
+def _read_binary(bin_path: str, digest: str) -> Optional[SkillMatcher]:
+    try:
+        with open(bin_path, "rb") as f:
+            payload = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+        return None
+    if not isinstance(payload, dict) or payload.get("sha256") != digest:
+        return None
+    return payload["matcher"]
+
+def _write_binary(bin_path: str, digest: str, matcher: SkillMatcher) -> None:
+    Path(bin_path).parent.mkdir(parents=True, exist_ok=True)
+    tmp = f"{bin_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, "wb") as f:
+            pickle.dump({"sha256": digest, "matcher": matcher}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, bin_path)
+    except OSError:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+# ---------- 5) Process-wide matcher ----------
+_MATCHER: Optional[SkillMatcher] = None
+_SIGNATURE: Optional[str] = None
+_LOCK = threading.Lock()
+
+def build_skill_matcher(csv_path: Optional[str] = None, bin_path: Optional[str] = MATCHER_BIN) -> Tuple[SkillMatcher, str]:
+    """
+    (matcher, taxonomy signature). A taxonomy CSV is compiled once and the
+    automaton snapshot re-used by every later process until the taxonomy changes.
+    """
+    if not csv_path:
+        taxonomy = default_taxonomy()
+        return SkillMatcher(taxonomy), _taxonomy_digest(taxonomy)[:16]
+    # keyed by the file's bytes, so a warm start never even parses the CSV
+    h = hashlib.sha256(str(MATCHER_VERSION).encode("utf-8"))
+    with open(csv_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    digest = h.hexdigest()
+    matcher = _read_binary(bin_path, digest) if bin_path else None
+    if matcher is None:
+        matcher = SkillMatcher(load_taxonomy(csv_path))
+        if bin_path:
+            _write_binary(bin_path, digest, matcher)
+    return matcher, digest[:16]
+
+def get_skill_matcher() -> SkillMatcher:
+    global _MATCHER, _SIGNATURE
+    if _MATCHER is None:
+        with _LOCK:
+            if _MATCHER is None:
+                with load_timer("skill_taxonomy"):
+                    _MATCHER, _SIGNATURE = build_skill_matcher(TAXONOMY_CSV)
+    return _MATCHER
+
+_FUZZY: Optional[FuzzyCanonicalizer] = None
+
+def get_fuzzy_canonicalizer() -> FuzzyCanonicalizer:
+    global _FUZZY
+    if _FUZZY is None:
+        matcher = get_skill_matcher()
+        with _LOCK:
+            if _FUZZY is None:
+                _FUZZY = FuzzyCanonicalizer(matcher)
+    return _FUZZY
+
+def canonical_skills(stream: Iterable[str], tokens: Iterable[str] = None) -> Set[str]:
+    """
+    Skills named in a token stream: exact and alias matches from the automaton
+    plus fuzzy near-misses. Resumes and JDs both go through here, so "k8s" or
+    "kubernets" on either side meets "kubernetes" on the other. tokens: the
+    filtered tokens to canonicalize fuzzily (defaults to the stream).
+    """
+    stream = list(stream)
+    found = get_skill_matcher().skills(stream)
+    found |= get_fuzzy_canonicalizer().skills(stream if tokens is None else tokens)
+    return found
+
+def taxonomy_signature() -> str:
+    """Changes whenever the loaded taxonomy changes (part of the JD profile cache key)."""
+    get_skill_matcher()
+    return _SIGNATURE
@@ -0,0 +1,138 @@
+# src/pipeline/warmup.py
+"""
+Startup accounting and warm-up for the heavy, lazily initialized resources
+(embedding model, skills taxonomy, JD lexicon, JD catalogue, spaCy).
+
+Each resource keeps its own thread-safe get_x() and reports its first load
+through load_timer(); this module records those timings and runs the
+registered warm-up steps so a readiness probe can wait for them, while
+lightweight endpoints (/ingest, /preprocess) serve from the first second.
+"""
+import os, time, logging, threading
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional
+
+log = logging.getLogger(__name__)
+
+# ---------- Config ----------
+# off: everything loads on first use | background: warm up after startup | blocking: before serving
+WARMUP_MODE = os.getenv("WARMUP_ON_STARTUP", "background")
+WARMUP_RESOURCES = [n.strip() for n in os.getenv(
+    "WARMUP_RESOURCES", "embedding_model,skill_taxonomy,jd_lexicon,jd_catalogue").split(",") if n.strip()]
+# failed steps are retried after this many seconds (0 = never)
+WARMUP_RETRY_S = float(os.getenv("WARMUP_RETRY_S", "30"))
+
+# ---------- 1) Load timings ----------
+_loads: Dict[str, float] = {}
+_marks: Dict[str, float] = {}
+_lock = threading.Lock()
+
+@contextmanager
+def load_timer(name: str):
+    """Wrap the first (expensive) load of a resource; its duration lands in the startup report."""
+    start = time.perf_counter()
+    yield
+    seconds = time.perf_counter() - start
+    with _lock:
+        _loads[name] = round(seconds, 3)
+    log.info("loaded %s in %.2fs", name, seconds)
+
+def mark(name: str, seconds: float) -> None:
+    """Record a startup phase (e.g. how long importing the API module took)."""
+    with _lock:
+        _marks[name] = round(seconds, 3)
+
+# ---------- 2) Warm-up ----------
+class WarmUp:
+    """
+    Runs registered warm-up steps once, in order, and tracks per-step status
+    for /ready. The service is ready only once every step is "ready"; failed
+    steps are retried in the background every retry_s seconds.
+    """
+
+    def __init__(self, names: List[str] = WARMUP_RESOURCES, mode: str = WARMUP_MODE,
+                 retry_s: float = WARMUP_RETRY_S):
+        self.names = names
+        self.mode = mode
+        self.retry_s = retry_s
+        self.steps: Dict[str, Callable[[], None]] = {}
+        self.status: Dict[str, Dict] = {}
+        self._created = time.perf_counter()
+        self._done = threading.Event()
+        self._started = False
+        self._lock = threading.Lock()
+        self.ready_after_s: Optional[float] = None
+
+    def register(self, name: str, fn: Callable[[], None]) -> None:
+        self.steps[name] = fn
+
+    def _run_step(self, name: str) -> None:
+        fn = self.steps.get(name)
+        if fn is None:
+            self.status[name] = {"status": "failed", "error": "no warm-up step registered under this name"}
+            return
+        attempts = self.status.get(name, {}).get("attempts", 0) + 1
+        self.status[name] = {"status": "loading", "attempts": attempts}
+        start = time.perf_counter()
+        try:
+            fn()
+            self.status[name] = {"status": "ready", "seconds": round(time.perf_counter() - start, 3),
+                                 "attempts": attempts}
+        except Exception as e:
+            log.warning("warm-up of %s failed (attempt %d): %s", name, attempts, e)
+            self.status[name] = {"status": "failed", "error": str(e), "attempts": attempts}
+
+    def run(self) -> None:
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+        for name in self.names:
+            self._run_step(name)
+        log.info("warm-up finished in %.2fs: %s", round(time.perf_counter() - self._created, 3), self.status)
+        self._settle()
+
+    def _retry(self) -> None:
+        for name in self.failures():
+            if name in self.steps:
+                self._run_step(name)
+        self._settle()
+
+    def _settle(self) -> None:
+        failed = self.failures()
+        if not failed:
+            self.ready_after_s = round(time.perf_counter() - self._created, 3)
+            self._done.set()
+        elif self.retry_s > 0 and any(name in self.steps for name in failed):
+            timer = threading.Timer(self.retry_s, self._retry)
+            timer.daemon = True
+            timer.start()
+
+    def start(self) -> None:
+        if self.mode == "blocking":
+            self.run()
+        elif self.mode == "background":
+            threading.Thread(target=self.run, name="warmup", daemon=True).start()
+
+    def failures(self) -> Dict[str, str]:
+        """{step: error} for every required step that did not load."""
+        return {name: st.get("error", "") for name, st in list(self.status.items()) if st["status"] == "failed"}
+
+    def ready(self) -> bool:
+        return self.mode == "off" or self._done.is_set()
+
+    def report(self) -> Dict:
+        with _lock:
+            loads, marks = dict(_loads), dict(_marks)
+        return {
+            "mode": self.mode,
+            "ready": self.ready(),
+            "ready_after_s": self.ready_after_s,
+            "phases": marks,
+            "warmup": dict(self.status),
+            "failed": self.failures(),
+            "loads": loads,
+        }
+
+# ---------- Process-wide warm-up ----------
+warmup = WarmUp()
@@ -0,0 +1,18 @@
+# tests/conftest.py
+import sys
+from pathlib import Path
+
+import pytest
+
+# the pipeline is imported as the "src" package from the repo root
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+@pytest.fixture
+def jd_csv(tmp_path):
+    """A small job_keywords.csv (the JD lexicon the preprocessing reads)."""
+    path = tmp_path / "job_keywords.csv"
+    path.write_text('jd_file,keywords\nds.txt,"[\'python\', \'pandas\', \'sql\', \'docker\', \'churn\']"\n',
+                    encoding="utf-8")
+    return str(path)
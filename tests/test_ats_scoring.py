@@ -0,0 +1,42 @@
+# tests/test_ats_scoring.py
+from src.pipeline.ats_scoring import _project_score, compute_ats
+from src.pipeline.preprocess_resume_text import preprocess_resume_base, preprocess_resume_text
+
+RESUME = """Jane Doe
+jane@example.com | +1 555 010 0199
+
+Summary
+Data scientist building NLP systems.
+
+Experience
+- Built a PostgreSQL-backed churn model, cut churn 12% (Jan 2021 - Dec 2022)
+- Deployed services with docker
+- Mentored two interns
+
+Projects
+- Resume ranker project using python, pandas and fastapi; 92% accuracy
+- MySQL dashboard project
+
+Education
+B.Tech Computer Science, 2020
+"""
+
+def test_missing_doc_falls_back_to_the_raw_text(jd_csv):
+    prep = preprocess_resume_text(RESUME, jd_csv)
+    without_doc = {k: v for k, v in prep.items() if k != "doc"}
+    jd = "Python, pandas, SQL and docker; strong communication"
+    full = compute_ats(RESUME, jd, jd_csv, prep=prep)
+    fallback = compute_ats(RESUME, jd, jd_csv, prep=without_doc)
+    assert fallback["total_score"] == full["total_score"]
+    assert fallback["components"] == full["components"]
+
+def test_project_skills_are_counted_as_whole_words():
+    base = preprocess_resume_base(RESUME)
+    # python, pandas, fastapi (3 skills -> full 20) + 2 projects (60) + metric (20)
+    assert _project_score(base["sections"], base["doc"]) == 100.0
+
+def test_project_skill_substrings_do_not_count():
+    text = "Projects\n- Built a mysql dashboard project\n"
+    base = preprocess_resume_base(text)
+    # "mysql" is one skill; "sql" inside it is not a second one
+    assert _project_score(base["sections"], base["doc"]) == round(0.5 * 60.0 + 20.0 / 3.0, 1)
@@ -0,0 +1,70 @@
+# tests/test_ats_weights.py
+import os, json
+
+import numpy as np
+import pytest
+
+from src.pipeline.ats_weights import (
+    COMPONENTS, UnknownWeightProfile, compare_profiles, component_matrix, load_components, round_scores,
+    save_components, weighted_totals,
+)
+
+def _baseline_total(c, fresher):
+    # the hand-written sums compute_ats used before weight profiles
+    if fresher:
+        total = (0.06 * c["readability"] + 0.45 * c["skills_technical"] + 0.05 * c["skills_non_technical"] +
+                 0.10 * c["education"] + 0.00 * c["experience"] + 0.15 * c["projects"] + 0.04 * c["contact"] +
+                 0.03 * c["summary"] + 0.03 * c["certifications"] + 0.04 * c["achievements"] +
+                 0.05 * c["internship"])
+    else:
+        total = (0.07 * c["readability"] + 0.45 * c["skills_technical"] + 0.05 * c["skills_non_technical"] +
+                 0.10 * c["education"] + 0.10 * c["experience"] + 0.15 * c["projects"] + 0.05 * c["contact"] +
+                 0.03 * c["summary"])
+    return round(min(100.0, max(0.0, total)), 1)
+
+def _random_components(n, seed=0):
+    rng = np.random.default_rng(seed)
+    # component scores are 0-100 with one decimal, many of them exact steps (0, 50, 100, ...)
+    values = np.where(rng.random((n, len(COMPONENTS))) < 0.3, rng.choice([0.0, 25.0, 50.0, 100.0], (n, len(COMPONENTS))),
+                      np.round(rng.random((n, len(COMPONENTS))) * 100.0, 1))
+    rows = [dict(zip(COMPONENTS, row.tolist())) for row in values]
+    return rows, rng.random(n) < 0.5
+
+def test_default_profile_reproduces_the_baseline_totals():
+    rows, fresher = _random_components(20000)
+    totals, labels = weighted_totals(component_matrix(rows), fresher)
+    expected = [_baseline_total(c, f) for c, f in zip(rows, fresher)]
+    assert round_scores(totals) == expected
+    assert labels.tolist() == ["fresher" if f else "non_fresher" for f in fresher]
+
+def test_compute_ats_uses_the_profile_totals(jd_csv):
+    from src.pipeline.ats_scoring import compute_ats
+    text = "Jane Doe\njane@x.com\n\nSkills\npython sql docker\n\nProjects\n- churn model project, 91% accuracy\n"
+    for fresher in (True, False):
+        ats = compute_ats(text, "python sql kubernetes leadership", jd_csv, fresher=fresher)
+        assert ats["total_score"] == _baseline_total(ats["components"], fresher)
+
+def test_unknown_profile_is_rejected():
+    with pytest.raises(UnknownWeightProfile):
+        weighted_totals(np.zeros((1, len(COMPONENTS))), np.array([True]), profile="nope")
+
+def test_profiles_file_is_reread_when_it_changes(tmp_path):
+    path = tmp_path / "weights.json"
+    weights = {label: {"projects": 1.0} for label in ("fresher", "non_fresher")}
+    path.write_text(json.dumps({"profiles": {"p": weights}}))
+    matrix = component_matrix([{"projects": 40.0, "education": 100.0}])
+    assert weighted_totals(matrix, np.array([False]), "p", path=str(path))[0].tolist() == [40.0]
+    weights["non_fresher"] = {"education": 0.5}
+    path.write_text(json.dumps({"profiles": {"p": weights}}))
+    os.utime(path, (1, 1))
+    assert weighted_totals(matrix, np.array([False]), "p", path=str(path))[0].tolist() == [50.0]
+
+def test_stored_components_round_trip_and_compare(tmp_path):
+    rows, fresher = _random_components(50, seed=3)
+    matrix = component_matrix(rows)
+    out = tmp_path / "components.npz"
+    save_components(out, [f"r{i}" for i in range(50)], matrix, fresher)
+    names, loaded, loaded_fresher = load_components(out)
+    assert names[0] == "r0" and np.array_equal(loaded, matrix) and np.array_equal(loaded_fresher, fresher)
+    summary = compare_profiles(loaded, loaded_fresher, ["default", "default"], top_k=5)
+    assert summary[0] == summary[1] and summary[1]["top5_overlap"] == 1.0
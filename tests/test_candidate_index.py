@@ -0,0 +1,106 @@
+# tests/test_candidate_index.py
+import pytest
+
+from src.pipeline import candidate_index
+from src.pipeline.candidate_index import CandidateIndex
+
+def _prep(name, tokens, skills=(), sections=("experience",)):
+    return {"tokens": list(tokens), "skills": {"all": list(skills)}, "sections": {s: "" for s in sections},
+            "contact": {"name": name}}
+
+RESUMES = {
+    "k-ana": _prep("Ana", "python pandas spark python etl airflow".split(), ["python", "spark"], ("experience", "projects")),
+    "k-bo": _prep("Bo", "java spring kafka docker".split(), ["java", "docker"]),
+    "k-cy": _prep("Cy", "python django docker postgres".split(), ["python", "docker", "machine learning"]),
+}
+
+@pytest.fixture
+def db(tmp_path):
+    return str(tmp_path / "candidates.sqlite")
+
+def _fill(index):
+    for key, prep in RESUMES.items():
+        assert index.add(key, f"{key}.txt", prep, text=f"resume of {key}")
+
+def _ranked(index, terms, **kw):
+    return [r["key"] for r in index.search(terms, **kw)]
+
+def test_bm25_ranks_and_skips_duplicates(db):
+    index = CandidateIndex(db)
+    _fill(index)
+    assert not index.add("k-ana", "again.txt", RESUMES["k-ana"])
+    assert _ranked(index, ["python"]) == ["k-ana", "k-cy"]
+    assert _ranked(index, ["kafka"]) == ["k-bo"]
+    assert index.counters["skipped"] == 1
+
+def test_facet_filters(db):
+    index = CandidateIndex(db)
+    _fill(index)
+    # a filter lists every matching resume, query hits first
+    assert _ranked(index, ["python"], must_have=["docker"]) == ["k-cy", "k-bo"]
+    assert _ranked(index, ["python"], sections=["projects"]) == ["k-ana"]
+    assert _ranked(index, ["python"], must_have=["rust"]) == []
+    # multi-word skills are single terms
+    assert _ranked(index, ["machine learning"]) == ["k-cy"]
+
+def test_other_instances_catch_up_on_adds(db):
+    writer, reader = CandidateIndex(db), CandidateIndex(db)
+    assert reader.search(["python"]) == []
+    _fill(writer)
+    assert _ranked(reader, ["python"]) == ["k-ana", "k-cy"]
+    reader.add("k-dee", "dee.txt", _prep("Dee", "python python python".split(), ["python"]))
+    assert _ranked(writer, ["python"])[0] == "k-dee"
+
+def test_compaction_is_invisible_to_other_instances(db):
+    writer, reader = CandidateIndex(db, compact_rows=0), CandidateIndex(db)
+    _fill(writer)
+    before = reader.search(["python", "docker"])
+    assert writer.compact() > 0
+    fresh = CandidateIndex(db)
+    assert reader.search(["python", "docker"]) == before == fresh.search(["python", "docker"])
+    assert reader.counters["reloads"] >= 1
+
+def test_delete_removes_docs_and_text_everywhere(db):
+    writer, reader = CandidateIndex(db), CandidateIndex(db)
+    _fill(writer)
+    doc_id = reader.search(["kafka"])[0]["doc_id"]
+    assert writer.delete(["k-bo", "k-unknown"]) == 1
+    assert reader.search(["kafka"]) == []
+    assert _ranked(reader, ["docker"], must_have=["docker"]) == ["k-cy"]
+    assert reader.texts([doc_id]) == {}
+    # the same content can be indexed again afterwards
+    assert reader.add("k-bo", "bo.txt", RESUMES["k-bo"])
+    assert _ranked(writer, ["kafka"]) == ["k-bo"]
+
+def test_purge_deletes_by_age(db, monkeypatch):
+    index = CandidateIndex(db)
+    now = [1_000_000.0]
+    monkeypatch.setattr(candidate_index.time, "time", lambda: now[0])
+    index.add("k-old", "old.txt", RESUMES["k-ana"])
+    now[0] += 10 * 86400
+    index.add("k-new", "new.txt", RESUMES["k-cy"])
+    assert index.purge(max_age_days=5) == 1
+    assert _ranked(index, ["python"]) == ["k-new"]
+    assert index.purge(max_age_days=0) == 0
+
+def test_punctuated_resume_text_matches_jd_terms(db, jd_csv):
+    from src.pipeline.ats_scoring import _jd_terms_set
+    from src.pipeline.preprocess_resume_text import preprocess_resume_text
+    index = CandidateIndex(db)
+    text = "Ana Lee\n\nSkills\nPython, Docker, scikit-learn. Worked with Kubernetes.\n"
+    index.add("k-ana", "ana.txt", preprocess_resume_text(text, jd_csv), text)
+    index.add("k-bo", "bo.txt", RESUMES["k-bo"])
+    jd = _jd_terms_set("We need Kubernetes and scikit-learn (k8s experience a plus).")
+    for term in ("kubernetes", "sklearn", "scikit", "learn"):
+        assert _ranked(index, [term]) == ["k-ana"], term
+    assert _ranked(index, jd) == ["k-ana"]
+    for must in ("k8s", "Kubernetes", "scikit-learn", "docker"):
+        assert "k-ana" in _ranked(index, [], must_have=[must]), must
+
+def test_reindex_keeps_keys_and_search_results(db, jd_csv):
+    from src.pipeline.preprocess_resume_text import preprocess_resume_text
+    index = CandidateIndex(db)
+    text = "Ana Lee\n\nSkills\nPython, K8s.\n"
+    index.add("k-ana", "ana.txt", preprocess_resume_text(text, jd_csv), text)
+    assert index.reindex(jd_csv) == 1
+    assert _ranked(CandidateIndex(db), ["kubernetes"]) == ["k-ana"]
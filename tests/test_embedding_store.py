@@ -0,0 +1,51 @@
+# tests/test_embedding_store.py
+import sqlite3
+
+import numpy as np
+
+from src.pipeline import embedding_store
+from src.pipeline.embedding_store import EmbeddingStore
+
+DIM = 4
+VEC_BYTES = DIM * 4
+
+def _vec(i):
+    return np.full(DIM, i, dtype=np.float32)
+
+def _store(tmp_path, **kw):
+    # no memory tier, so every lookup reaches SQLite
+    return EmbeddingStore(db_path=str(tmp_path / "emb.sqlite"), mem_entries=0, **kw)
+
+def test_vectors_are_shared_through_disk(tmp_path):
+    _store(tmp_path).put_many("m", {"a": _vec(1)})
+    other = _store(tmp_path)
+    assert np.array_equal(other.get_many(["a", "b"])["a"], _vec(1))
+    stats = other.stats()
+    assert (stats["disk_hits"], stats["misses"], stats["disk_rows"], stats["disk_bytes"]) == (1, 1, 1, VEC_BYTES)
+
+def test_disk_tier_evicts_least_recently_used(tmp_path, monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(embedding_store.time, "time", lambda: clock[0])
+    store = _store(tmp_path, disk_max_bytes=3 * VEC_BYTES)
+    for key in ("a", "b", "c"):
+        clock[0] += 1
+        store.put_many("m", {key: _vec(1)})
+    clock[0] += 1
+    store.get_many(["a"])            # "a" is now the most recently used
+    clock[0] += 1
+    store.put_many("m", {"d": _vec(2)})
+    # evicts oldest-first down to 90% of the budget: "b" and "c" go, "a" survives
+    assert set(store.get_many(["a", "b", "c", "d"])) == {"a", "d"}
+    assert store.counters["disk_evictions"] == 2
+    assert store.stats()["disk_bytes"] <= 3 * VEC_BYTES
+
+def test_store_from_before_eviction_is_migrated(tmp_path):
+    path = tmp_path / "emb.sqlite"
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE embeddings (key TEXT PRIMARY KEY, model TEXT, dim INTEGER, vec BLOB, created REAL)")
+    conn.execute("INSERT INTO embeddings VALUES ('old', 'm', ?, ?, 1.0)", (DIM, _vec(3).tobytes()))
+    conn.commit()
+    conn.close()
+    store = _store(tmp_path)
+    assert np.array_equal(store.get_many(["old"])["old"], _vec(3))
+    assert store.stats()["disk_rows"] == 1
@@ -0,0 +1,37 @@
+# tests/test_jd_profile.py
+import hashlib
+
+import numpy as np
+import pytest
+
+from src.pipeline import jd_profile
+from src.pipeline.matcher import chunk_text
+from src.pipeline.jd_profile import clean_text, compile_jd_profile, read_jd_profile, save_jd_profile
+
+JD = "Senior  ML Engineer\r\nPython, K8s and\tscikit-learn.\n"
+
+def fake_encode_text(text):
+    """Deterministic unit vector per text: no model (or sentence_transformers) needed."""
+    seed = int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:4], "little")
+    vec = np.random.default_rng(seed).standard_normal(8).astype(np.float32)
+    return vec / np.linalg.norm(vec)
+
+@pytest.fixture(autouse=True)
+def fake_encoder(monkeypatch):
+    monkeypatch.setattr(jd_profile, "encode_text", fake_encode_text)
+    monkeypatch.setattr(jd_profile, "encode_chunks",
+                        lambda text: np.vstack([fake_encode_text(c) for c in chunk_text(text)]))
+
+def test_score_embedding_is_of_the_cleaned_jd():
+    profile = compile_jd_profile(JD, name="jd.txt")
+    assert np.allclose(profile["clean_embedding"], fake_encode_text(clean_text(JD)))
+    assert np.allclose(profile["embedding"], fake_encode_text(JD))
+    assert not np.allclose(profile["embedding"], profile["clean_embedding"])
+
+def test_profile_round_trips_through_disk(tmp_path):
+    profile = compile_jd_profile(JD, name="jd.txt")
+    save_jd_profile(profile, tmp_path)
+    loaded = read_jd_profile(profile["sha256"], tmp_path)
+    assert loaded["terms"] == profile["terms"]
+    for key in ("embedding", "clean_embedding", "chunk_embeddings"):
+        assert np.array_equal(loaded[key], profile[key])
@@ -0,0 +1,133 @@
+# tests/test_job_queue.py
+import threading
+
+import pytest
+
+from src.pipeline import job_queue
+from src.pipeline.job_queue import JobQueue, JobQueueFull, JobWorkers
+
+JD = "Data scientist: python, sql"
+
+@pytest.fixture
+def queue(tmp_path):
+    return JobQueue(db_path=str(tmp_path / "jobs.sqlite"), lease_s=30, max_attempts=2, max_queued=10)
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(job_queue.time, "time", lambda: now[0])
+    return now
+
+def _submit(queue, n=2):
+    return queue.submit("ds.txt", JD, "keywords.csv", [(f"r{i}.txt", b"resume %d" % i) for i in range(n)])
+
+def test_claim_hands_out_each_task_once_with_the_jd_snapshot(queue):
+    job = _submit(queue)
+    a, b = queue.claim("w1"), queue.claim("w2")
+    assert {a["filename"], b["filename"]} == {"r0.txt", "r1.txt"}
+    assert a["jd_text"] == JD and a["attempts"] == 1
+    assert queue.claim("w3") is None
+    assert queue.job(job["job_id"])["running"] == 2
+
+def test_complete_finishes_the_job(queue):
+    job = _submit(queue, 1)
+    task = queue.claim("w1")
+    assert queue.complete(task["id"], "w1", {"file": "r0.txt", "final_score": 50})
+    status = queue.job(job["job_id"])
+    assert status["status"] == "done" and status["percent"] == 100.0
+    done, failed = queue.results(job["job_id"])
+    assert done == [{"file": "r0.txt", "final_score": 50}] and failed == []
+
+def test_expired_lease_is_reclaimed_and_the_old_owner_cannot_finish(queue, clock):
+    _submit(queue, 1)
+    first = queue.claim("w1")
+    clock[0] += 31
+    second = queue.claim("w2")
+    assert second["id"] == first["id"] and second["attempts"] == 2
+    assert not queue.complete(first["id"], "w1", {"late": True})
+    assert not queue.fail(first["id"], "w1", "late error")
+    assert not queue.heartbeat(first["id"], "w1")
+    assert queue.complete(second["id"], "w2", {"file": "r0.txt"})
+
+def test_heartbeat_keeps_the_lease(queue, clock):
+    _submit(queue, 1)
+    task = queue.claim("w1")
+    for _ in range(3):
+        clock[0] += 20
+        assert queue.heartbeat(task["id"], "w1")
+    assert queue.claim("w2") is None
+
+def test_lease_running_out_on_the_last_attempt_fails_the_task(queue, clock):
+    job = _submit(queue, 1)
+    queue.claim("w1")
+    clock[0] += 31
+    queue.claim("w2")
+    clock[0] += 31
+    assert queue.claim("w3") is None
+    _, failed = queue.results(job["job_id"])
+    assert failed[0]["error"] == "worker stopped responding on every attempt"
+
+def test_retryable_failure_requeues_until_max_attempts(queue):
+    job = _submit(queue, 1)
+    task = queue.claim("w1")
+    assert queue.fail(task["id"], "w1", "boom")
+    task = queue.claim("w1")
+    assert task["attempts"] == 2
+    assert queue.fail(task["id"], "w1", "boom again")
+    assert queue.claim("w1") is None
+    assert queue.results(job["job_id"])[1] == [{"file": "r0.txt", "error": "boom again"}]
+
+def test_non_retryable_failure_fails_at_once(queue):
+    job = _submit(queue, 1)
+    task = queue.claim("w1")
+    queue.fail(task["id"], "w1", "not a pdf", retry=False)
+    assert queue.job(job["job_id"])["failed"] == 1
+
+def test_crashed_worker_tasks_are_requeued_and_the_job_reopened(queue):
+    job = _submit(queue, 2)
+    crashed = queue.claim("w1")
+    other = queue.claim("w2")
+    assert queue.release_worker("w1") == 1
+    assert queue.job(job["job_id"])["queued"] == 1
+    again = queue.claim("w2")
+    assert again["id"] == crashed["id"]
+    queue.complete(other["id"], "w2", {"file": other["filename"]})
+    queue.complete(again["id"], "w2", {"file": again["filename"]})
+    assert queue.job(job["job_id"])["status"] == "done"
+
+def test_admission_limit(queue):
+    _submit(queue, 8)
+    with pytest.raises(JobQueueFull):
+        _submit(queue, 3)
+    assert queue.counters["rejected_jobs"] == 1
+
+def test_concurrent_claims_never_share_a_task(tmp_path):
+    db = str(tmp_path / "jobs.sqlite")
+    JobQueue(db, max_queued=0).submit("ds.txt", JD, "k.csv", [(f"r{i}.txt", b"x") for i in range(40)])
+    claimed, lock = [], threading.Lock()
+
+    def worker(name):
+        q = JobQueue(db)
+        while True:
+            task = q.claim(name)
+            if task is None:
+                return
+            with lock:
+                claimed.append(task["id"])
+            q.complete(task["id"], name, {"file": task["filename"]})
+
+    threads = [threading.Thread(target=worker, args=(f"w{i}",)) for i in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert sorted(claimed) == sorted(set(claimed)) and len(claimed) == 40
+
+def test_only_one_api_process_supervises_workers(tmp_path):
+    db = str(tmp_path / "jobs.sqlite")
+    first, second = JobWorkers(1, db, elect=True), JobWorkers(1, db, elect=True)
+    assert first._acquire_supervisor_lock()
+    assert not second._acquire_supervisor_lock()
+    first.stop(timeout=0)
+    assert second._acquire_supervisor_lock()
+    second.stop(timeout=0)
@@ -0,0 +1,49 @@
+# tests/test_pair_scoring.py
+import random
+
+import numpy as np
+
+from src.pipeline.ats_scoring import _skills_scores
+from src.pipeline.pair_scoring import PairScorer, score_all_pairs, top_matches
+
+TECH = ["python", "sql", "docker", "kubernetes", "spark", "pandas", "aws", "git", "machine learning", "tensorflow"]
+SOFT = ["communication", "leadership", "teamwork", "presentation", "management"]
+
+def _pool(seed, n_resumes=40, n_jds=12):
+    rng = random.Random(seed)
+    preps = [{"skills": {"technical": rng.sample(TECH, rng.randint(0, 6)),
+                         "non_technical": rng.sample(SOFT, rng.randint(0, 3))}} for _ in range(n_resumes)]
+    jds = [{"name": f"jd{j}.txt", "tech": frozenset(rng.sample(TECH, rng.randint(0, 8))),
+            "soft": frozenset(rng.sample(SOFT, rng.randint(0, 4)))} for j in range(n_jds)]
+    return preps, jds
+
+def test_coverage_equals_compute_ats_for_every_pair():
+    for seed in range(5):
+        preps, jds = _pool(seed)
+        scores = score_all_pairs(preps, jds)
+        for i, prep in enumerate(preps):
+            for j, jd in enumerate(jds):
+                tech, soft, _, _ = _skills_scores(prep["skills"], set(), (set(jd["tech"]), set(jd["soft"])))
+                assert scores["skills_technical"][i, j] == tech
+                assert scores["skills_non_technical"][i, j] == soft
+
+def test_blocks_match_one_shot_scoring():
+    preps, jds = _pool(7, n_resumes=25)
+    skills = [(p["skills"]["technical"], p["skills"]["non_technical"]) for p in preps]
+    scorer = PairScorer(jds, skills)
+    whole = scorer.score(skills)
+    for start, block in scorer.iter_blocks(skills, block_size=6):
+        for key, values in block.items():
+            assert np.array_equal(values, whole[key][start:start + len(values)])
+
+def test_idf_overlap_rewards_rare_skills():
+    jds = [{"name": "jd.txt", "tech": frozenset({"python", "kubernetes"}), "soft": frozenset()}]
+    common = (["python"], [])
+    rare = (["kubernetes"], [])
+    scores = PairScorer(jds, [common] * 9 + [rare]).score([common, rare])
+    assert scores["idf_overlap"][1, 0] > scores["idf_overlap"][0, 0]
+    assert scores["skills_technical"][0, 0] == scores["skills_technical"][1, 0] == 50.0
+
+def test_top_matches_orders_best_first():
+    values = np.array([[10.0, 90.0, 50.0], [70.0, 20.0, 80.0]])
+    assert top_matches({"idf_overlap": values}, 2).tolist() == [[1, 2], [2, 0]]
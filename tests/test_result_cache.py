@@ -0,0 +1,63 @@
+# tests/test_result_cache.py
+from src.pipeline import result_cache
+from src.pipeline.result_cache import ResultCache, result_key, scoring_version
+
+def _cache(tmp_path, **kw):
+    return ResultCache(db_path=str(tmp_path / "results.sqlite"), **kw)
+
+def test_hit_is_served_from_disk_by_a_fresh_instance(tmp_path):
+    _cache(tmp_path).put("k", "v1", {"score": 71.5})
+    other = _cache(tmp_path)
+    assert other.get("k", "v1") == {"score": 71.5}
+    assert other.stats()["hits"] == 1
+
+def test_version_change_is_a_miss_and_drops_the_entry(tmp_path):
+    cache = _cache(tmp_path)
+    cache.put("k", "v1", {"score": 1})
+    assert cache.get("k", "v2") is None
+    assert cache.counters["stale"] == 1
+    assert _cache(tmp_path).get("k", "v1") is None
+
+def test_expired_entries_miss(tmp_path, monkeypatch):
+    cache = _cache(tmp_path, ttl_s=10)
+    clock = [1000.0]
+    monkeypatch.setattr(result_cache.time, "time", lambda: clock[0])
+    cache.put("k", "v", {"score": 1})
+    clock[0] += 5
+    assert cache.get("k", "v") == {"score": 1}
+    clock[0] += 6
+    assert cache.get("k", "v") is None
+    assert cache.counters["expired"] == 1
+
+def test_memory_and_disk_tiers_evict_least_recently_used(tmp_path):
+    cache = _cache(tmp_path, mem_entries=2, disk_max_bytes=400)
+    for i in range(20):
+        cache.put(f"k{i}", "v", {"text": f"{i}" * 200})
+    assert cache.stats()["mem_entries"] == 2
+    assert cache.counters["mem_evictions"] == 18
+    assert cache.counters["disk_evictions"] > 0
+    fresh = _cache(tmp_path)
+    assert fresh.get("k0", "v") is None
+    assert fresh.get("k19", "v") is not None
+
+def test_keys_depend_on_every_option():
+    base = result_key("/score", "abc", "jd", section_aware=True)
+    assert base == result_key("/score", "abc", "jd", section_aware=True)
+    assert base != result_key("/score", "abc", "jd", section_aware=False)
+    assert base != result_key("/analyze_resume", "abc", "jd", section_aware=True)
+
+def test_scoring_version_tracks_fuzzy_and_extraction_settings(tmp_path, monkeypatch):
+    csv = tmp_path / "job_keywords.csv"
+    csv.write_text("keyword\npython\n")
+    before = scoring_version(str(csv))
+    assert scoring_version(str(csv)) == before
+    for name, value in (("FUZZY_CUTOFF", 95.0), ("FUZZY_MIN_LEN", 6), ("PAGE_BUDGET", 3), ("CHAR_BUDGET", 999)):
+        with monkeypatch.context() as m:
+            m.setattr(result_cache, name, value)
+            assert scoring_version(str(csv)) != before, name
+
+def test_resume_key_tracks_extraction_budgets(monkeypatch):
+    from src.pipeline import resume_cache
+    before = resume_cache.resume_key(b"resume", "cv.txt")
+    monkeypatch.setattr(resume_cache, "CHAR_BUDGET", 10)
+    assert resume_cache.resume_key(b"resume", "cv.txt") != before
@@ -0,0 +1,33 @@
+# tests/test_skill_matcher.py
+from src.pipeline.ats_scoring import _jd_terms_set, _split_skills_for_jd
+from src.pipeline.skill_matcher import FuzzyCanonicalizer, SkillMatcher, default_taxonomy, pattern_tokens
+
+def _tokens(text):
+    return pattern_tokens(text)
+
+def test_plain_english_words_are_not_resume_skills():
+    matcher = SkillMatcher(default_taxonomy())
+    found = matcher.skills(_tokens("Built a REST service, ran a regression analysis and a vector ray tracer"))
+    assert not found & {"rest", "regression", "vector", "ray"}
+
+def test_curated_skills_aliases_and_phrases_match():
+    matcher = SkillMatcher(default_taxonomy())
+    found = matcher.skills(_tokens("Python, k8s and scikit-learn for machine learning; strong leadership"))
+    assert {"python", "kubernetes", "sklearn", "machine learning", "leadership"} <= found
+    assert matcher.category["leadership"] == "soft"
+
+def test_jd_phrases_are_found_but_not_counted_as_resume_skills():
+    matcher = SkillMatcher(default_taxonomy())
+    toks = _tokens("Experience with natural language processing and feature engineering")
+    assert {"natural language processing", "feature engineering"} <= matcher.phrases(toks)
+    assert not matcher.skills(toks) & {"natural language processing", "feature engineering"}
+
+def test_fuzzy_maps_typos_but_not_inflections_or_stopwords():
+    fuzzy = FuzzyCanonicalizer(SkillMatcher(default_taxonomy()))
+    mapped = fuzzy.canonicalize(["kubernets", "pytorch2", "tensorflw", "dockers", "sparked", "because"])
+    assert mapped == {"kubernets": "kubernetes", "pytorch2": "pytorch", "tensorflw": "tensorflow"}
+
+def test_jd_terms_are_canonicalized_like_resume_skills():
+    terms = _jd_terms_set("Hands-on k8s and scikit-learn; kubernets a plus")
+    tech, _ = _split_skills_for_jd(terms)
+    assert {"kubernetes", "sklearn"} <= tech
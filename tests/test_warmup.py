@@ -0,0 +1,50 @@
+# tests/test_warmup.py
+import time
+
+from src.pipeline.warmup import WarmUp
+
+def test_ready_only_when_every_step_loaded():
+    w = WarmUp(names=["a", "b"], mode="blocking", retry_s=0)
+    w.register("a", lambda: None)
+    w.register("b", lambda: None)
+    w.start()
+    assert w.ready()
+    assert w.report()["failed"] == {}
+
+def test_failed_step_keeps_service_unready_and_is_reported():
+    w = WarmUp(names=["a", "b"], mode="blocking", retry_s=0)
+    w.register("a", lambda: None)
+
+    def boom():
+        raise RuntimeError("model download failed")
+    w.register("b", boom)
+    w.start()
+    report = w.report()
+    assert not report["ready"]
+    assert report["failed"] == {"b": "model download failed"}
+
+def test_unregistered_step_is_a_failure():
+    w = WarmUp(names=["missing"], mode="blocking", retry_s=0)
+    w.start()
+    assert not w.ready()
+    assert "missing" in w.failures()
+
+def test_failed_step_is_retried_until_it_loads():
+    calls = []
+
+    def flaky():
+        calls.append(1)
+        if len(calls) < 2:
+            raise RuntimeError("not yet")
+    w = WarmUp(names=["flaky"], mode="blocking", retry_s=0.05)
+    w.register("flaky", flaky)
+    w.start()
+    assert not w.ready()
+    deadline = time.time() + 5
+    while not w.ready() and time.time() < deadline:
+        time.sleep(0.02)
+    assert w.ready()
+    assert w.status["flaky"]["attempts"] == 2
+
+def test_off_mode_is_always_ready():
+    assert WarmUp(names=["a"], mode="off").ready()